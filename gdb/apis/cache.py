@@ -0,0 +1,82 @@
+# @file	  cache.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  A bounded cache of decoded zOS instructions.
+#
+#         Listing the same code again after every stop would otherwise decode
+#         it again each time. Entries are looked up by address and only used
+#         when the bytes in memory still match the bytes that were decoded,
+#         so code that has been changed is decoded again. Like disasm.py this
+#         does not need gdb; apis/stream.py clears the cache on gdb events.
+#
+import sys
+import os
+import collections
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+_apis = os.path.dirname( os.path.abspath( __file__ ) )
+if sys.path[0] != _apis:
+   sys.path.insert( 0, _apis )
+
+from disasm import decode
+
+# @class zcache
+# @brief Least recently used cache of rvalues keyed by instruction address.
+#
+# @param[in] self - The self pointer to the instantiated structure/class.
+# @param[in] size   - The maximum number of instructions to keep.
+# @param[in] source - The function misses are decoded with.
+# @returns An instance of the structure.
+class zcache:
+   def __init__( self, size=65536, source=decode ):
+      self.size    = size
+      self.source  = source
+      self.entries = collections.OrderedDict( )
+      self.hits    = 0
+      self.misses  = 0
+
+   # @fn    decode
+   # @brief Same as disasm.decode but served from the cache when the bytes at
+   #        buf[off] are the ones that were decoded for this address before.
+   def decode( self, buf, off, address=0 ):
+      rv = self.entries.get( address )
+
+      if rv != None and buf[off:off + rv._sz] == rv._raw:
+         self.entries.move_to_end( address )
+         self.hits += 1
+         return rv
+
+      self.misses += 1
+
+      rv = self.source( buf, off, address )
+      if rv != None:
+         self.entries[address] = rv
+         self.entries.move_to_end( address )
+         if len( self.entries ) > self.size:
+            self.entries.popitem( last=False )
+
+      return rv
+
+   # @fn    clear
+   # @brief Drop every entry. The hit and miss counts are kept.
+   def clear( self, *args ):
+      self.entries.clear( )
+
+   # @fn    reset
+   # @brief Drop every entry and zero the hit and miss counts.
+   def reset( self ):
+      self.clear( )
+      self.hits   = 0
+      self.misses = 0
+
+   # @fn    stats
+   # @brief Describe the cache in one line.
+   def stats( self ):
+      total = self.hits + self.misses
+      ratio = 100.0 * self.hits / total if total else 0.0
+
+      return "{} of {} entries, {} hits, {} misses ({:.1f}% hit rate)".format( len( self.entries ),
+                                                                               self.size,
+                                                                               self.hits,
+                                                                               self.misses,
+                                                                               ratio )
@@ -0,0 +1,321 @@
+# @file	  cfg.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Control flow following (recursive descent) disassembly.
+#
+#         Instead of decoding a range from start to end, decoding starts at
+#         the entry points and follows the relative branches. Code after an
+#         unconditional branch is only decoded if something branches to it,
+#         so literal pools and data between routines are not decoded as
+#         instructions. The decoded instructions are split into basic blocks
+#         and the blocks make up a control flow graph that can be printed as
+#         text or as a graphviz DOT file.
+#
+#         Like disasm.py this does not need gdb.
+#
+# https://www.ibm.com/support/libraryserver/download/dz9zr006.pdf
+#
+import sys
+import os
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+_apis = os.path.dirname( os.path.abspath( __file__ ) )
+if sys.path[0] != _apis:
+   sys.path.insert( 0, _apis )
+
+from disasm import decode, formatInst
+
+# @def   zos_relative_branches
+# @brief The relative branches that are followed, by Mnemonic name.
+#
+#        name : ( bit, width, kind ) where bit and width locate the signed
+#        halfword count of the branch target and kind is
+#
+#        mask    - BRC/BRCL: a branch on the mask at bits 8-11. 15 always
+#                  branches and 0 never does.
+#        compare - a compare and branch on the M3 mask at the bit in
+#                  zos_compare_masks. Its bits are equal, low and high and
+#                  the last bit is ignored, so 14 always branches and 0
+#                  never does.
+#        call    - a branch and save; the target is a routine entry and
+#                  execution carries on after the instruction on return.
+#        cond    - a branch on count or index.
+zos_relative_branches = {
+   "BRC"   : ( 16, 16, "mask" ),
+   "BRCL"  : ( 16, 32, "mask" ),
+   "BRAS"  : ( 16, 16, "call" ),
+   "BRASL" : ( 16, 32, "call" ),
+   "BRCT"  : ( 16, 16, "cond" ),
+   "BRCTG" : ( 16, 16, "cond" ),
+   "BRXH"  : ( 16, 16, "cond" ),
+   "BRXLE" : ( 16, 16, "cond" ),
+   "BRXJG" : ( 16, 16, "cond" ),
+   "BRXLG" : ( 16, 16, "cond" ),
+   "CRJ"   : ( 16, 16, "compare" ),
+   "CGRJ"  : ( 16, 16, "compare" ),
+   "CLRJ"  : ( 16, 16, "compare" ),
+   "CLGRJ" : ( 16, 16, "compare" ),
+   "CIJ"   : ( 16, 16, "compare" ),
+   "CGIJ"  : ( 16, 16, "compare" ),
+   "CLIJ"  : ( 16, 16, "compare" ),
+   "CLGIJ" : ( 16, 16, "compare" ),
+}
+
+# @def   zos_compare_masks
+# @brief The bit offset of the M3 mask of each "compare" branch.
+zos_compare_masks = {
+   "CRJ"   : 32,
+   "CGRJ"  : 32,
+   "CLRJ"  : 32,
+   "CLGRJ" : 32,
+   "CIJ"   : 12,
+   "CGIJ"  : 12,
+   "CLIJ"  : 12,
+   "CLGIJ" : 12,
+}
+
+# @fn    branchOf
+# @brief Classify the decoded instruction rv for control flow.
+#
+# @param[in] rv - The rvalue returned by decode.
+# @returns ( kind, rel ) where rel is the byte offset of the branch target
+#          from the instruction, or None, and kind is
+#
+#          None   - not a branch, or a branch that never goes anywhere
+#          "jump" - always branches to rel
+#          "cond" - may branch to rel or carry on with the next instruction
+#          "call" - calls rel and carries on with the next instruction
+#          "stop" - branches to an address in a register (BR, BCR 15 / BC 15)
+def branchOf( rv ):
+   if rv._branch == None:
+      rv._branch = findBranch( rv )
+
+   return rv._branch
+
+# @fn    findBranch
+# @brief Work out what branchOf returns; branchOf keeps it in rv._branch.
+def findBranch( rv ):
+   raw = rv._raw
+
+   br = zos_relative_branches.get( rv._name )
+   if br != None:
+      bit, width, kind = br
+
+      last = ( bit + width + 7 ) // 8
+      v    = int.from_bytes( raw[bit // 8:last], "big" ) & ( ( 1 << width ) - 1 )
+      rel  = ( ( v ^ ( 1 << ( width - 1 ) ) ) - ( 1 << ( width - 1 ) ) ) * 2
+
+      if kind == "mask":
+         m = raw[1] >> 4
+         if m == 0:
+            return ( None, None )
+         return ( "jump" if m == 15 else "cond", rel )
+
+      if kind == "compare":
+         bit = zos_compare_masks[rv._name]
+         m   = ( raw[bit // 8] >> ( 4 - bit % 8 ) ) & 0x0e
+         if m == 0:
+            return ( None, None )
+         return ( "jump" if m == 14 else "cond", rel )
+
+      return ( kind, rel )
+
+   # BCR 15,Rn (BR Rn) and BC 15. BCR 15,0 only serialises.
+   if rv._name == "BCR" and raw[1] >> 4 == 15 and raw[1] & 0x0f != 0:
+      return ( "stop", None )
+   if rv._name == "BC" and raw[1] >> 4 == 15:
+      return ( "stop", None )
+
+   return ( None, None )
+
+# @class zblock
+# @brief A basic block: instructions that run one after the other and are
+#        only entered at the first one. why says why decoding stopped after
+#        a block without successors, and lost why each successor that is
+#        not a block could not be decoded.
+#
+# @param[in] self  - The self pointer to the instantiated structure/class.
+# @param[in] start - The offset of the first instruction.
+# @returns An instance of the structure.
+class zblock:
+   def __init__( self, start ):
+      self.start = start
+      self.end   = start
+      self.insts = [ ]
+      self.succs = [ ]
+      self.entry = False
+      self.why   = None
+      self.lost  = { }
+
+# @fn    buildCFG
+# @brief Decode buf by following control flow from the entry offsets.
+#
+#        Every instruction start is decoded once: the worklist holds offsets
+#        still to be decoded and the decoded instructions are the visited
+#        set. Branch targets outside of the range are recorded but not
+#        followed.
+#
+# @param[in] buf     - The memory buffer holding the instruction stream.
+# @param[in] entries - The offsets to start decoding at.
+# @param[in] address - The address of buf[0].
+# @param[in] end     - Instructions starting at or after this offset are not
+#                      decoded. Defaults to the end of the buffer.
+# @param[in] dec     - The function to decode with, such as a store's decode.
+# @returns A list of zblock sorted by offset.
+def buildCFG( buf, entries, address=0, end=None, dec=decode ):
+   if end == None:
+      end = len( buf )
+
+   insts   = { }
+   flow    = { }
+   why     = { }
+   leaders = set( entries )
+   work    = list( entries )
+
+   while work:
+      off = work.pop( )
+
+      while off not in insts:
+         if off < 0 or off >= end:
+            why[off] = "outside"
+            break
+
+         try:
+            rv = dec( buf, off, address + off )
+         except IndexError:
+            why[off] = "truncated"
+            break
+
+         if ( rv == None ):
+            why[off] = "unknown opcode"
+            break
+
+         insts[off] = rv
+         nxt        = off + rv._sz
+
+         kind, rel = branchOf( rv )
+         if kind == None:
+            off = nxt
+            continue
+
+         succs = [ ]
+         if rel != None:
+            target = off + rel
+            succs.append( ( target, "call" if kind == "call" else "taken" ) )
+            leaders.add( target )
+            if target not in insts:
+               work.append( target )
+
+         flow[off] = succs
+
+         if kind == "jump" or kind == "stop":
+            break
+
+         succs.append( ( nxt, "next" ) )
+         leaders.add( nxt )
+         off = nxt
+
+   # Split the decoded instructions into blocks.
+   blocks = [ ]
+   block  = None
+   nxt    = None
+
+   for off in sorted( insts ):
+      rv = insts[off]
+
+      if block == None or off in leaders or off != nxt:
+         block       = zblock( off )
+         block.entry = off in entries
+         blocks.append( block )
+
+      block.insts.append( ( off, rv ) )
+      block.end = nxt = off + rv._sz
+
+      if off in flow:
+         block.succs = flow[off]
+         block       = None
+
+   # A block that does not end in a branch falls through to the instruction
+   # after its last one. When runs decoded from different starts overlap,
+   # that is not the block that follows it in offset order.
+   for block in blocks:
+      if block.insts[-1][0] not in flow:
+         if block.end in insts:
+            block.succs = [ ( block.end, "next" ) ]
+         else:
+            block.why = why.get( block.end )
+
+      block.lost = dict( ( t, why[t] ) for t, k in block.succs if t in why )
+
+   return blocks
+
+# @fn    blockName
+# @brief The name of the block starting at offset off.
+def blockName( off ):
+   return "<{:=+04X}>".format( off )
+
+# @fn    formatCFG
+# @brief Format the blocks as text: a heading, the instructions and the
+#        successors of each block.
+#
+# @param[in] blocks - The list returned by buildCFG.
+# @param[in] zaddr  - The zOS address of buf[0].
+# @returns A generator of output lines without trailing newlines.
+def formatCFG( blocks, zaddr ):
+   for b in blocks:
+      yield "block {} - {} ({} instructions){}".format( blockName( b.start ),
+                                                       blockName( b.end ),
+                                                       len( b.insts ),
+                                                       " entry" if b.entry else "" )
+
+      for off, rv in b.insts:
+         yield formatInst( rv, zaddr + off, off )
+
+      if b.succs:
+         yield "   -> " + ", ".join( "{} {}{}".format( blockName( t ), k,
+                                                       " ({})".format( b.lost[t] ) if t in b.lost else "" )
+                                     for t, k in b.succs )
+      elif b.why != None:
+         yield "   -> end ({})".format( b.why )
+      else:
+         yield "   -> end"
+
+      yield ""
+
+# @fn    formatDot
+# @brief Format the blocks as a graphviz DOT digraph.
+#
+# @param[in] blocks - The list returned by buildCFG.
+# @param[in] zaddr  - The zOS address of buf[0].
+# @returns A generator of output lines without trailing newlines.
+def formatDot( blocks, zaddr ):
+   def node( off ):
+      return "\"b{:x}\"".format( off )
+
+   def quote( s ):
+      return s.replace( "\\", "\\\\" ).replace( "\"", "\\\"" )
+
+   starts = set( b.start for b in blocks )
+
+   yield "digraph zcfg {"
+   yield "   node [shape=box fontname=\"monospace\"];"
+
+   for b in blocks:
+      text = "{:08X} {}\\l".format( zaddr + b.start, blockName( b.start ) )
+      text += "".join( "{:6} {}\\l".format( rv._name, quote( rv._asm ) ) for off, rv in b.insts )
+
+      yield "   {} [label=\"{}\"{}];".format( node( b.start ), text,
+                                             " style=bold" if b.entry else "" )
+
+   for b in blocks:
+      for t, k in b.succs:
+         if t not in starts:
+            text = "{:08X}".format( zaddr + t )
+            if t in b.lost:
+               text += "\\n{}".format( b.lost[t] )
+            yield "   {} [label=\"{}\" shape=plaintext];".format( node( t ), text )
+
+         yield "   {} -> {} [label=\"{}\"{}];".format( node( b.start ), node( t ), k,
+                                                      " style=dashed" if k == "call" else "" )
+
+   yield "}"
@@ -0,0 +1,216 @@
+# @file	  coverage.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Which instructions of a zOS program have been executed, one bit
+#         per halfword.
+#
+#         Instructions start on halfwords, so a program of n bytes needs
+#         n / 16 bytes of bitmap, whatever it runs. The bit of an address
+#         is set when an instruction starting there is executed. Runs of
+#         covered code are followed from the bitmap itself: an executed
+#         instruction whose successor in memory was executed as well
+#         continues the run. What lies between two runs was not executed,
+#         and starts where the instruction before it ends.
+#
+#         Bitmaps are saved as JSON with each bitmap compressed, and a saved
+#         file can be loaded into, and so merged with, the bitmaps of
+#         another run.
+#
+#         Like disasm.py this does not need gdb.
+#
+import sys
+import os
+import json
+import zlib
+import base64
+import bisect
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+_apis = os.path.dirname( os.path.abspath( __file__ ) )
+if sys.path[0] != _apis:
+   sys.path.insert( 0, _apis )
+
+from scanner import zos_ilc_length
+
+# @def   zos_coverage_version
+# @brief The version of the saved file format.
+zos_coverage_version = 1
+
+# @class zprogram
+# @brief The bitmap of one program.
+#
+# @param[in] self   - The self pointer to the instantiated structure/class.
+# @param[in] name   - The name of the program.
+# @param[in] start  - Its first zOS address, which is halfword aligned.
+# @param[in] length - Its length in bytes.
+# @param[in] bits   - The bitmap, empty by default.
+# @returns An instance of the structure.
+class zprogram:
+   def __init__( self, name, start, length, bits=None ):
+      self.name   = name
+      self.start  = start
+      self.end    = start + length
+      self.bits   = bits if bits != None else bytearray( ( length + 15 ) // 16 )
+
+   # @fn    covered
+   # @brief The offsets of the executed instructions, in order.
+   def covered( self ):
+      offs = [ ]
+      for i, b in enumerate( self.bits ):
+         while b:
+            low = b & -b
+            offs.append( 16 * i + 2 * ( low.bit_length( ) - 1 ) )
+            b  ^= low
+
+      return offs
+
+   # @fn    runs
+   # @brief Cut the program into covered and uncovered runs.
+   #
+   # @param[in] self - The self pointer to the instantiated structure/class.
+   # @param[in] buf  - The bytes of the program, to know how long each
+   #                   executed instruction is.
+   # @returns A list of ( covered, offset, end, instructions ), where
+   #          instructions is the number executed in a covered run and 0 for
+   #          an uncovered one.
+   def runs( self, buf ):
+      runs = [ ]
+      pos  = 0
+      offs = self.covered( )
+      i    = 0
+
+      while i < len( offs ):
+         first = offs[i]
+         if first > pos:
+            runs.append( ( False, pos, first, 0 ) )
+
+         # Follow the executed instructions that follow each other.
+         off = first
+         n   = 0
+         while True:
+            nxt = off + zos_ilc_length[buf[off]]
+            n  += 1
+            i  += 1
+            if i == len( offs ) or offs[i] != nxt:
+               break
+            off = nxt
+
+         pos = min( nxt, self.end - self.start )
+         runs.append( ( True, first, pos, n ) )
+
+         # An instruction of the run overlaps the next executed one.
+         while i < len( offs ) and offs[i] < pos:
+            i += 1
+
+      if pos < self.end - self.start:
+         runs.append( ( False, pos, self.end - self.start, 0 ) )
+
+      return runs
+
+   # @fn    stats
+   # @brief ( instructions executed, bytes they cover ).
+   def stats( self, buf ):
+      covered = [ r for r in self.runs( buf ) if r[0] ]
+
+      return ( sum( r[3] for r in covered ), sum( r[2] - r[1] for r in covered ) )
+
+# @class zcoverage
+# @brief The bitmaps of every program being covered, and the hit path.
+#
+# @param[in] self - The self pointer to the instantiated structure/class.
+# @returns An instance of the structure.
+class zcoverage:
+   def __init__( self ):
+      self.programs = { }
+      self.clear( )
+
+   # @fn    index
+   # @brief Sort the programs by address for record.
+   def index( self ):
+      progs        = sorted( self.programs.values( ), key=lambda p: p.start )
+      self.starts  = [ p.start for p in progs ]
+      self.ordered = progs
+      self.last    = progs[0] if progs else zprogram( "", 0, 0 )
+
+   # @fn    add
+   # @brief Cover a program, keeping its bits if it is covered already over
+   #        the same range.
+   def add( self, name, start, length ):
+      prog = self.programs.get( name )
+      if prog == None or prog.start != start or prog.end != start + length:
+         self.programs[name] = zprogram( name, start, length )
+      self.index( )
+
+   # @fn    remove
+   # @brief Stop covering a program.
+   def remove( self, name ):
+      self.programs.pop( name, None )
+      self.index( )
+
+   # @fn    record
+   # @brief The hit path: set the bit of the zOS address addr.
+   def record( self, addr ):
+      prog = self.last
+      if not ( prog.start <= addr < prog.end ):
+         i = bisect.bisect_right( self.starts, addr ) - 1
+         if i < 0 or addr >= self.ordered[i].end:
+            self.outside += 1
+            return
+         prog = self.last = self.ordered[i]
+
+      off = ( addr - prog.start ) >> 1
+      prog.bits[off >> 3] |= 1 << ( off & 7 )
+
+   # @fn    clear
+   # @brief Clear every bitmap but keep the programs.
+   def clear( self ):
+      for prog in self.programs.values( ):
+         prog.bits = bytearray( len( prog.bits ) )
+      self.outside = 0
+      self.index( )
+
+   # @fn    save
+   # @brief Write the bitmaps to path.
+   def save( self, path ):
+      progs = [ { "name"   : p.name,
+                  "start"  : p.start,
+                  "length" : p.end - p.start,
+                  "bits"   : base64.b64encode( zlib.compress( bytes( p.bits ) ) ).decode( ) }
+                for p in self.ordered ]
+
+      with open( path, "w" ) as f:
+         json.dump( { "version" : zos_coverage_version, "programs" : progs }, f, indent=1 )
+
+   # @fn    load
+   # @brief Merge the bitmaps saved in path into these: bits are or'ed into
+   #        a program of the same name and range, and programs not covered
+   #        yet are added.
+   #
+   # @returns ( merged, added, skipped ): the names of the programs merged,
+   #          added, and skipped because their range differs.
+   def load( self, path ):
+      with open( path ) as f:
+         data = json.load( f )
+
+      if data.get( "version" ) != zos_coverage_version:
+         raise ValueError( "{} is not a coverage file of version {}".format( path, zos_coverage_version ) )
+
+      merged, added, skipped = [ ], [ ], [ ]
+
+      for ent in data["programs"]:
+         bits = bytearray( zlib.decompress( base64.b64decode( ent["bits"] ) ) )
+         new  = zprogram( ent["name"], ent["start"], ent["length"], bits )
+         prog = self.programs.get( new.name )
+
+         if prog == None:
+            self.programs[new.name] = new
+            added.append( new.name )
+         elif prog.start != new.start or prog.end != new.end or len( prog.bits ) != len( bits ):
+            skipped.append( new.name )
+         else:
+            prog.bits = bytearray( ( int.from_bytes( prog.bits, "little" ) |
+                                     int.from_bytes( bits, "little" ) ).to_bytes( len( bits ), "little" ) )
+            merged.append( new.name )
+
+      self.index( )
+      return ( merged, added, skipped )
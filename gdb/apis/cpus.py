@@ -0,0 +1,150 @@
+# @file   cpus.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Read fields of every CPU in sysblk->regs[] with as few reads as
+#         possible.
+#
+# @section Copyright
+#
+#   Copyright Notice:
+#
+#   Copyright (C) 2019 LzLabs GmbH
+#   All Rights Reserved.
+#
+#   This product and associated documentation includes confidential,
+#   proprietary and trade secret information and code.  No part of
+#   this product or associated documentation may be modified,
+#   distributed, or copied in any form except as expressly permitted
+#   by the license agreement pertaining to this product.
+#
+# @section License
+#
+#   This file is Object Code Only and is NOT to be distributed in source form.
+#
+# @section Description
+#
+#   info zthreads asks gdb for each field of each CPU, which is three
+#   expressions per CPU. Code that looks at the CPUs on every stop or every
+#   sample cannot afford that. Instead the layout of the regs[] entries is
+#   worked out once (the distance between two entries and the offset and
+#   size of each field) and then the fields of all the CPUs are taken out of
+#   one read of the array. If regs[] turns out not to be an array of
+#   structures, or the array is too large to read at once, each field is
+#   read on its own.
+#
+# @section Source
+#
+#   Information in this file is original.
+#
+import gdb
+import sys
+
+# @def   zos_cpu_fields
+# @brief The fields that can be read, by name: the member of sysblk->regs[i]
+#        and whether it is a number or a string.
+zos_cpu_fields = {
+   "ia"       : ( "psw.ia.F",          int ),
+   "mainstor" : ( "mainstor",          int ),
+   "progname" : ( "taskinfo.progname", str ),
+}
+
+# @def   zos_cpu_bulk
+# @brief The largest read made for all the CPUs at once.
+zos_cpu_bulk = 1024 * 1024
+
+# @fn    fieldValue
+# @brief Convert the bytes of a field to its value. Numbers are in the byte
+#        order of the host, which is the byte order of the emulator.
+def fieldValue( raw, kind ):
+   if kind == int:
+      return int.from_bytes( bytes( raw ), sys.byteorder )
+
+   return bytes( raw ).split( b"\0" )[0].decode( "ascii", "replace" ).strip( )
+
+# @class zcpus
+# @brief The layout of sysblk->regs[], worked out the first time it is read.
+#
+# @param[in] self - The self pointer to the instantiated structure/class.
+# @returns An instance of the structure.
+class zcpus:
+   def __init__( self ):
+      self.fields = None
+      self.stride = None
+      self.bulk   = False
+      self.reads  = 0
+
+   # @fn    clear
+   # @brief Forget the layout, for example when a new objfile is loaded.
+   def clear( self, *args ):
+      self.fields = None
+
+   # @fn    layout
+   # @brief Work out the distance between two regs[] entries and the offset
+   #        and size of each field in an entry.
+   def layout( self ):
+      if self.fields != None:
+         return self.fields
+
+      base        = int( gdb.parse_and_eval( "&sysblk->regs[0]" ) )
+      self.stride = int( gdb.parse_and_eval( "&sysblk->regs[1]" ) ) - base
+
+      # Only an array of structures can be read in one piece.
+      self.bulk   = int( gdb.parse_and_eval( "sizeof( sysblk->regs[0] )" ) ) == self.stride
+
+      fields = { }
+      for name, ( member, kind ) in zos_cpu_fields.items( ):
+         off  = int( gdb.parse_and_eval( "&sysblk->regs[0].{}".format( member ) ) ) - base
+         size = int( gdb.parse_and_eval( "sizeof( sysblk->regs[0].{} )".format( member ) ) )
+         fields[name] = ( off, size, kind )
+
+      self.fields = fields
+      return fields
+
+   # @fn    read
+   # @brief Read the named fields of every CPU.
+   #
+   # @param[in] self  - The self pointer to the instantiated structure/class.
+   # @param[in] names - The names of the fields, see zos_cpu_fields.
+   # @returns A list with a tuple per CPU: the sysblk->regs[] index followed
+   #          by the values of the fields in the order of names.
+   def read( self, names=( "ia", "mainstor" ) ):
+      fields = self.layout( )
+      count  = int( gdb.parse_and_eval( "sysblk->max_cpu_threads" ) )
+      inf    = gdb.selected_inferior( )
+      want   = [ fields[name] for name in names ]
+      cpus   = [ ]
+
+      if count <= 0:
+         return cpus
+
+      lo   = min( off for off, size, kind in want )
+      hi   = max( off + size for off, size, kind in want )
+      span = ( count - 1 ) * self.stride + hi - lo
+
+      if self.bulk and span <= zos_cpu_bulk:
+         base = int( gdb.parse_and_eval( "&sysblk->regs[0]" ) )
+         buf  = inf.read_memory( base + lo, span )
+         self.reads += 1
+
+         for cpu in range( count ):
+            at = cpu * self.stride - lo
+            cpus.append( ( cpu, ) + tuple( fieldValue( buf[at + off:at + off + size], kind )
+                                           for off, size, kind in want ) )
+         return cpus
+
+      for cpu in range( count ):
+         values = [ cpu ]
+         for name, ( off, size, kind ) in zip( names, want ):
+            addr = int( gdb.parse_and_eval( "&sysblk->regs[{}].{}".format( cpu, zos_cpu_fields[name][0] ) ) )
+            values.append( fieldValue( inf.read_memory( addr, size ), kind ) )
+            self.reads += 1
+         cpus.append( tuple( values ) )
+
+      return cpus
+
+# @def   zos_cpus
+# @brief The layout of sysblk->regs[] for the session. It is worked out
+#        again after a new objfile is loaded.
+zos_cpus = zcpus( )
+
+if hasattr( gdb.events, "new_objfile" ):
+   gdb.events.new_objfile.connect( zos_cpus.clear )
@@ -3,311 +3,81 @@
 # @brief  The routines here will be used for the decoding of different zOS
 #         innstructions into their basic components parts including all or some
 #         of the following:
-#         
+#
 #         Bx - The register number
 #         Dx - The data offset
-#         Ix - ???
+#         Ix - The immediate value
 #         Lx - The length of the data
 #         Mx - The mask field.
 #         Rx - The register number.
-#        
+#         Xx - The index register number.
+#
+#         The decoders only look at the bytes they are given and never talk to
+#         gdb, so they can be used outside of a debugging session.
+#
+#         Rather than writing a decoder by hand for every instruction format
+#         each format is described in zos_formats by the position and kind of
+#         its fields. compileFormat turns a description into a specialised
+#         decoder function when this module is imported. Compiling the
+#         generated source is most of the import time, so the compiled code is
+#         kept in __pycache__ next to this file and reused until it changes.
+#
 # https://www.ibm.com/support/libraryserver/download/dz9zr006.pdf
 #
-import gdb
+
+import sys
+import os
+import marshal
 
 # @class rvalue
 # @brief This structure will be used as the return value from these functions.
-# 
+#
+#        Only the raw bytes of the instruction are kept. The machine code and
+#        assembler text (and the field values) are worked out from them when
+#        they are asked for, so callers that only need the length or the
+#        Mnemonic never pay for building strings.
+#
 # @param[in] self - The self pointer to the instantiated structure/class.
 # @param[in] _sz  - This number bytes represented by the instruction.
-# @param[in] mac  - The machine language representation of the instruction.
-# @param[in] asm  - The assembly language representation of the instruction.
+# @param[in] raw  - The bytes of the instruction.
+# @param[in] fmt  - The decoder (RR, RX, ...) that produced the record.
+# @param[in] name - The instruction Mnemonic (filled in by disasm.decode).
+# @param[in] addr - The address of the instruction (filled in by disasm.decode).
 # @returns An instance of the structure.
 class rvalue:
-   def __init__( self, _sz ):
-      self._sz  = _sz
-      self._mac = ""
-      self._asm = ""
-
-# @fn	 RR
-# @brief Decode register and register format 1 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RR( arg ):
-   rv = rvalue( 2 )
-   
-   ops = gdb.execute( "x/2xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   R2 = int( ops[2], 16 ) & 0x0f
-   
-   rv._mac = "{:02X}{:02X}".format( int( ops[1], 16 ), int( ops[2], 16 ) )
-   rv._asm = "R{},R{}".format( R1, R2 )
-   
-   return rv
-
-# @fn	 RR_R
-# @brief Decode register and register format 1 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RR_R( arg ):
-   rv = rvalue( 2 )
-   
-   ops = gdb.execute( "x/2xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X}".format( int( ops[1], 16 ), int( ops[2], 16 ) )
-   rv._asm = "R{}".format( R1 )
-   
-   return rv
-
-# @fn	 RRE
-# @brief Decode register and register format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RRE( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[4], 16 ) >> 4
-   R2 = int( ops[4], 16 ) & 0x0f
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{},R{}".format( R1, R2 )
-   
-   return rv
-
-# @fn	 RRE_R
-# @brief Decode register and register format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RRE_R( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[4], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{}".format( R1 )
-   
-   return rv
-
-# @fn	 RRE_N
-# @brief Decode register and register format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RRE_N( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = ""
-   
-   return rv
-
-# @fn	 RRR
-# @brief Decode register and register format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RRR( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[4], 16 ) >> 4
-   R2 = int( ops[4], 16 ) & 0x0f
-   R3 = int( ops[3], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{},R{},R{}".format( R1, R2, R3 )
-   
-   return rv
-
-# @fn	 RRS
-# @brief Decode register and register format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RRS( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   R2 = int( ops[2], 16 ) & 0x0f
-   M3 = int( ops[5], 16 ) >> 4
-   D4 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   B4 = int( ops[3], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "R{},R{},{},{}({})".format( R1, R2, M3, D4, B4 )
-   
-   return rv
-
-# @fn	 RRF
-# @brief Decode register and register format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RRF( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[4], 16 ) >> 4
-   M3 = int( ops[3], 16 ) >> 4
-   R2 = int( ops[4], 16 ) & 0x0f
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{},{},R{}".format( R1, M3, R2 )
-   
-   return rv
-
-# @fn	 RRF_R
-# @brief Decode register and register format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RRF_R( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[3], 16 ) >> 4
-   R3 = int( ops[4], 16 ) >> 4
-   R2 = int( ops[4], 16 ) & 0x0f
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{},R{},R{}".format( R1, R3, R2 )
-   
-   return rv
-
-# @fn	 RRF_RM
-# @brief Decode register and register format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RRF_RM( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[4], 16 ) >> 4
-   R3 = int( ops[3], 16 ) >> 4
-   R2 = int( ops[4], 16 ) & 0x0f
-   M4 = int( ops[3], 16 ) & 0x0f
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{},R{},R{},{}".format( R1, R3, R2, M4 )
-   
-   return rv
-
-# @fn	 RRF_M
-# @brief Decode register and register format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RRF_M( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[4], 16 ) >> 4
-   R2 = int( ops[4], 16 ) & 0x0f
-   M4 = int( ops[3], 16 ) & 0x0f
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{},R{},{}".format( R1, R2, M4 )
-   
-   return rv
-
-# @fn	 RRF_RMRM
-# @brief Decode register and register format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RRF_RMRM( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[4], 16 ) >> 4
-   M3 = int( ops[3], 16 ) >> 4
-   R2 = int( ops[4], 16 ) & 0x0f
-   M4 = int( ops[3], 16 ) & 0x0f
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{},{},R{},{}".format( R1, M3, R2, M4 )
-   
-   return rv
-
-# @fn	 RRF_RRM
-# @brief Decode register and register format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RRF_RRM( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[4], 16 ) >> 4
-   R2 = int( ops[4], 16 ) & 0x0f
-   M3 = int( ops[3], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   
-   if M3 == 0:
-      rv._asm = "R{},R{}".format( R1, R2 )
-   else:
-      rv._asm = "R{},R{},{}".format( R1, R2, M3 )
-   
-   return rv
+   __slots__ = ( "_sz", "_raw", "_fmt", "_name", "_addr", "_text", "_branch" )
+
+   def __init__( self, _sz, raw=b"", fmt=None ):
+      self._sz   = _sz
+      self._raw  = raw
+      self._fmt  = fmt
+      self._name = ""
+      self._addr = 0
+      self._text = None
+      # ( kind, rel ) once cfg.branchOf has worked it out.
+      self._branch = None
+
+   # The machine language and assembly language text, built the first time
+   # either of them is asked for and then kept.
+   def text( self ):
+      if self._text == None:
+         self._text = ( self._fmt.mac( self._raw ), self._fmt.asm( self._raw ) )
+      return self._text
+
+   # The machine language representation of the instruction.
+   @property
+   def _mac( self ):
+      return self.text( )[0]
+
+   # The assembly language representation of the instruction.
+   @property
+   def _asm( self ):
+      return self.text( )[1]
+
+   # The field values in zos_formats order, see the decoder's fieldnames.
+   @property
+   def _fields( self ):
+      return self._fmt.fields( self._raw )
 
 # If both index and base are zero then drop both of them including the parentheses:
 # LA  R15,X'0'(X'0',B'0') -> LA R15,0
@@ -316,1002 +86,531 @@ def formatIndexBasePair( v, w ):
       return "";
    elif v == 0:
       return "(,R{})".format( w )
-   
-   return "({},R{})".format( v, w )
-
-# @fn	 RX
-# @brief Decode register and storage format 1 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RX( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ),
-                      to_string=True ).split( )
-   
-   R1 = int( ops[2], 16 ) >> 4
-   X2 = int( ops[2], 16 ) & 0x0f
-   B2 = int( ops[3], 16 ) >> 4
-   D2 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   ib = formatIndexBasePair( X2, B2 );
-   rv._asm = "R{},{}{}".format( R1, D2, ib )
-   
-   return rv
-
-# @fn	 RX_M
-# @brief Decode register and storage format 1 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RX_M( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   M1 = int( ops[2], 16 ) >> 4
-   D2 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   X2 = int( ops[2], 16 ) & 0x0f
-   B2 = int( ops[3], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   ib = formatIndexBasePair( X2, B2 );
-   rv._asm = "{},{}{}".format( M1, D2, ib )
-   
-   return rv
-
-# @fn	 RXE
-# @brief Decode register and storage format 1 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RXE( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   D2 = ( ( int( ops[3], 16 ) & 0x0f ) << 12 ) | int( ops[4], 16 )
-   X2 = int( ops[2], 16 ) & 0x0f
-   B2 = int( ops[3], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   ib = formatIndexBasePair( X2, B2 );
-   rv._asm = "R{},{}{}".format( R1, D2, ib )
-   
-   return rv
-
-# @fn	 RXF
-# @brief Decode register and storage format 1 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RXF( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[5], 16 ) >> 4
-   R3 = int( ops[2], 16 ) >> 4
-   D2 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   X2 = int( ops[2], 16 ) & 0x0f
-   B2 = int( ops[3], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   ib = formatIndexBasePair( X1, B2 );
-   rv._asm = "R{},R{},{}{}".format( R1, R3, D2, ib )
-   
-   return rv
-
-# @fn	 RXY
-# @brief Decode register and storage format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RXY( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   X2 = int( ops[2], 16 ) & 0x0f
-   B2 = int( ops[3], 16 ) >> 4
-   D2 = ( ( int( ops[5], 16 ) << 12 ) |
-          ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) |
-          ( int( ops[4], 16 ) ) )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   ib = formatIndexBasePair( B2, D2 );
-   rv._asm = "R{},{}{}".format( R1, X2, ib )
-   
-   return rv
-
-# @fn	 RXY_M
-# @brief Decode register and storage format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RXY_M( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   M1 = int( ops[2], 16 ) >> 4
-   X2 = int( ops[2], 16 ) & 0x0f
-   B2 = int( ops[3], 16 ) >> 4
-   D2 = ( ( int( ops[5], 16 ) << 12 ) |
-          ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) |
-          ( int( ops[4], 16 ) ) )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   ib = formatIndexBasePair( B2, D2 );
-   rv._asm = "R{},{}{}".format( R1, X2, ib )
-   
-   return rv
-
-# @fn	 RS
-# @brief Decode ??? format 1 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RS( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   R3 = int( ops[2], 16 ) & 0x0f
-   D2 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   B2 = int( ops[3], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{},R{},{}({})".format( R1, R3, D2, B2 )
-   
-   return rv
-
-# @fn	 RS_M
-# @brief Decode ??? format 1 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RS_M( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   M3 = int( ops[2], 16 ) & 0x0f
-   D2 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   B2 = int( ops[3], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{},{},{}(R{})".format( R1, M3, D2, B2 )
-   
-   return rv
-
-# @fn	 RS_D
-# @brief Decode ??? format 1 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RS_D( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   D2 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   B2 = int( ops[3], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{},{}({})".format( R1, D2, B2 )
-   
-   return rv
-
-# @fn	 RSY
-# @brief Decode ??? format ? instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RSY( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   R3 = int( ops[2], 16 ) & 0x0f
-   D2 = ( int( ops[6], 16 ) << 12 )           | \
-        ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | \
-        int( ops[4], 16 )
-   B2 = int( ops[3], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "R{},R{},{}({})".format( R1, R3, D2, B2 )
-   
-   return rv
-
-# @fn	 RSY_M
-# @brief Decode ??? format ? instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RSY_M( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   M3 = int( ops[2], 16 ) & 0x0f
-   D2 = ( int( ops[6], 16 ) << 12 )           | \
-        ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | \
-        int( ops[4], 16 )
-   B2 = int( ops[3], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "R{},{},{}({})".format( R1, M3, D2, B2 )
-   
-   return rv
 
-# @fn	 RSI
-# @brief Decode ??? format ? instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RSI( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   R3 = int( ops[2], 16 ) & 0x0f
-   I2 = ( int( ops[3], 16 ) << 8 ) | int( ops[4], 16 )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{},R{},{}".format( R1, R3, I2 )
-   
-   return rv
-
-# @fn	 RSL
-# @brief Decode ??? format ? instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RSL( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   D1 = ( int( ops[3], 16 ) << 8 ) | int( ops[4], 16 )
-   L1 = int( ops[2], 16 ) >> 4
-   B1 = int( ops[3], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "{}(L{},{})".format( D1, L1, B1 )
-   
-   return rv
-
-# @fn	 RI
-# @brief Decode register and immediate format 1 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RI( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   I2 = ( int( ops[3], 16 ) << 8 ) | ( int( ops[4], 16 ) )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "R{},{}".format( R1, I2 )
-   
-   return rv
-
-# @fn	 RI_M
-# @brief Decode register and immediate format 1 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RI_M( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   M1 = int( ops[2], 16 ) >> 4
-   I2 = ( int( ops[3], 16 ) << 8 ) | ( int( ops[4], 16 ) )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "{},{}".format( M1, I2 )
-   
-   return rv
-
-# @fn	 RIL
-# @brief Decode register and immediate format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RIL( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   I2 = ( int( ops[3], 16 ) << 12 ) | \
-        ( int( ops[4], 16 ) << 8  ) | \
-        int( ops[5], 16 )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "R{},{}".format( R1, I2 )
-   
-   return rv
-
-# @fn	 RIL_M
-# @brief Decode register and immediate format 2 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RIL_M( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   M1 = int( ops[2], 16 ) >> 4
-   I2 = ( int( ops[3], 16 ) << 12 ) | \
-        ( int( ops[4], 16 ) << 8  ) | \
-        ( int( ops[5], 16 ) << 4  ) | \
-        int( ops[6], 16 )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "R{},{}".format( R1, I2 )
-   
-   return rv
-
-# @fn	 RIE
-# @brief Decode register and immediate format 3 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RIE( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   R3 = int( ops[2], 16 ) & 0x0f
-   I2 = ( int( ops[3], 16 ) << 8 ) | int( ops[4], 16 )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "R{},R{},{}".format( R1, R3, I2 )
-   
-   return rv
-
-# @fn	 RIE_M
-# @brief Decode register and immediate format 3 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RIE_M( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   R2 = int( ops[2], 16 ) & 0x0f
-   M3 = int( ops[5], 16 ) >> 4
-   I4 = ( int( ops[3], 16 ) << 8 ) | int( ops[4], 16 )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "R{},R{},{},{}".format( R1, R2, M3, I4 )
-   
-   return rv
-
-# @fn	 RIE_IM
-# @brief Decode register and immediate format 3 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RIE_IM( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   I2 = ( int( ops[3], 16 ) << 8 ) | int( ops[4], 16 )
-   M3 = int( ops[5], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "R{},{},{}".format( R1, I2, M3 )
-   
-   return rv
-
-# @fn	 RIE_MI
-# @brief Decode register and immediate format 3 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RIE_MI( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   I2 = int( ops[5], 16 )
-   M3 = int( ops[2], 16 ) & 0x0f
-   I4 = ( int( ops[3], 16 ) << 8 ) | int( ops[4], 16 )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "R{},{},{},{}".format( R1, I2, M3, I4 )
-   
-   return rv
-
-# @fn	 RIE_RI
-# @brief Decode register and immediate format 3 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RIE_RI( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   R2 = int( ops[2], 16 ) & 0x0f
-   I3 = int( ops[3], 16 )
-   I4 = int( ops[4], 16 )
-   I5 = int( ops[5], 16 )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   
-   if I5 == 0:
-      rv._asm = "R{},R{},{},{}".format( R1, R2, I3, I4 )
-   else:
-      rv._asm = "R{},R{},{},{},{}".format( R1, R2, I3, I4, I5 )
-   
-   return rv
-
-# @fn	 RIS
-# @brief Decode register and immediate format 3 instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def RIS( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   R1 = int( ops[2], 16 ) >> 4
-   I2 = int( ops[5], 16 )
-   M3 = int( ops[2], 16 ) & 0x0f
-   D4 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   B4 = int( ops[3], 16 ) >>4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "R{},{},{},{}({})".format( R1, I2, M3, D4, B4 )
-   
-   return rv
-
-# @fn	 S
-# @brief Decode ???.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def S( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   D2 = int( ops[3], 16 ) >> 4
-   B2 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "{}({})".format( D2, B2 )
-   
-   return rv
-
-# @fn	 S_I
-# @brief Decode ???.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def S_I( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = ""
-   
-   return rv
-
-# @fn	 SI
-# @brief Decode storage and immediate format instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def SI( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   D1 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 ) 
-   B1 = int( ops[3], 16 ) >> 4
-   I2 = int( ops[2], 16 )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = "{}({}),{}".format( D1, B1, I2 )
-   
-   return rv
-
-# @fn	 SIY
-# @brief Decode storage and immediate format instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def SIY( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   I2 = int( ops[2], 16 )
-   B1 = int( ops[3], 16 ) >> 4
-   D1 = ( ( int( ops[5], 16 ) << 12 ) |
-          ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) |
-          ( int( ops[4], 16 ) ) )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "{}({}),{}".format( D1, B1, I2 )
-   
-   return rv
-
-# @fn	 SIL
-# @brief Decode storage and immediate format instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def SIL( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   D1 = ( ( int( ops[3], 16 ) & 0x0f ) << 16 ) | int( ops[4], 16 )
-   B1 = int( ops[3], 16 ) >> 4
-   I2 = ( int( ops[5], 16 ) << 16 ) | int( ops[6], 16 )
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "{}({}),{}".format( D1, B1, I2 )
-   
-   return rv
-
-# @fn    SS
-# @brief Decode storage and storage format instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def SS( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   D1 = ( int( ops[3], 16 ) & 0x0f ) << 16 | int( ops[4], 16 )
-   L  = int( ops[2], 16 )
-   B1 = int( ops[3], 16 ) >> 4
-   D2 = ( int( ops[5], 16 ) & 0x0f ) << 16 | int( ops[6], 16 )
-   B2 = int( ops[4], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "{}({},{}),{}({})".format( D1, L, B1, D2, B2 )
-   
-   return rv
-
-# @fn    SS_R
-# @brief Decode storage and storage format instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def SS_R( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-    
-   R1 = int( ops[2], 16 ) >> 4
-   R3 = int( ops[2], 16 ) & 0x0f
-   D2 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   B2 = int( ops[3], 16 ) >> 4
-   D4 = ( ( int( ops[5], 16 ) & 0x0f ) << 8 ) | int( ops[6], 16 )
-   B4 = int( ops[5], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "R{},R{},{}({}),{}({})".format( R1, R3, D2,
-                                                         B2, D4, B4 )
-   
-   return rv
-
-# @fn    SS_L
-# @brief Decode storage and storage format instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def SS_L( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-    
-   D1 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   L1 = int( ops[2], 16 ) >> 4
-   B1 = int( ops[3], 16 ) >> 4
-   D2 = ( ( int( ops[5], 16 ) & 0x0f ) << 8 ) | int( ops[6], 16 )
-   L2 = int( ops[2], 16 ) & 0x0f
-   B2 = int( ops[5], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "{}(L{},{}),{}(L{},{})".format( D1, L1, B1,
-                                                         D2, L2, B2 )
-   
-   return rv
-
-# @fn    SS_D
-# @brief Decode storage and storage format instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def SS_D( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-    
-   D1 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   B1 = int( ops[3], 16 ) >> 4
-   D2 = ( ( int( ops[5], 16 ) & 0x0f ) << 8 ) | int( ops[6], 16 )
-   L2 = int( ops[2], 16 )
-   B2 = int( ops[5], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "{}({}),{}(L{},{})".format( D1, B1, D2, L2, B2 )
-   
-   return rv
-
-# @fn    SS_RR
-# @brief Decode storage and storage format instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def SS_RR( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-    
-   R1 = int( ops[2], 16 ) >> 4
-   D2 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   B2 = int( ops[3], 16 ) >> 4
-   R3 = int( ops[2], 16 ) & 0x0f
-   D4 = ( ( int( ops[5], 16 ) & 0x0f ) << 8 ) | int( ops[6], 16 )
-   B4 = int( ops[5], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "R{},{}({}),R{},{}({})".format( R1, D2, B2,
-                                                         R3, D4, B4 )
-   
-   return rv
-
-# @fn    SS_I
-# @brief Decode storage and storage format instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def SS_I( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-    
-   D1 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   L1 = int( ops[2], 16 ) >> 4
-   B1 = int( ops[3], 16 ) >> 4
-   D2 = ( ( int( ops[5], 16 ) & 0x0f ) << 8 ) | int( ops[6], 16 )
-   B2 = int( ops[5], 16 ) >> 4
-   I3 = int( ops[2], 16 ) & 0x0f
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "{}(L{},{}),{}({}),{}".format( D1, L1, B1,
-                                                         D2, B2, I3 )
-   
-   return rv
-
-# @fn    SS_DD
-# @brief Decode storage and storage format instructions.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def SS_DD( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-    
-   D1 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   R1 = int( ops[2], 16 ) >> 4
-   B1 = int( ops[3], 16 ) >> 4
-   D2 = ( ( int( ops[5], 16 ) & 0x0f ) << 8 ) | int( ops[6], 16 )
-   B2 = int( ops[5], 16 ) >> 4
-   R3 = int( ops[2], 16 ) & 0x0f
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "{}(R{},{}),{}({}),R{}".format( D1, R1, B1,
-                                                         D2, B2, R3 )
-   
-   return rv
-
-# @fn    SSE
-# @brief Decode
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def SSE( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   D1 = ( ( int( ops[3], 16 ) & 0x0f ) << 8 ) | int( ops[4], 16 )
-   B1 = int( ops[3], 16 ) >> 4
-   D2 = ( ( int( ops[5], 16 ) & 0x0f ) << 8 ) | int( ops[6], 16 )
-   B2 = int( ops[5], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "{}({}),{}({})".format( D1, B1, D2, B2 )
-   
-   return rv
+   return "({},R{})".format( v, w )
 
-# @fn    SSF
-# @brief Decode
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def SSF( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   D1 = ( int( ops[3], 16 ) & 0x0f ) << 8 | int( ops[4], 16 )
-   B1 = int( ops[3], 16 ) >> 4
-   D2 = ( int( ops[5], 16 ) & 0x0f ) << 8 | int( ops[6], 16 )
-   B2 = int( ops[5], 16 ) >> 4
-   R3 = int( ops[2], 16 ) >> 4
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "{}({{}),{}({}),{}".format( D1, B1, D2, B2, R3 )
-   
-   return rv
+# A base register of zero means there is no base so drop the parentheses:
+# L   R1,X'8'(B'0') -> L R1,8
+def formatBase( w ):
+   if w == 0:
+      return ""
 
-# @fn    E
-# @brief Decode
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def E( arg ):
-   rv = rvalue( 2 )
-   
-   ops = gdb.execute( "x/2xb {}".format( arg ), to_string=True ).split( ) 
-   
-   rv._mac = "{:02X}{:02X}".format( int( ops[1], 16 ), int( ops[2], 16 ) )
-   rv._asm = ""
-   
-   return rv
+   return "(R{})".format( w )
 
-# @fn    Dd
-# @brief Decode the DIAGNOSE instruction.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def Dd( arg ):
-   rv = rvalue( 4 )
-   
-   ops = gdb.execute( "x/4xb {}".format( arg ), to_string=True ).split( ) 
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                 int( ops[2], 16 ),
-                                                 int( ops[3], 16 ),
-                                                 int( ops[4], 16 ) )
-   rv._asm = ""
-   
-   return rv
+# The length (or register) in front of the base is always shown but the base
+# register only when it is not zero:
+# MVC X'0'(L'8',B'0') -> MVC 0(8)
+def formatLengthBasePair( v, w ):
+   if w == 0:
+      return "({})".format( v )
 
-# @fn    I
-# @brief Decode
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def I( arg ):
-   rv = rvalue( 2 )
-   
-   ops = gdb.execute( "x/2xb {}".format( arg ), to_string=True ).split( ) 
-   
-   I = int( ops[2], 16 )
-   
-   rv._mac = "{:02X}{:02X}".format( int( ops[1], 16 ), int( ops[2], 16 ) )
-   rv._asm = "{}".format( I )
-   
-   return rv
+   return "({},R{})".format( v, w )
 
-# @fn    NYI
-# @brief Place holder for not yet implemented functionality.
-#
-# @param[in] arg - The address of the instruction to decode.
-# @return rv - A rvalue structure.
-def NYI( arg ):
-   rv = rvalue( 6 )
-   
-   ops = gdb.execute( "x/6xb {}".format( arg ), to_string=True ).split( ) 
-   
-   rv._mac = "{:02X}{:02X} {:02X}{:02X} {:02X}{:02X}".format( int( ops[1], 16 ),
-                                                              int( ops[2], 16 ),
-                                                              int( ops[3], 16 ),
-                                                              int( ops[4], 16 ),
-                                                              int( ops[5], 16 ),
-                                                              int( ops[6], 16 ) )
-   rv._asm = "?NYI?"
-   
-   return rv
+# @def   zos_formats
+# @brief The instruction formats used in instructions.py.
+#
+#        Every format is ( size, fields, operands ):
+#
+#        size     - The length of the instruction in bytes.
+#        fields   - ( name, bit offset, width, kind ) for every field that is
+#                   shown. Bit 0 is the high order bit of the first byte.
+#        operands - How the operands are shown, using the field names. An
+#                   operand may be a field, D(B), D(X,B) or D(L,B). Operands
+#                   in a trailing [...] are only shown when the field is not
+#                   zero. Anything that is not a field name is copied as is.
+#
+#        The kinds are:
+#
+#        reg   - A general register, shown as Rn.
+#        idx   - An index register, shown as part of D(X,B).
+#        base  - A base register, shown as part of D(B), D(X,B) or D(L,B).
+#        mask  - A mask or modifier.
+#        disp  - An unsigned 12 bit displacement.
+#        ldisp - A signed 20 bit long displacement stored as DL followed by DH.
+#        imm   - An unsigned immediate value.
+#        rel   - A signed relative offset in halfwords, shown as *+bytes.
+#        len   - A length code, shown as the real length (code + 1).
+zos_formats = {
+   "RR"       : ( 2, ( ( "R1",  8,  4, "reg"  ),
+                       ( "R2", 12,  4, "reg"  ) ),
+                  "R1,R2" ),
+   "RR_R"     : ( 2, ( ( "R1",  8,  4, "reg"  ), ),
+                  "R1" ),
+   "RRE"      : ( 4, ( ( "R1", 24,  4, "reg"  ),
+                       ( "R2", 28,  4, "reg"  ) ),
+                  "R1,R2" ),
+   "RRE_R"    : ( 4, ( ( "R1", 24,  4, "reg"  ), ),
+                  "R1" ),
+   "RRE_N"    : ( 4, ( ),
+                  "" ),
+   "RRR"      : ( 4, ( ( "R3", 16,  4, "reg"  ),
+                       ( "R1", 24,  4, "reg"  ),
+                       ( "R2", 28,  4, "reg"  ) ),
+                  "R1,R2,R3" ),
+   "RRS"      : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "R2", 12,  4, "reg"  ),
+                       ( "B4", 16,  4, "base" ),
+                       ( "D4", 20, 12, "disp" ),
+                       ( "M3", 32,  4, "mask" ) ),
+                  "R1,R2,M3,D4(B4)" ),
+   "RRF"      : ( 4, ( ( "M3", 16,  4, "mask" ),
+                       ( "R1", 24,  4, "reg"  ),
+                       ( "R2", 28,  4, "reg"  ) ),
+                  "R1,M3,R2" ),
+   "RRF_R"    : ( 4, ( ( "R3", 16,  4, "reg"  ),
+                       ( "R1", 24,  4, "reg"  ),
+                       ( "R2", 28,  4, "reg"  ) ),
+                  "R1,R3,R2" ),
+   "RRF_RM"   : ( 4, ( ( "R3", 16,  4, "reg"  ),
+                       ( "M4", 20,  4, "mask" ),
+                       ( "R1", 24,  4, "reg"  ),
+                       ( "R2", 28,  4, "reg"  ) ),
+                  "R1,R3,R2,M4" ),
+   "RRF_M"    : ( 4, ( ( "M4", 20,  4, "mask" ),
+                       ( "R1", 24,  4, "reg"  ),
+                       ( "R2", 28,  4, "reg"  ) ),
+                  "R1,R2,M4" ),
+   "RRF_RMRM" : ( 4, ( ( "M3", 16,  4, "mask" ),
+                       ( "M4", 20,  4, "mask" ),
+                       ( "R1", 24,  4, "reg"  ),
+                       ( "R2", 28,  4, "reg"  ) ),
+                  "R1,M3,R2,M4" ),
+   "RRF_RRM"  : ( 4, ( ( "M3", 16,  4, "mask" ),
+                       ( "R1", 24,  4, "reg"  ),
+                       ( "R2", 28,  4, "reg"  ) ),
+                  "R1,R2[,M3]" ),
+   "RX"       : ( 4, ( ( "R1",  8,  4, "reg"  ),
+                       ( "X2", 12,  4, "idx"  ),
+                       ( "B2", 16,  4, "base" ),
+                       ( "D2", 20, 12, "disp" ) ),
+                  "R1,D2(X2,B2)" ),
+   "RX_M"     : ( 4, ( ( "M1",  8,  4, "mask" ),
+                       ( "X2", 12,  4, "idx"  ),
+                       ( "B2", 16,  4, "base" ),
+                       ( "D2", 20, 12, "disp" ) ),
+                  "M1,D2(X2,B2)" ),
+   "RXE"      : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "X2", 12,  4, "idx"  ),
+                       ( "B2", 16,  4, "base" ),
+                       ( "D2", 20, 12, "disp" ) ),
+                  "R1,D2(X2,B2)" ),
+   "RXF"      : ( 6, ( ( "R3",  8,  4, "reg"  ),
+                       ( "X2", 12,  4, "idx"  ),
+                       ( "B2", 16,  4, "base" ),
+                       ( "D2", 20, 12, "disp" ),
+                       ( "R1", 32,  4, "reg"  ) ),
+                  "R1,R3,D2(X2,B2)" ),
+   "RXY"      : ( 6, ( ( "R1",  8,  4, "reg"   ),
+                       ( "X2", 12,  4, "idx"   ),
+                       ( "B2", 16,  4, "base"  ),
+                       ( "D2", 20, 20, "ldisp" ) ),
+                  "R1,D2(X2,B2)" ),
+   "RXY_M"    : ( 6, ( ( "M1",  8,  4, "mask"  ),
+                       ( "X2", 12,  4, "idx"   ),
+                       ( "B2", 16,  4, "base"  ),
+                       ( "D2", 20, 20, "ldisp" ) ),
+                  "M1,D2(X2,B2)" ),
+   "RS"       : ( 4, ( ( "R1",  8,  4, "reg"  ),
+                       ( "R3", 12,  4, "reg"  ),
+                       ( "B2", 16,  4, "base" ),
+                       ( "D2", 20, 12, "disp" ) ),
+                  "R1,R3,D2(B2)" ),
+   "RS_M"     : ( 4, ( ( "R1",  8,  4, "reg"  ),
+                       ( "M3", 12,  4, "mask" ),
+                       ( "B2", 16,  4, "base" ),
+                       ( "D2", 20, 12, "disp" ) ),
+                  "R1,M3,D2(B2)" ),
+   "RS_D"     : ( 4, ( ( "R1",  8,  4, "reg"  ),
+                       ( "B2", 16,  4, "base" ),
+                       ( "D2", 20, 12, "disp" ) ),
+                  "R1,D2(B2)" ),
+   "RSY"      : ( 6, ( ( "R1",  8,  4, "reg"   ),
+                       ( "R3", 12,  4, "reg"   ),
+                       ( "B2", 16,  4, "base"  ),
+                       ( "D2", 20, 20, "ldisp" ) ),
+                  "R1,R3,D2(B2)" ),
+   "RSY_M"    : ( 6, ( ( "R1",  8,  4, "reg"   ),
+                       ( "M3", 12,  4, "mask"  ),
+                       ( "B2", 16,  4, "base"  ),
+                       ( "D2", 20, 20, "ldisp" ) ),
+                  "R1,M3,D2(B2)" ),
+   "RSI"      : ( 4, ( ( "R1",  8,  4, "reg"  ),
+                       ( "R3", 12,  4, "reg"  ),
+                       ( "I2", 16, 16, "rel"  ) ),
+                  "R1,R3,I2" ),
+   "RSL"      : ( 6, ( ( "L1",  8,  4, "len"  ),
+                       ( "B1", 16,  4, "base" ),
+                       ( "D1", 20, 12, "disp" ) ),
+                  "D1(L1,B1)" ),
+   "RI"       : ( 4, ( ( "R1",  8,  4, "reg"  ),
+                       ( "I2", 16, 16, "imm"  ) ),
+                  "R1,I2" ),
+   "RI_REL"   : ( 4, ( ( "R1",  8,  4, "reg"  ),
+                       ( "I2", 16, 16, "rel"  ) ),
+                  "R1,I2" ),
+   "RI_M"     : ( 4, ( ( "M1",  8,  4, "mask" ),
+                       ( "I2", 16, 16, "rel"  ) ),
+                  "M1,I2" ),
+   "RIL"      : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "I2", 16, 32, "imm"  ) ),
+                  "R1,I2" ),
+   "RIL_REL"  : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "I2", 16, 32, "rel"  ) ),
+                  "R1,I2" ),
+   "RIL_M"    : ( 6, ( ( "M1",  8,  4, "mask" ),
+                       ( "I2", 16, 32, "rel"  ) ),
+                  "M1,I2" ),
+   "RIE"      : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "R3", 12,  4, "reg"  ),
+                       ( "I2", 16, 16, "rel"  ) ),
+                  "R1,R3,I2" ),
+   "RIE_M"    : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "R2", 12,  4, "reg"  ),
+                       ( "I4", 16, 16, "rel"  ),
+                       ( "M3", 32,  4, "mask" ) ),
+                  "R1,R2,M3,I4" ),
+   "RIE_IM"   : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "I2", 16, 16, "imm"  ),
+                       ( "M3", 32,  4, "mask" ) ),
+                  "R1,I2,M3" ),
+   "RIE_MI"   : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "M3", 12,  4, "mask" ),
+                       ( "I4", 16, 16, "rel"  ),
+                       ( "I2", 32,  8, "imm"  ) ),
+                  "R1,I2,M3,I4" ),
+   "RIE_RI"   : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "R2", 12,  4, "reg"  ),
+                       ( "I3", 16,  8, "imm"  ),
+                       ( "I4", 24,  8, "imm"  ),
+                       ( "I5", 32,  8, "imm"  ) ),
+                  "R1,R2,I3,I4[,I5]" ),
+   "RIS"      : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "M3", 12,  4, "mask" ),
+                       ( "B4", 16,  4, "base" ),
+                       ( "D4", 20, 12, "disp" ),
+                       ( "I2", 32,  8, "imm"  ) ),
+                  "R1,I2,M3,D4(B4)" ),
+   "S"        : ( 4, ( ( "B2", 16,  4, "base" ),
+                       ( "D2", 20, 12, "disp" ) ),
+                  "D2(B2)" ),
+   "S_I"      : ( 4, ( ),
+                  "" ),
+   "SI"       : ( 4, ( ( "I2",  8,  8, "imm"  ),
+                       ( "B1", 16,  4, "base" ),
+                       ( "D1", 20, 12, "disp" ) ),
+                  "D1(B1),I2" ),
+   "SIY"      : ( 6, ( ( "I2",  8,  8, "imm"   ),
+                       ( "B1", 16,  4, "base"  ),
+                       ( "D1", 20, 20, "ldisp" ) ),
+                  "D1(B1),I2" ),
+   "SIL"      : ( 6, ( ( "B1", 16,  4, "base" ),
+                       ( "D1", 20, 12, "disp" ),
+                       ( "I2", 32, 16, "imm"  ) ),
+                  "D1(B1),I2" ),
+   "SS"       : ( 6, ( ( "L",   8,  8, "len"  ),
+                       ( "B1", 16,  4, "base" ),
+                       ( "D1", 20, 12, "disp" ),
+                       ( "B2", 32,  4, "base" ),
+                       ( "D2", 36, 12, "disp" ) ),
+                  "D1(L,B1),D2(B2)" ),
+   "SS_R"     : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "R3", 12,  4, "reg"  ),
+                       ( "B2", 16,  4, "base" ),
+                       ( "D2", 20, 12, "disp" ),
+                       ( "B4", 32,  4, "base" ),
+                       ( "D4", 36, 12, "disp" ) ),
+                  "R1,R3,D2(B2),D4(B4)" ),
+   "SS_L"     : ( 6, ( ( "L1",  8,  4, "len"  ),
+                       ( "L2", 12,  4, "len"  ),
+                       ( "B1", 16,  4, "base" ),
+                       ( "D1", 20, 12, "disp" ),
+                       ( "B2", 32,  4, "base" ),
+                       ( "D2", 36, 12, "disp" ) ),
+                  "D1(L1,B1),D2(L2,B2)" ),
+   "SS_D"     : ( 6, ( ( "L2",  8,  8, "len"  ),
+                       ( "B1", 16,  4, "base" ),
+                       ( "D1", 20, 12, "disp" ),
+                       ( "B2", 32,  4, "base" ),
+                       ( "D2", 36, 12, "disp" ) ),
+                  "D1(B1),D2(L2,B2)" ),
+   "SS_RR"    : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "R3", 12,  4, "reg"  ),
+                       ( "B2", 16,  4, "base" ),
+                       ( "D2", 20, 12, "disp" ),
+                       ( "B4", 32,  4, "base" ),
+                       ( "D4", 36, 12, "disp" ) ),
+                  "R1,D2(B2),R3,D4(B4)" ),
+   "SS_I"     : ( 6, ( ( "L1",  8,  4, "len"  ),
+                       ( "I3", 12,  4, "imm"  ),
+                       ( "B1", 16,  4, "base" ),
+                       ( "D1", 20, 12, "disp" ),
+                       ( "B2", 32,  4, "base" ),
+                       ( "D2", 36, 12, "disp" ) ),
+                  "D1(L1,B1),D2(B2),I3" ),
+   "SS_DD"    : ( 6, ( ( "R1",  8,  4, "reg"  ),
+                       ( "R3", 12,  4, "reg"  ),
+                       ( "B1", 16,  4, "base" ),
+                       ( "D1", 20, 12, "disp" ),
+                       ( "B2", 32,  4, "base" ),
+                       ( "D2", 36, 12, "disp" ) ),
+                  "D1(R1,B1),D2(B2),R3" ),
+   "SSE"      : ( 6, ( ( "B1", 16,  4, "base" ),
+                       ( "D1", 20, 12, "disp" ),
+                       ( "B2", 32,  4, "base" ),
+                       ( "D2", 36, 12, "disp" ) ),
+                  "D1(B1),D2(B2)" ),
+   "SSF"      : ( 6, ( ( "R3",  8,  4, "reg"  ),
+                       ( "B1", 16,  4, "base" ),
+                       ( "D1", 20, 12, "disp" ),
+                       ( "B2", 32,  4, "base" ),
+                       ( "D2", 36, 12, "disp" ) ),
+                  "D1(B1),D2(B2),R3" ),
+   "E"        : ( 2, ( ),
+                  "" ),
+   "Dd"       : ( 4, ( ),
+                  "" ),
+   "I"        : ( 2, ( ( "I",   8,  8, "imm"  ), ),
+                  "I" ),
+   "NYI"      : ( 6, ( ),
+                  "?NYI?" )
+}
+
+# @fn    extractField
+# @brief Build the Python expression that extracts a field from the
+#        instruction bytes b0, b1, ... bN.
+#
+# @param[in] bit   - The bit offset of the field.
+# @param[in] width - The width of the field in bits.
+# @param[in] kind  - The field kind (see zos_formats).
+# @returns The expression as a string.
+def extractField( bit, width, kind ):
+   if kind == "ldisp":
+      # DL is the first 12 bits and DH, which holds the sign, the last 8.
+      dl = extractField( bit, 12, "disp" )
+      dh = extractField( bit + 12, 8, "imm" )
+      return "( {} | ( ( {} ^ 0x80 ) - 0x80 ) << 12 )".format( dl, dh )
+
+   first = bit // 8
+   last  = ( bit + width - 1 ) // 8
+   shift = ( last + 1 ) * 8 - ( bit + width )
+   mask  = ( 1 << width ) - 1
+
+   expr = " | ".join( "b{} << {}".format( i, ( last - i ) * 8 )
+                      if i != last else "b{}".format( i )
+                      for i in range( first, last + 1 ) )
+   if first != last:
+      expr = "( {} )".format( expr )
+   if shift:
+      expr = "( {} >> {} )".format( expr, shift )
+   if width != ( last - first + 1 ) * 8 - shift:
+      expr = "( {} & {:#x} )".format( expr, mask )
+
+   if kind == "rel":
+      sign = 1 << ( width - 1 )
+      expr = "( ( {} ^ {:#x} ) - {:#x} )".format( expr, sign, sign )
+
+   return expr
+
+# @fn    splitOperands
+# @brief Split an operand list on the commas that are not inside parentheses.
+#
+# @param[in] operands - The operands as written in zos_formats.
+# @returns A list with one string per operand.
+def splitOperands( operands ):
+   ops   = [ ]
+   depth = 0
+   cur   = ""
+
+   for c in operands:
+      if c == "," and depth == 0:
+         ops.append( cur )
+         cur = ""
+         continue
+      if c == "(":
+         depth += 1
+      elif c == ")":
+         depth -= 1
+      cur += c
+
+   if cur:
+      ops.append( cur )
+
+   return ops
+
+# @fn    formatOperand
+# @brief Build the format text and arguments that show a single operand.
+#
+# @param[in] op     - The operand as written in zos_formats.
+# @param[in] fields - Dictionary of field name to ( bit, width, kind ).
+# @returns A tuple of the format text and a list of argument expressions.
+def formatOperand( op, fields ):
+   if op in fields:
+      kind = fields[op][2]
+      if kind == "reg":
+         return ( "R%d", [ op ] )
+      elif kind == "rel":
+         return ( "*%+d", [ "{} * 2".format( op ) ] )
+      elif kind == "len":
+         return ( "%d", [ "{} + 1".format( op ) ] )
+      return ( "%d", [ op ] )
+
+   if op.endswith( ")" ) and "(" in op:
+      disp, inner = op[:-1].split( "(", 1 )
+      parts = inner.split( "," )
+
+      if len( parts ) == 1:
+         return ( "%d%s", [ disp, "formatBase( {} )".format( parts[0] ) ] )
+
+      mid, base = parts
+      if fields[mid][2] == "idx":
+         return ( "%d%s", [ disp,
+                            "formatIndexBasePair( {}, {} )".format( mid, base ) ] )
+
+      text, args = formatOperand( mid, fields )
+      return ( "%d%s", [ disp,
+                         "formatLengthBasePair( {} % ( {} ), {} )".format( repr( text ),
+                                                                           args[0],
+                                                                           base ) ] )
+
+   return ( op.replace( "%", "%%" ), [ ] )
+
+# @fn    formatSource
+# @brief The Python source of the decoder, fields, mac and asm functions for
+#        a zos_formats entry.
+#
+#        The decoder only copies the bytes of the instruction into a rvalue.
+#        The field values, machine code and assembler text are produced by
+#        the fields, mac and asm functions, which are attached to the
+#        decoder. They unpack the raw bytes once and extract every field
+#        with the shifts and masks worked out here instead of on every call.
+#
+# @param[in] name - The name of the format and of the generated function.
+# @param[in] spec - The ( size, fields, operands ) entry.
+# @returns The source text.
+def formatSource( name, spec ):
+   size, fields, operands = spec
+   byname = dict( ( f[0], f[1:] ) for f in fields )
+
+   optional = ""
+   if operands.endswith( "]" ):
+      operands, optional = operands[:-1].split( "[", 1 )
+      optional = optional.lstrip( "," )
+
+   text = [ ]
+   args = [ ]
+   for op in splitOperands( operands ):
+      t, a = formatOperand( op, byname )
+      text.append( t )
+      args.extend( a )
+
+   asm = "\"{}\" % ( {} )".format( ",".join( text ),
+                                   "".join( a + ", " for a in args ) )
+   if optional:
+      t, a = formatOperand( optional, byname )
+      asm += " + ( \",{}\" % ( {}, ) if {} else \"\" )".format( t,
+                                                               ", ".join( a ),
+                                                               optional )
+
+   unpack  = "   {}, = raw\n".format( ", ".join( "b{}".format( i )
+                                                for i in range( size ) ) )
+   extract = "".join( "   {} = {}\n".format( f, extractField( *byname[f] ) )
+                      for f in byname )
+
+   src  = "def {}( buf, off ):\n".format( name )
+   src += "   raw = bytes( buf[off:off + {}] )\n".format( size )
+   src += "   if len( raw ) != {}:\n".format( size )
+   src += "      raise IndexError( \"{} instruction runs past the buffer\" )\n".format( name )
+   src += "   return rvalue( {}, raw, {} )\n".format( size, name )
+
+   src += "def fields( raw ):\n"
+   src += unpack + extract
+   src += "   return ( {} )\n".format( "".join( f + ", " for f in byname ) )
+
+   src += "def mac( raw ):\n"
+   src += "   return \"{}\" % tuple( raw )\n".format(
+             " ".join( "%02X%02X" for i in range( 0, size, 2 ) ) )
+
+   src += "def asm( raw ):\n"
+   src += unpack + extract
+   src += "   return {}\n".format( asm )
+
+   return src
+
+# @fn    compileFormat
+# @brief Turn a zos_formats entry into a decoder function.
+#
+# @param[in] name - The name of the format and of the generated function.
+# @param[in] spec - The ( size, fields, operands ) entry.
+# @param[in] code - The compiled formatSource, compiled here when None.
+# @returns The decoder function, taking ( buf, off ).
+def compileFormat( name, spec, code=None ):
+   size   = spec[0]
+   byname = dict( ( f[0], f[1:] ) for f in spec[1] )
+
+   if code == None:
+      code = compile( formatSource( name, spec ), "<zos_formats {}>".format( name ), "exec" )
+
+   scope = { "rvalue"               : rvalue,
+             "formatBase"           : formatBase,
+             "formatIndexBasePair"  : formatIndexBasePair,
+             "formatLengthBasePair" : formatLengthBasePair }
+   exec( code, scope )
+
+   func = scope[name]
+   func.__doc__ = "Decode {} format instructions: {}".format( name,
+                                                             spec[2] or "(no operands)" )
+   func.size       = size
+   func.fieldnames = tuple( byname )
+   func.fieldkinds = tuple( byname[f][2] for f in byname )
+   func.fields     = scope["fields"]
+   func.mac        = scope["mac"]
+   func.asm        = scope["asm"]
+
+   return func
+
+# @def   zos_formats_cache
+# @brief Where the compiled zos_formats are kept between imports.
+zos_formats_cache = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), "__pycache__",
+                                  "zos_formats.{}.marshal".format( sys.implementation.cache_tag ) )
+
+# @fn    loadFormats
+# @brief The compiled code of every zos_formats entry by name, from
+#        zos_formats_cache when it was written for this version of this
+#        file, otherwise compiled and written there for the next import.
+def loadFormats( path=zos_formats_cache ):
+   st    = os.stat( __file__ )
+   stamp = ( st.st_mtime_ns, st.st_size )
+
+   try:
+      with open( path, "rb" ) as f:
+         saved, codes = marshal.load( f )
+      if saved == stamp and set( codes ) == set( zos_formats ):
+         return codes
+   except ( OSError, EOFError, ValueError, TypeError ):
+      pass
+
+   codes = dict( ( name, compile( formatSource( name, spec ), "<zos_formats {}>".format( name ),
+                                  "exec" ) )
+                 for name, spec in zos_formats.items( ) )
+
+   # The cache is only an optimisation; a read only install compiles every
+   # time, and like Python's own bytecode it is not written when asked not to.
+   if sys.dont_write_bytecode:
+      return codes
+
+   try:
+      os.makedirs( os.path.dirname( path ), exist_ok=True )
+      tmp = "{}.{}".format( path, os.getpid( ) )
+      with open( tmp, "wb" ) as f:
+         marshal.dump( ( stamp, codes ), f )
+      os.replace( tmp, path )
+   except OSError:
+      pass
+
+   return codes
+
+# Create RR, RX, SS_L, ... as module level decoders so that the instruction
+# tables can refer to them by name.
+_codes = loadFormats( )
+for _name, _spec in zos_formats.items( ):
+   globals( )[_name] = compileFormat( _name, _spec, _codes[_name] )
@@ -0,0 +1,171 @@
+# @file	  disasm.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Decode a zOS instruction stream held in a memory buffer. Nothing in
+#         here talks to gdb so it can be used from batch tools and tests as
+#         well as from the zdisass command.
+#
+# https://www.ibm.com/support/libraryserver/download/dz9zr006.pdf
+#
+import sys
+import os
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+_apis = os.path.dirname( os.path.abspath( __file__ ) )
+if sys.path[0] != _apis:
+   sys.path.insert( 0, _apis )
+
+from decoder import *
+from instructions import *
+
+# @fn    getOpcode
+# @brief Build the Mnemonic lookup key for the instruction at buf[off].
+#
+#        Most of the instruction Mnemonics are 2 bytes. However, there are
+#        others that are 3 and 4 bytes as well. Based on what again is
+#        documented in Appendix B of the document mentioned above, the
+#        following instructions beginning whith these 2 bytes are 3 and 4
+#        byte Mnemonics. All others are 2 bytes.
+#
+#        3 bytes: 0xa5, 0xa7, 0xc0, 0xc2, 0xc4, 0xc6, 0xc8
+#        4 bytes: 0xb2, 0xb3, 0xb9, 0xe3, 0xe5, 0xeb, 0xec, 0xed
+#
+#        Where the rest of the Mnemonic lives is looked up in zos_dispatch.
+#
+# @param[in] buf - The memory buffer holding the instruction stream.
+# @param[in] off - The offset of the instruction within the buffer.
+# @returns The key used to index the zos_Nbyte_mnemonics dictionaries.
+def getOpcode( buf, off ):
+   im  = buf[off]
+   sel = zos_dispatch[im]
+
+   return ( im << sel[2] ) | ( buf[off + sel[0]] & sel[1] )
+
+# @fn    decode
+# @brief Decode the single instruction found at buf[off].
+#
+# @param[in] buf     - Any indexable sequence of byte values (bytes,
+#                      bytearray, memoryview, mmap) holding the instructions.
+# @param[in] off     - The offset of the instruction within the buffer.
+# @param[in] address - The address the instruction was fetched from. This is
+#                      only recorded in the result.
+# @returns A rvalue with _sz, _mac, _name, _asm and _addr filled in, or None
+#          if the opcode is unknown. IndexError is raised if the instruction
+#          runs off the end of the buffer.
+def decode( buf, off, address=0 ):
+   ii   = lookupInst( buf, off )
+   func = zos_inst_funcs[ii]
+
+   if ( func == None ):
+      return None
+
+   rv = func( buf, off )
+   rv._name = zos_inst_names[ii]
+   rv._addr = address
+
+   return rv
+
+# @fn    formatInst
+# @brief Format a decoded instruction the way zdisass prints it.
+#
+# @param[in] rv    - The rvalue returned by decode.
+# @param[in] zaddr - The zOS (mainstor relative) address of the instruction.
+# @param[in] off   - The offset from the start of the disassembled range.
+# @returns The output line without a trailing newline.
+def formatInst( rv, zaddr, off ):
+   return "{:#x} {:08X} <{:=+04X}>: {:14} {:6} {}".format( rv._addr,
+                                                          zaddr,
+                                                          off,
+                                                          rv._mac,
+                                                          rv._name,
+                                                          rv._asm )
+
+# @fn    iter_decode
+# @brief Decode the instructions that start in buf[start:end], in order.
+#
+#        Decoding stops at the first unknown opcode. An instruction that
+#        starts before end but runs past the end of the buffer raises
+#        IndexError.
+#
+# @param[in] buf     - The memory buffer holding the instruction stream.
+# @param[in] start   - The offset of the first instruction within the buffer.
+# @param[in] end     - Instructions starting at or after this offset are not
+#                      decoded. Defaults to the end of the buffer.
+# @param[in] address - The address of buf[start].
+# @param[in] cache   - An optional cache.zcache to decode through.
+# @returns A generator of rvalues.
+def iter_decode( buf, start=0, end=None, address=0, cache=None ):
+   if end == None:
+      end = len( buf )
+
+   dec = decode if cache == None else cache.decode
+
+   off = start
+   while off < end:
+      rv = dec( buf, off, address + off - start )
+
+      if ( rv == None ):
+         return
+
+      yield rv
+
+      off += rv._sz
+
+# @fn    syncBackward
+# @brief Find where to start decoding so that count instructions are listed
+#        before the instruction at buf[target].
+#
+#        Instructions have different lengths so it is not known where the
+#        instruction before target starts. Every halfword in the window is
+#        tried as a start. A candidate is valid when it decodes without an
+#        unknown opcode and lands exactly on target. Valid candidates soon
+#        run into the same instruction starts, so each instruction start is
+#        scored by how many valid candidates pass through it, and the best
+#        scored start count instructions back from target is chosen.
+#        Each offset is decoded at most once.
+#
+# @param[in] buf    - The memory buffer; buf[0] is the start of the window.
+# @param[in] target - The offset of the instruction to go back from.
+# @param[in] count  - The number of instructions wanted before target.
+# @returns ( start, n ): the offset to decode from and the number of
+#          instructions between it and target, which is less than count if
+#          the window does not hold count valid instructions.
+def syncBackward( buf, target, count ):
+   nxt   = { }
+   depth = { }
+   votes = { }
+
+   # Where each halfword goes and how many instructions it is from target.
+   for off in range( target - 2, -1, -2 ):
+      try:
+         rv = decode( buf, off )
+      except IndexError:
+         rv = None
+
+      if rv == None:
+         continue
+
+      n = off + rv._sz
+      if n == target:
+         depth[off] = 1
+      elif n in depth:
+         depth[off] = depth[n] + 1
+      else:
+         continue
+
+      nxt[off] = n
+
+   # Every valid candidate votes for itself and all the starts it runs into.
+   for off in sorted( depth ):
+      votes[off] = votes.get( off, 0 ) + 1
+      if nxt[off] != target:
+         votes[nxt[off]] = votes.get( nxt[off], 0 ) + votes[off]
+
+   if not depth:
+      return ( target, 0 )
+
+   n    = min( count, max( depth.values( ) ) )
+   best = max( ( off for off in depth if depth[off] == n ),
+               key=lambda off: ( votes[off], -off ) )
+
+   return ( best, n )
@@ -0,0 +1,234 @@
+# @file	  instrument.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Opt-in counting and timing of the gdb calls made by the commands.
+#
+# @section Copyright
+#
+#   Copyright Notice:
+#
+#   Copyright (C) 2019 LzLabs GmbH
+#   All Rights Reserved.
+#
+#   This product and associated documentation includes confidential,
+#   proprietary and trade secret information and code.  No part of
+#   this product or associated documentation may be modified,
+#   distributed, or copied in any form except as expressly permitted
+#   by the license agreement pertaining to this product.
+#
+# @section License
+#
+#   This file is Object Code Only and is NOT to be distributed in source form.
+#
+# @section Description
+#
+#   While it is on, gdb.execute, gdb.parse_and_eval, gdb.lookup_type and
+#   reads of inferior memory through gdb.selected_inferior are replaced by
+#   versions that count and time each call against the command that made it
+#   and against the file and line it was made from. The invoke method of every
+#   gdb.Command subclass is wrapped as well, to time the command as a whole.
+#   What is left of a command's time after its gdb calls is the time spent
+#   in Python. Turning it off puts the originals back, so there is no cost
+#   when it is not used.
+#
+# @section Source
+#
+#   Information in this file is original.
+#
+import gdb
+import sys
+import os
+import time
+
+# @def   zos_profiled_apis
+# @brief The gdb module functions that are counted and timed.
+zos_profiled_apis = ( "execute", "parse_and_eval", "lookup_type" )
+
+# @def   zos_profile_columns
+# @brief The calls reported per command, in order.
+zos_profile_columns = zos_profiled_apis + ( "read_memory", )
+
+# @class zinferior
+# @brief Stands in for a gdb.Inferior and times its read_memory calls.
+class zinferior:
+   def __init__( self, inf, prof ):
+      self._inf  = inf
+      self._prof = prof
+
+   def read_memory( self, addr, length ):
+      t = time.perf_counter( )
+      try:
+         return self._inf.read_memory( addr, length )
+      finally:
+         self._prof.record( "read_memory", time.perf_counter( ) - t, sys._getframe( 1 ), length )
+
+   def __getattr__( self, name ):
+      return getattr( self._inf, name )
+
+# @class zprofiler
+# @brief The counters and the code that installs and removes the wrappers.
+#
+# @param[in] self - The self pointer to the instantiated structure/class.
+# @returns An instance of the structure.
+class zprofiler:
+   def __init__( self ):
+      self.enabled = False
+      self.saved   = { }
+      self.invokes = { }
+      self.reset( )
+
+   # @fn    reset
+   # @brief Zero every counter.
+   def reset( self ):
+      # name : [ calls, seconds, { api : [ calls, seconds, bytes ] } ]
+      self.commands = { }
+      # ( api, file, line, function ) : [ calls, seconds, bytes ]
+      self.sites    = { }
+      self.stack    = [ ]
+
+   # @fn    record
+   # @brief Count one gdb call made from frame against the running command.
+   def record( self, api, seconds, frame, nbytes=0 ):
+      cmd = self.stack[-1] if self.stack else "(no command)"
+
+      ent = self.commands.get( cmd )
+      if ent == None:
+         ent = self.commands[cmd] = [ 0, 0.0, { } ]
+
+      per = ent[2].setdefault( api, [ 0, 0.0, 0 ] )
+      per[0] += 1
+      per[1] += seconds
+      per[2] += nbytes
+
+      code = frame.f_code
+      site = ( api, os.path.basename( code.co_filename ), frame.f_lineno, code.co_name )
+
+      per = self.sites.setdefault( site, [ 0, 0.0, 0 ] )
+      per[0] += 1
+      per[1] += seconds
+      per[2] += nbytes
+
+   # @fn    wrapApi
+   # @brief A timed version of the gdb module function func.
+   def wrapApi( self, api, func ):
+      prof = self
+
+      def timed( *args, **kwargs ):
+         t = time.perf_counter( )
+         try:
+            return func( *args, **kwargs )
+         finally:
+            prof.record( api, time.perf_counter( ) - t, sys._getframe( 1 ) )
+
+      return timed
+
+   # @fn    wrapInvoke
+   # @brief A timed version of a command's invoke method.
+   def wrapInvoke( self, name, invoke ):
+      prof = self
+
+      def timed( cmd, arg, from_tty ):
+         ent = prof.commands.get( name )
+         if ent == None:
+            ent = prof.commands[name] = [ 0, 0.0, { } ]
+
+         prof.stack.append( name )
+         t = time.perf_counter( )
+         try:
+            return invoke( cmd, arg, from_tty )
+         finally:
+            ent[0] += 1
+            ent[1] += time.perf_counter( ) - t
+            prof.stack.pop( )
+
+      return timed
+
+   # @fn    commandClasses
+   # @brief Every gdb.Command subclass defined so far.
+   def commandClasses( self ):
+      todo = list( gdb.Command.__subclasses__( ) )
+      seen = [ ]
+
+      while todo:
+         cls = todo.pop( )
+         if cls not in seen:
+            seen.append( cls )
+            todo.extend( cls.__subclasses__( ) )
+
+      return seen
+
+   # @fn    on
+   # @brief Install the wrappers.
+   def on( self ):
+      if self.enabled:
+         return
+
+      for api in zos_profiled_apis:
+         self.saved[api] = getattr( gdb, api )
+         setattr( gdb, api, self.wrapApi( api, self.saved[api] ) )
+
+      inferior = self.saved["selected_inferior"] = gdb.selected_inferior
+      gdb.selected_inferior = lambda: zinferior( inferior( ), self )
+
+      for cls in self.commandClasses( ):
+         # zprofile itself is left alone so that show and off do not count,
+         # as are the stand ins of apis/lazy.py.
+         if "invoke" in cls.__dict__ and cls.__name__ not in ( "zprofile", "zlazy" ):
+            self.invokes[cls] = cls.__dict__["invoke"]
+            cls.invoke = self.wrapInvoke( cls.__name__, self.invokes[cls] )
+
+      self.enabled = True
+
+   # @fn    off
+   # @brief Put the original functions back.
+   def off( self ):
+      if not self.enabled:
+         return
+
+      for api, func in self.saved.items( ):
+         setattr( gdb, api, func )
+
+      for cls, invoke in self.invokes.items( ):
+         cls.invoke = invoke
+
+      self.saved.clear( )
+      self.invokes.clear( )
+      self.enabled = False
+
+   # @fn    report
+   # @brief The per command totals and the top call sites as text lines.
+   #
+   # @param[in] top - The number of call sites to list.
+   # @returns A list of lines.
+   def report( self, top=10 ):
+      lines = [ ]
+
+      hdr = "{:20} {:>6} {:>10} {:>10}".format( "command", "calls", "total s", "python s" )
+      for api in zos_profile_columns:
+         hdr += " {:>20}".format( api )
+      lines.append( hdr )
+
+      for name, ( calls, secs, apis ) in sorted( self.commands.items( ),
+                                                 key=lambda e: -e[1][1] ):
+         gdbsecs = sum( a[1] for a in apis.values( ) )
+         line    = "{:20} {:6} {:10.4f} {:>10}".format( name, calls, secs,
+                                                        "{:.4f}".format( secs - gdbsecs )
+                                                        if calls else "-" )
+         for api in zos_profile_columns:
+            a = apis.get( api )
+            line += " {:>20}".format( "{} / {:.4f}".format( a[0], a[1] ) if a else "-" )
+         lines.append( line )
+
+      lines.append( "" )
+      lines.append( "{:16} {:>8} {:>10} {:>10}  {}".format( "call", "count", "seconds",
+                                                             "bytes", "site" ) )
+
+      for ( api, fn, ln, func ), ( n, secs, nbytes ) in sorted( self.sites.items( ),
+                                                                key=lambda e: -e[1][1] )[:top]:
+         lines.append( "{:16} {:8} {:10.4f} {:10}  {}:{} ({})".format( api, n, secs, nbytes,
+                                                                      fn, ln, func ) )
+
+      return lines
+
+# @def   zos_profiler
+# @brief The profiler used by the zprofile command.
+zos_profiler = zprofiler( )
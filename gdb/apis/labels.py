@@ -0,0 +1,170 @@
+# @file	  labels.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Resolve relative branch targets and name them from an index of
+#         known entry points.
+#
+#         The entry points are kept as sorted start addresses so finding the
+#         one a target falls in is a binary search. The index is only sorted
+#         again after entry points have been added, so building it once and
+#         using it for every line of every listing stays O(log n) per line.
+#
+#         Like disasm.py this does not need gdb.
+#
+import sys
+import os
+import re
+import bisect
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+_apis = os.path.dirname( os.path.abspath( __file__ ) )
+if sys.path[0] != _apis:
+   sys.path.insert( 0, _apis )
+
+from cfg import branchOf
+
+# @class zlabels
+# @brief An interval index of named entry points keyed by zOS address.
+#
+#        A label covers the addresses from its start up to its size, or up to
+#        the next label when it has no size.
+#
+# @param[in] self - The self pointer to the instantiated structure/class.
+# @returns An instance of the structure.
+class zlabels:
+   def __init__( self ):
+      self.entries = { }
+      self.starts  = [ ]
+      self.ends    = [ ]
+      self.names   = [ ]
+      self.dirty   = False
+
+   def __len__( self ):
+      return len( self.entries )
+
+   # @fn    add
+   # @brief Name the zOS address start, optionally for size bytes.
+   def add( self, start, name, size=None ):
+      self.entries[start] = ( name, size )
+      self.dirty = True
+
+   # @fn    clear
+   # @brief Forget every label. Usable as a gdb event handler.
+   def clear( self, *args ):
+      self.entries.clear( )
+      self.dirty = True
+
+   # @fn    build
+   # @brief Sort the labels into the start, end and name arrays.
+   def build( self ):
+      self.starts = sorted( self.entries )
+      self.names  = [ self.entries[s][0] for s in self.starts ]
+      self.ends   = [ ]
+
+      for i, s in enumerate( self.starts ):
+         size = self.entries[s][1]
+         if size != None:
+            self.ends.append( s + size )
+         elif i + 1 < len( self.starts ):
+            self.ends.append( self.starts[i + 1] )
+         else:
+            self.ends.append( None )
+
+      self.dirty = False
+
+   # @fn    lookup
+   # @brief Find the label covering the zOS address zaddr.
+   #
+   # @returns ( name, offset ) or None.
+   def lookup( self, zaddr ):
+      if self.dirty:
+         self.build( )
+
+      i = bisect.bisect_right( self.starts, zaddr ) - 1
+      if i < 0:
+         return None
+
+      end = self.ends[i]
+      if end != None and zaddr >= end:
+         return None
+
+      return ( self.names[i], zaddr - self.starts[i] )
+
+   # @fn    items
+   # @brief The labels as ( start, name, size ) sorted by address.
+   def items( self ):
+      return [ ( s, ) + self.entries[s] for s in sorted( self.entries ) ]
+
+# @def   zos_eyecatcher
+# @brief The standard OS linkage entry: B n(,R15) over a length byte and the
+#        name of the routine in EBCDIC.
+zos_eyecatcher = re.compile( rb"\x47\xf0\xf0(.)", re.DOTALL )
+
+# @def   zos_name_chars
+# @brief The EBCDIC bytes allowed in a routine name: A-Z, 0-9, $, #, @ and _.
+#        It may not start with a digit.
+zos_name_chars = frozenset( b"\xc1\xc2\xc3\xc4\xc5\xc6\xc7\xc8\xc9"
+                            b"\xd1\xd2\xd3\xd4\xd5\xd6\xd7\xd8\xd9"
+                            b"\xe2\xe3\xe4\xe5\xe6\xe7\xe8\xe9"
+                            b"\xf0\xf1\xf2\xf3\xf4\xf5\xf6\xf7\xf8\xf9"
+                            b"\x5b\x7b\x7c\x6d" )
+zos_digits     = frozenset( range( 0xf0, 0xfa ) )
+
+# @fn    scanEyecatchers
+# @brief Find the routine entry eyecatchers in buf.
+#
+# @param[in] buf   - The memory buffer to scan.
+# @param[in] zaddr - The zOS address of buf[0].
+# @returns A list of ( zaddr, name ).
+def scanEyecatchers( buf, zaddr ):
+   found = [ ]
+   data  = bytes( buf )
+
+   for m in zos_eyecatcher.finditer( data ):
+      off  = m.start( )
+      n    = data[off + 4] if off + 4 < len( data ) else 0
+      name = data[off + 5:off + 5 + n]
+
+      # The branch has to land past the name and the name has to be there.
+      if n == 0 or len( name ) != n or m.group( 1 )[0] < 5 + n:
+         continue
+      if name[0] in zos_digits or not all( c in zos_name_chars for c in name ):
+         continue
+
+      found.append( ( zaddr + off, name.decode( "cp037" ) ) )
+
+   return found
+
+# @fn    branchTarget
+# @brief The byte offset of the relative branch target of rv from rv.
+#
+# @returns The offset, or None if rv is not a relative branch.
+def branchTarget( rv ):
+   return branchOf( rv )[1]
+
+# @fn    formatTarget
+# @brief Format the branch target of rv as its native and zOS addresses and,
+#        when labels knows it, <label+off>. A target outside of mainstor is
+#        shown as <out of range>.
+#
+# @param[in] rv     - The rvalue returned by decode.
+# @param[in] zaddr  - The zOS address of the instruction.
+# @param[in] labels - A zlabels, or None.
+# @param[in] limit  - The size of mainstor, or None if it is not known.
+# @returns The text to append to the instruction line, or "".
+def formatTarget( rv, zaddr, labels=None, limit=None ):
+   rel = branchTarget( rv )
+   if rel == None:
+      return ""
+
+   if zaddr + rel < 0 or ( limit != None and zaddr + rel >= limit ):
+      return "<out of range>"
+
+   text = "{:#x} {:08X}".format( rv._addr + rel, zaddr + rel )
+
+   if labels != None:
+      hit = labels.lookup( zaddr + rel )
+      if hit != None:
+         text += " <{}+{:#x}>".format( hit[0], hit[1] ) if hit[1] else " <{}>".format( hit[0] )
+
+   return text
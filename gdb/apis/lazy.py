@@ -0,0 +1,160 @@
+# @file	  lazy.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Register the SDM commands and pretty printers without loading them.
+#
+# @section Copyright
+#
+#   Copyright Notice:
+#
+#   Copyright (C) 2019 LzLabs GmbH
+#   All Rights Reserved.
+#
+#   This product and associated documentation includes confidential,
+#   proprietary and trade secret information and code.  No part of
+#   this product or associated documentation may be modified,
+#   distributed, or copied in any form except as expressly permitted
+#   by the license agreement pertaining to this product.
+#
+# @section License
+#
+#   This file is Object Code Only and is NOT to be distributed in source form.
+#
+# @section Description
+#
+#   sdm.py is sourced by every gdb session, most of which never look at zOS
+#   code. Instead of importing the command modules (and with them the
+#   instruction tables and decoders) it registers a small stand in for each
+#   command. The first time a stand in is invoked it imports the module that
+#   implements the command and runs the command's invoke on an instance that
+#   is not registered. Registering the real command from there would make gdb
+#   free the stand in while it is running, so that is left to gdb.post_event.
+#   The pretty printers are handled the same way:
+#   a single printer recognises the type names and loads sdmpretty.py the
+#   first time one of them is printed.
+#
+# @section Source
+#
+#   Information in this file is original.
+#
+import gdb
+import sys
+import re
+import importlib
+import functools
+
+# @def   zos_lazy_commands
+# @brief The commands registered by sdm.py: name, command class, implementing
+#        module and the one line help shown until the module is loaded.
+zos_lazy_commands = (
+   ( "zdisass",           gdb.COMMAND_USER,   "zdisass",  "Disassemble a zOS instruction stream similar to the normal disass command." ),
+   ( "zcfg",              gdb.COMMAND_USER,   "zdisass",  "Disassemble a zOS routine by following its control flow." ),
+   ( "zlabel",            gdb.COMMAND_USER,   "zdisass",  "Manage the labels used to annotate zdisass branch targets." ),
+   ( "info sdm",          gdb.COMMAND_STATUS, "zinfo",    "Display the overall SDM status." ),
+   ( "info zthreads",     gdb.COMMAND_STATUS, "zinfo",    "Display all current SDM threads." ),
+   ( "info zregisters",   gdb.COMMAND_STATUS, "zinfo",    "Display SDM registers for the current zOS thread." ),
+   ( "info zmodules",     gdb.COMMAND_STATUS, "zinfo",    "Display SDM loaded modules." ),
+   ( "info zbreakpoints", gdb.COMMAND_STATUS, "zinfo",    "Display SDM breakpoints." ),
+   ( "info zcache",       gdb.COMMAND_STATUS, "zinfo",    "Display the decoded zOS instruction cache statistics." ),
+   ( "zthread",           gdb.COMMAND_USER,   "zfuncs",   "zOS thread functions." ),
+   ( "zmemory",           gdb.COMMAND_USER,   "zmemory",  "Display the zOS memory given a VADR." ),
+   ( "zprofile",          gdb.COMMAND_USER,   "zprofile", "Count and time the gdb calls made by the SDM commands." ),
+   ( "zopstats",          gdb.COMMAND_USER,   "zscan",    "Count the instructions in a region by Mnemonic and by format." ),
+   ( "zgrep",             gdb.COMMAND_USER,   "zscan",    "Search a region for a sequence of instructions." ),
+   ( "ztrace",            gdb.COMMAND_USER,   "ztrace",   "Record the zOS instruction addresses executed by the emulator." ),
+   ( "zprof",             gdb.COMMAND_USER,   "ztrace",   "Sample where emulated zOS code spends its time." ),
+   ( "zcov",              gdb.COMMAND_USER,   "ztrace",   "Record which instructions of zOS programs are executed." ),
+)
+
+# @def   zos_lazy_printed
+# @brief The type names sdmpretty.py has printers for, see
+#        SDMbuild_pretty_printer.
+zos_lazy_printed = re.compile( "^(fib|igzxdsp_parm|igzxdsp_parg|fcb|keyarea|"
+                               "lpeddname|lpefce|lpefco|lpedsc|lpeocb|lpescb|lpepfo|"
+                               "lpeenv|lpercb|lperbd|lpekbd|rpl|DCB|acb|"
+                               "db2_sqlvar|db2_sqlda|db2_rdi)$" )
+
+# @def   zos_loaded
+# @brief The zos_commands of each module imported so far, by module name.
+zos_loaded = { }
+
+# @def   zos_registered
+# @brief The commands whose real implementation has been registered.
+zos_registered = set( )
+
+# @fn    importCommands
+# @brief Import the modules that implement the named commands, or all of
+#        them, without registering anything.
+#
+# @returns The command classes by name.
+def importCommands( names=None ):
+   classes = { }
+   for name, cmdclass, module, doc in zos_lazy_commands:
+      if names == None or name in names:
+         if module not in zos_loaded:
+            zos_loaded[module] = importlib.import_module( module ).zos_commands
+         classes[name] = zos_loaded[module][name]
+
+   return classes
+
+# @fn    loadCommands
+# @brief Register the real named commands, or all of them, in place of their
+#        stand ins. This must not run from the invoke of a command it
+#        replaces.
+def loadCommands( names=None ):
+   for name, cls in importCommands( names ).items( ):
+      if name not in zos_registered:
+         cls( )
+         zos_registered.add( name )
+
+# @class zlazy
+# @brief The stand in for a command that has not been loaded yet. A subclass
+#        with the command's help is made for each command.
+class zlazy( gdb.Command ):
+   def __init__( self, name, cmdclass, module ):
+      super( zlazy, self ).__init__( name, cmdclass )
+      self.name   = name
+      self.module = module
+      self.impl   = None
+
+   def invoke( self, arg, from_tty ):
+      if self.impl == None:
+         # An instance made without __init__ is not registered with gdb.
+         cls       = importCommands( ( self.name, ) )[self.name]
+         self.impl = cls.__new__( cls )
+         gdb.post_event( functools.partial( loadCommands, ( self.name, ) ) )
+
+      self.impl.invoke( arg, from_tty )
+
+# @class zlazyprinter
+# @brief Stands in for the SDM pretty printers until one is needed.
+class zlazyprinter( object ):
+   def __init__( self ):
+      self.name        = "SDM (not loaded)"
+      self.enabled     = True
+      self.subprinters = None
+      self.printer     = None
+
+   def __call__( self, val ):
+      import gdb.types
+
+      typename = gdb.types.get_basic_type( val.type ).tag or val.type.name
+      if not typename or not zos_lazy_printed.match( typename ):
+         return None
+
+      if self.printer == None:
+         # Importing sdmpretty registers the real printers for later values.
+         import sdmpretty
+
+         self.printer = sdmpretty.SDMbuild_pretty_printer( )
+         self.enabled = False
+
+      return self.printer( val )
+
+# @fn    registerLazy
+# @brief Register a stand in for every command and the pretty printers.
+def registerLazy( ):
+   for name, cmdclass, module, doc in zos_lazy_commands:
+      cls = type( "zlazy_" + name.replace( " ", "_" ), ( zlazy, ), { "__doc__" : doc } )
+      cls( name, cmdclass, module )
+
+   gdb.pretty_printers.append( zlazyprinter( ) )
@@ -0,0 +1,170 @@
+# @file	  parallel.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Disassemble a large region in several processes.
+#
+#         The region is cut into chunks at fixed offsets and every chunk is
+#         decoded by a worker process from its first byte. A chunk boundary can
+#         fall in the middle of an instruction, so the worker's guess at the
+#         first instruction can be wrong. The results are put back together in
+#         order: the previous chunk says where its last instruction ends, and
+#         if that is not an instruction start the worker found, decoding is
+#         redone from there until it lands on one. Because the length of a
+#         z/Architecture instruction is fixed by its first byte this normally
+#         takes only a few instructions, and the output is the same as a
+#         sequential run, including stopping at the first unknown opcode.
+#
+#         Like disasm.py this does not need gdb.
+#
+import sys
+import os
+import mmap
+import itertools
+import collections
+import concurrent.futures
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+_apis = os.path.dirname( os.path.abspath( __file__ ) )
+if sys.path[0] != _apis:
+   sys.path.insert( 0, _apis )
+
+from disasm import decode, formatInst
+
+# @def   zos_chunk
+# @brief The smallest chunk handed to a worker process.
+zos_chunk = 256 * 1024
+
+# @fn    mapFile
+# @brief Memory map a file read only.
+#
+# @param[in] path - The file to map.
+# @returns The mmap object, or an empty bytes object for an empty file.
+def mapFile( path ):
+   with open( path, "rb" ) as f:
+      if os.fstat( f.fileno( ) ).st_size == 0:
+         return b""
+      return mmap.mmap( f.fileno( ), 0, access=mmap.ACCESS_READ )
+
+# @fn    openSource
+# @brief Turn a source into a buffer and the offset of its first byte.
+#
+#        A source is a file name, which is memory mapped, or a tuple of a
+#        bytes object and the region offset of its first byte.
+def openSource( source ):
+   if isinstance( source, str ):
+      return ( memoryview( mapFile( source ) ), 0 )
+
+   return ( memoryview( source[0] ), source[1] )
+
+# @fn    decodeRun
+# @brief Decode from off until an instruction starts at or after end, an
+#        instruction starts at one of the offsets in stop, or decoding fails.
+#
+# @param[in] buf    - The memory buffer holding the instruction stream.
+# @param[in] origin - The region offset of buf[0].
+# @param[in] off    - The region offset to start at.
+# @param[in] end    - The region offset to stop at.
+# @param[in] layout - ( start, address, zaddr ) used to format the lines.
+# @param[in] stop   - Region offsets to stop at, or None.
+# @returns ( offsets, lines, next, status ) where status is "end", "sync",
+#          "unknown" or "truncated" and next is the offset decoding
+#          stopped at.
+def decodeRun( buf, origin, off, end, layout, stop=None ):
+   start, address, zaddr = layout
+   offs  = [ ]
+   lines = [ ]
+
+   while off < end:
+      if stop != None and off in stop:
+         return ( offs, lines, off, "sync" )
+
+      try:
+         rv = decode( buf, off - origin, address + off - start )
+      except IndexError:
+         return ( offs, lines, off, "truncated" )
+
+      if ( rv == None ):
+         return ( offs, lines, off, "unknown" )
+
+      offs.append( off )
+      lines.append( formatInst( rv, zaddr + off - start, off - start ) )
+
+      off += rv._sz
+
+   return ( offs, lines, off, "end" )
+
+# @fn    decodeChunk
+# @brief The worker: decode one chunk from its first byte.
+def decodeChunk( source, off, end, layout ):
+   buf, origin = openSource( source )
+
+   return decodeRun( buf, origin, off, end, layout )
+
+# @fn    iter_parallel
+# @brief Disassemble region offsets [start, end) of source in parallel.
+#
+# @param[in] source  - A file name or ( bytes, 0 ) holding the region.
+# @param[in] start   - The offset of the first instruction.
+# @param[in] end     - The offset to stop at.
+# @param[in] address - The native address of offset start.
+# @param[in] zaddr   - The zOS address of offset start.
+# @param[in] jobs    - The number of worker processes (default: all cores).
+# @param[in] chunk   - The chunk size (default: enough for 4 chunks per job).
+# @returns A generator of ( status, lines ). status is None for ordinary
+#          lines and "unknown" or "truncated" for the final entry when
+#          decoding stopped early, exactly as a sequential run would.
+def iter_parallel( source, start, end, address, zaddr, jobs=None, chunk=None ):
+   jobs   = jobs or os.cpu_count( ) or 1
+   chunk  = chunk or max( zos_chunk, ( end - start + 4 * jobs - 1 ) // ( 4 * jobs ) )
+   layout = ( start, address, zaddr )
+
+   buf, origin = openSource( source )
+   bounds      = [ ( s, min( s + chunk, end ) ) for s in range( start, end, chunk ) ]
+
+   with concurrent.futures.ProcessPoolExecutor( max_workers=jobs ) as pool:
+      # Keep two chunks per worker in flight, enough to keep the workers
+      # busy without holding the lines of the whole region.
+      todo = iter( bounds )
+      work = collections.deque( )
+      nxt  = start
+
+      try:
+         while True:
+            for s, e in itertools.islice( todo, 2 * jobs - len( work ) ):
+               work.append( ( s, e, pool.submit( decodeChunk, source, s, e, layout ) ) )
+            if not work:
+               break
+
+            s, e, fut = work.popleft( )
+
+            # The previous instruction may run right over a short chunk.
+            if nxt >= e:
+               fut.cancel( )
+               continue
+
+            offs, lines, cend, status = fut.result( )
+            where = dict( ( o, i ) for i, o in enumerate( offs ) )
+
+            if nxt not in where:
+               # The worker started inside an instruction. Decode again from
+               # the real instruction start until it lands on one of the
+               # worker's instruction starts.
+               roffs, rlines, nxt, rstatus = decodeRun( buf, origin, nxt, e, layout, where )
+               yield ( None, rlines )
+
+               if rstatus == "end":
+                  continue
+               if rstatus != "sync":
+                  yield ( rstatus, [ ] )
+                  return
+
+            yield ( None, lines[where[nxt]:] )
+
+            nxt = cend
+            if status != "end":
+               yield ( status, [ ] )
+               return
+      finally:
+         # Do not wait for chunks nobody will read.
+         for s, e, fut in work:
+            fut.cancel( )
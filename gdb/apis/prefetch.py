@@ -0,0 +1,192 @@
+# @file   prefetch.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Read and decode the code around every CPU's PSW when the inferior
+#         stops.
+#
+# @section Copyright
+#
+#   Copyright Notice:
+#
+#   Copyright (C) 2019 LzLabs GmbH
+#   All Rights Reserved.
+#
+#   This product and associated documentation includes confidential,
+#   proprietary and trade secret information and code.  No part of
+#   this product or associated documentation may be modified,
+#   distributed, or copied in any form except as expressly permitted
+#   by the license agreement pertaining to this product.
+#
+# @section License
+#
+#   This file is Object Code Only and is NOT to be distributed in source form.
+#
+# @section Description
+#
+#   After a stop the next command is nearly always a zdisass at the PSW of
+#   one of the zOS threads. When prefetching is on, the stop event reads a
+#   window around sysblk->regs[i].psw.ia of every active CPU. The reads are
+#   made in the stop event because gdb can only be asked for memory from its
+#   own thread. The windows are kept in zos_windows, so zdisass does not
+#   read them again until the inferior resumes.
+#
+#   Decoding is left to gdb.post_event, one window per event, so that it
+#   runs after gdb has printed the stop and is waiting for the user. The
+#   instructions are decoded through zos_cache, which fills zos_store as
+#   well. A zdisass that comes before the decoding has finished simply
+#   decodes what it needs itself.
+#
+# @section Source
+#
+#   Information in this file is original.
+#
+import gdb
+import sys
+import time
+import collections
+
+if sys.path[0] != '/opt/lzlabs/debug/gdb':
+   sys.path.insert( 0, '/opt/lzlabs/debug/gdb' )
+
+from apis.stream import *
+from apis.cpus import zos_cpus
+
+# @def   zos_prefetch_before
+# @brief The bytes read in front of a PSW, enough for zdisass -back 60.
+zos_prefetch_before = 512
+
+# @def   zos_prefetch_after
+# @brief The bytes read from a PSW on.
+zos_prefetch_after = 1024
+
+# @class zprefetch
+# @brief The stop event handler and the decoding it leaves for later.
+#
+# @param[in] self   - The self pointer to the instantiated structure/class.
+# @param[in] before - The bytes to read in front of each PSW.
+# @param[in] after  - The bytes to read from each PSW on.
+# @returns An instance of the structure.
+class zprefetch:
+   def __init__( self, before=zos_prefetch_before, after=zos_prefetch_after ):
+      self.before   = before & ~1
+      self.after    = after
+      self.enabled  = False
+      self.pending  = collections.deque( )
+      self.posted   = False
+      self.error    = None
+      self.reset( )
+
+   # @fn    enable
+   # @brief Connect to or disconnect from the stop event.
+   def enable( self, on ):
+      if on and not self.enabled:
+         gdb.events.stop.connect( self.stop )
+      elif not on and self.enabled:
+         gdb.events.stop.disconnect( self.stop )
+         self.pending.clear( )
+
+      self.enabled = on
+
+   # @fn    stop
+   # @brief The stop event handler: read a window around each active CPU's
+   #        PSW and post the decoding.
+   def stop( self, event ):
+      t = time.perf_counter( )
+
+      self.pending.clear( )
+      zos_windows.clear( )
+
+      try:
+         cpus = zos_cpus.read( ( "ia", "mainstor" ) )
+      except gdb.error as e:
+         # Not stopped in an SDM, or not yet initialised.
+         self.error = str( e )
+         return
+
+      inf  = gdb.selected_inferior( )
+      seen = set( )
+
+      for cpu, ia, mainstor in cpus:
+         addr = mainstor + ia
+         if ia == 0 or addr in seen:
+            continue
+         seen.add( addr )
+
+         target = self.before
+         try:
+            buf = inf.read_memory( addr - target, target + self.after + 6 )
+         except gdb.MemoryError:
+            # Start at the PSW's page when the memory in front of it is not
+            # readable, and give up on this CPU if the PSW's is not.
+            target = addr & 0xfff & ~1
+            try:
+               buf = inf.read_memory( addr - target, target + self.after + 6 )
+            except gdb.MemoryError:
+               continue
+
+         zos_windows.add( addr - target, buf )
+         self.pending.append( ( addr, memoryview( buf ), target ) )
+         self.windows += 1
+         self.bytes   += len( buf )
+
+      self.error     = None
+      self.stops    += 1
+      self.readtime += time.perf_counter( ) - t
+
+      if self.pending and not self.posted:
+         gdb.post_event( self.run )
+         self.posted = True
+
+   # @fn    run
+   # @brief Decode one pending window, and post again while there are more.
+   def run( self ):
+      self.posted = False
+      if not self.pending:
+         return
+
+      t = time.perf_counter( )
+      addr, buf, target = self.pending.popleft( )
+
+      # Decode from the best start in front of the PSW, as zdisass -back
+      # would, up to the end of the window.
+      start, n = syncBackward( buf, target, target // 2 )
+      try:
+         for rv in iter_decode( buf, start, target + self.after, addr - target + start, zos_cache ):
+            self.decoded += 1
+      except IndexError:
+         pass
+
+      self.decodetime += time.perf_counter( ) - t
+
+      if self.pending:
+         gdb.post_event( self.run )
+         self.posted = True
+
+   # @fn    reset
+   # @brief Zero the counters.
+   def reset( self ):
+      self.stops      = 0
+      self.windows    = 0
+      self.bytes      = 0
+      self.decoded    = 0
+      self.readtime   = 0.0
+      self.decodetime = 0.0
+
+   # @fn    stats
+   # @brief Describe the prefetching in one line.
+   def stats( self ):
+      if not self.enabled:
+         return "off"
+
+      text = "{} before and {} after each PSW, {} stops, {} windows of {} bytes read in {:.1f} ms, " \
+             "{} instructions decoded in {:.1f} ms, {} reads served".format(
+                self.before, self.after, self.stops, self.windows, self.bytes,
+                1000 * self.readtime, self.decoded, 1000 * self.decodetime, zos_windows.hits )
+
+      if self.error != None:
+         text += ", last stop: {}".format( self.error )
+
+      return text
+
+# @def   zos_prefetch
+# @brief The prefetcher of the session, off until info zcache prefetch on.
+zos_prefetch = zprefetch( )
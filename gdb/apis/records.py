@@ -0,0 +1,140 @@
+# @file	  records.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Machine readable disassembly: one record per instruction written
+#         as text, JSON Lines or CSV.
+#
+#         Scripts reading zdisass output should not have to parse the text
+#         columns. A record carries the addresses, the raw bytes, the
+#         Mnemonic, the instruction format and the operand fields by name.
+#
+#         Like disasm.py this does not need gdb.
+#
+import sys
+import os
+import io
+import csv
+import json
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+_apis = os.path.dirname( os.path.abspath( __file__ ) )
+if sys.path[0] != _apis:
+   sys.path.insert( 0, _apis )
+
+from disasm import formatInst
+from labels import branchTarget
+
+# @def   zos_record_fields
+# @brief The record fields in output order; also the CSV header.
+zos_record_fields = ( "address", "zaddress", "offset", "bytes", "mnemonic",
+                      "format", "operands", "text", "target" )
+
+# @def   zos_shown
+# @brief How a field of each kind is shown in the assembler text when that
+#        is not its encoded value: a length code is one less than the
+#        length and a relative offset counts halfwords.
+zos_shown = { "len" : lambda v: v + 1,
+              "rel" : lambda v: 2 * v }
+
+# @def   zos_write_buffer
+# @brief The buffer size used when records are written to a file.
+zos_write_buffer = 1024 * 1024
+
+# @fn    instRecord
+# @brief Build the record for a decoded instruction.
+#
+# @param[in] rv    - The rvalue returned by decode.
+# @param[in] zaddr - The zOS address of the instruction.
+# @param[in] off   - The offset from the start of the disassembled range.
+# @returns A dict with the zos_record_fields keys. operands maps the field
+#          names of the format (R1, D2, B2, I2, ...) to their values as text
+#          shows them, so lengths are real lengths and relative offsets are
+#          in bytes. target is the native address of a relative branch
+#          target or None.
+def instRecord( rv, zaddr, off ):
+   fmt = rv._fmt
+   rel = branchTarget( rv )
+   ops = { }
+
+   for name, kind, v in zip( fmt.fieldnames, fmt.fieldkinds, rv._fields ):
+      ops[name] = zos_shown[kind]( v ) if kind in zos_shown else v
+
+   return { "address"  : rv._addr,
+            "zaddress" : zaddr,
+            "offset"   : off,
+            "bytes"    : rv._raw.hex( ),
+            "mnemonic" : rv._name,
+            "format"   : fmt.__name__,
+            "operands" : ops,
+            "text"     : rv._asm,
+            "target"   : None if rel == None else rv._addr + rel }
+
+# @class textwriter
+# @brief Write instructions as the zdisass text lines.
+#
+# @param[in] self - The self pointer to the instantiated structure/class.
+# @param[in] out  - A text file object, or anything with a write method.
+# @returns An instance of the structure.
+class textwriter:
+   def __init__( self, out ):
+      self.out = out
+
+   def header( self, first, last ):
+      self.out.write( "Dump of zOS assembler code from {:#x} to {:#x}\n".format( first, last ) )
+
+   def write( self, rv, zaddr, off, suffix="" ):
+      self.out.write( formatInst( rv, zaddr, off ) + suffix + "\n" )
+
+   def close( self ):
+      pass
+
+# @class jsonwriter
+# @brief Write one JSON object per instruction per line (JSON Lines).
+class jsonwriter( textwriter ):
+   def header( self, first, last ):
+      pass
+
+   def write( self, rv, zaddr, off, suffix="" ):
+      self.out.write( json.dumps( instRecord( rv, zaddr, off ) ) + "\n" )
+
+# @class csvwriter
+# @brief Write one CSV row per instruction after a header row. The operands
+#        are written as NAME=value pairs separated by spaces.
+class csvwriter( textwriter ):
+   def __init__( self, out ):
+      self.out = out
+      self.csv = csv.writer( out, lineterminator="\n" )
+
+   def header( self, first, last ):
+      self.csv.writerow( zos_record_fields )
+
+   def write( self, rv, zaddr, off, suffix="" ):
+      r = instRecord( rv, zaddr, off )
+      r["operands"] = " ".join( "{}={}".format( k, v ) for k, v in r["operands"].items( ) )
+      if r["target"] == None:
+         r["target"] = ""
+
+      self.csv.writerow( [ r[f] for f in zos_record_fields ] )
+
+# @def   zos_writers
+# @brief The writer class for each output kind.
+zos_writers = { "text" : textwriter,
+                "json" : jsonwriter,
+                "csv"  : csvwriter }
+
+# @fn    openWriter
+# @brief Create a writer of the given kind.
+#
+# @param[in] kind - "text", "json" or "csv".
+# @param[in] out  - A file object to write to, or None to write to path.
+# @param[in] path - A file to create and write through a zos_write_buffer
+#                   sized buffer. The writer's close closes it.
+# @returns The writer.
+def openWriter( kind, out=None, path=None ):
+   if path != None:
+      f  = open( os.path.expanduser( path ), "w", buffering=zos_write_buffer, newline="" )
+      wr = zos_writers[kind]( f )
+      wr.close = f.close
+      return wr
+
+   return zos_writers[kind]( out )
@@ -0,0 +1,199 @@
+# @file   sampler.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Find where emulated zOS code spends its time by sampling the PSWs.
+#
+# @section Copyright
+#
+#   Copyright Notice:
+#
+#   Copyright (C) 2019 LzLabs GmbH
+#   All Rights Reserved.
+#
+#   This product and associated documentation includes confidential,
+#   proprietary and trade secret information and code.  No part of
+#   this product or associated documentation may be modified,
+#   distributed, or copied in any form except as expressly permitted
+#   by the license agreement pertaining to this product.
+#
+# @section License
+#
+#   This file is Object Code Only and is NOT to be distributed in source form.
+#
+# @section Description
+#
+#   The inferior is resumed with a timer running. When the timer fires it
+#   asks gdb, through gdb.post_event, to interrupt the inferior, which ends
+#   the continue. The PSW address, program name and mainstor of every CPU
+#   are then taken from sysblk->regs[] in one read (apis/cpus.py) and
+#   counted, and the inferior is resumed again. The timer thread does
+#   nothing but post the event; gdb is only used from its own thread.
+#
+#   The counts are kept by ( program, zOS address ) for the whole session
+#   until they are reset, so several runs add up.
+#
+# @section Source
+#
+#   Information in this file is original.
+#
+import gdb
+import sys
+import time
+import threading
+import functools
+
+if sys.path[0] != '/opt/lzlabs/debug/gdb':
+   sys.path.insert( 0, '/opt/lzlabs/debug/gdb' )
+
+from apis.cpus import zos_cpus
+
+# @class zsampler
+# @brief The sampling loop and the histogram it fills.
+#
+# @param[in] self - The self pointer to the instantiated structure/class.
+# @returns An instance of the structure.
+class zsampler:
+   def __init__( self ):
+      self.gen     = 0
+      self.event   = None
+      self.reset( )
+
+   # @fn    reset
+   # @brief Forget the samples.
+   def reset( self ):
+      self.counts   = { }
+      self.mainstor = { }
+      self.samples  = 0
+      self.hits     = 0
+      self.elapsed  = 0.0
+      self.time     = 0.0
+      self.reason   = None
+
+   # @fn    interrupt
+   # @brief Posted by the timer: interrupt the inferior, unless the continue
+   #        it was meant for has already ended.
+   def interrupt( self, gen ):
+      if gen != self.gen:
+         return
+
+      try:
+         gdb.execute( "interrupt", to_string=True )
+      except gdb.error:
+         pass
+
+   # @fn    stopped
+   # @brief The stop event handler while sampling, to tell the timer's stops
+   #        from breakpoints and signals of the program.
+   def stopped( self, event ):
+      self.event = event
+
+   # @fn    sample
+   # @brief Count the PSW of every active CPU.
+   def sample( self ):
+      t = time.perf_counter( )
+
+      for cpu, ia, progname, mainstor in zos_cpus.read( ( "ia", "progname", "mainstor" ) ):
+         if ia == 0:
+            continue
+
+         key = ( progname, ia )
+         self.counts[key]   = self.counts.get( key, 0 ) + 1
+         self.mainstor[key] = mainstor
+         self.hits         += 1
+
+      self.samples += 1
+      self.time    += time.perf_counter( ) - t
+
+   # @fn    run
+   # @brief Sample hz times a second for seconds, or until the inferior stops
+   #        for some other reason.
+   def run( self, seconds, hz ):
+      period = 1.0 / hz
+      inf    = gdb.selected_inferior( )
+      start  = time.monotonic( )
+
+      self.reason = None
+      gdb.events.stop.connect( self.stopped )
+
+      try:
+         while time.monotonic( ) - start < seconds:
+            if inf.pid == 0:
+               self.reason = "the program is not running"
+               break
+
+            self.gen  += 1
+            self.event = None
+
+            timer = threading.Timer( period, gdb.post_event,
+                                     ( functools.partial( self.interrupt, self.gen ), ) )
+            timer.daemon = True
+            timer.start( )
+            try:
+               gdb.execute( "continue", to_string=True )
+            finally:
+               timer.cancel( )
+               self.gen += 1
+
+            if inf.pid == 0:
+               self.reason = "the program exited"
+               break
+
+            # A stop that was not the timer's is not a fair sample.
+            if isinstance( self.event, gdb.BreakpointEvent ):
+               self.reason = "stopped at a breakpoint"
+               break
+            if isinstance( self.event, gdb.SignalEvent ) and self.event.stop_signal != "SIGINT":
+               self.reason = "stopped by {}".format( self.event.stop_signal )
+               break
+
+            self.sample( )
+      except KeyboardInterrupt:
+         self.reason = "interrupted"
+      finally:
+         gdb.events.stop.disconnect( self.stopped )
+         self.elapsed += time.monotonic( ) - start
+
+   # @fn    top
+   # @brief The n most sampled addresses.
+   #
+   # @returns A list of ( count, program, zOS address, mainstor ), highest
+   #          count first.
+   def top( self, n ):
+      best = sorted( self.counts.items( ), key=lambda e: ( -e[1], e[0] ) )[:n]
+
+      return [ ( count, prog, ia, self.mainstor[( prog, ia )] ) for ( prog, ia ), count in best ]
+
+   # @fn    programs
+   # @brief The samples per program, highest first.
+   def programs( self ):
+      byprog = { }
+      for ( prog, ia ), count in self.counts.items( ):
+         byprog[prog] = byprog.get( prog, 0 ) + count
+
+      return sorted( byprog.items( ), key=lambda e: ( -e[1], e[0] ) )
+
+   # @fn    collapsed
+   # @brief The samples as collapsed stacks for flamegraph.pl and similar
+   #        tools: program, routine (when a label covers the address) and
+   #        instruction, each line followed by its count.
+   #
+   # @param[in] self  - The self pointer to the instantiated structure/class.
+   # @param[in] name  - name( program, zOS address ) returns the frames
+   #                    below the program as a list of strings.
+   # @returns A generator of lines without the newline.
+   def collapsed( self, name ):
+      for ( prog, ia ), count in sorted( self.counts.items( ) ):
+         frames = [ prog or "?" ] + name( prog, ia )
+         yield "{} {}".format( ";".join( f.replace( ";", ":" ) for f in frames ), count )
+
+   # @fn    stats
+   # @brief Describe the samples in one line.
+   def stats( self ):
+      rate = self.samples / self.elapsed if self.elapsed else 0.0
+      cost = 1000 * self.time / self.samples if self.samples else 0.0
+
+      return "{} samples in {:.1f} s ({:.1f}/s), {} CPU samples, {:.2f} ms per sample to read the CPUs".format(
+                self.samples, self.elapsed, rate, self.hits, cost )
+
+# @def   zos_sampler
+# @brief The samples of the session.
+zos_sampler = zsampler( )
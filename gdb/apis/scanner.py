@@ -0,0 +1,237 @@
+# @file	  scanner.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Find instruction boundaries without decoding the instructions.
+#
+#         The length of a zOS instruction is given by the top two bits of its
+#         first byte (the ILC): 00 is 2 bytes, 01 and 10 are 4 and 11 is 6.
+#         So where the instructions start, and which opcode each one has, can
+#         be found without building an rvalue for it. When NumPy is installed
+#         the lengths, opcodes and validity of every byte position are worked
+#         out at once as arrays; otherwise a plain loop is used. Both give
+#         the same results as walking the range with disasm.iter_decode.
+#
+#         Like disasm.py this does not need gdb.
+#
+# https://www.ibm.com/support/libraryserver/download/dz9zr006.pdf
+#
+import sys
+import os
+import collections
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+_apis = os.path.dirname( os.path.abspath( __file__ ) )
+if sys.path[0] != _apis:
+   sys.path.insert( 0, _apis )
+
+from instructions import *
+
+# @def   numpy
+# @brief The numpy module once loadNumpy has imported it, else None. Importing
+#        NumPy takes longer than the rest of the plugin put together, so it
+#        is only done the first time a scan can use it.
+numpy        = None
+_numpy_tried = False
+
+# @fn    loadNumpy
+# @brief Import NumPy the first time it is asked for.
+# @returns The numpy module, or None when it is not installed.
+def loadNumpy( ):
+   global numpy, _numpy_tried
+
+   if not _numpy_tried:
+      _numpy_tried = True
+      try:
+         import numpy
+      except ImportError:
+         numpy = None
+
+   return numpy
+
+# @def   zos_ilc_length
+# @brief The instruction length for every first byte.
+zos_ilc_length = bytes( ( 2, 4, 4, 6 )[b >> 6] for b in range( 256 ) )
+
+# @def   zos_known_opcodes
+# @brief The Mnemonic keys that have an instruction table entry.
+zos_known_opcodes = frozenset( zos_mnemonics )
+
+# @fn    scanPython
+# @brief The loop version of scanBoundaries.
+def scanPython( buf, starts, end, resync=False ):
+   size  = len( buf )
+   known = zos_known_opcodes
+   seen  = { }
+
+   for off in starts:
+      while off < end and off not in seen:
+         im  = buf[off]
+         sel = zos_dispatch[im]
+         ln  = zos_ilc_length[im]
+
+         if off + ln > size:
+            break
+
+         key = ( im << sel[2] ) | ( buf[off + sel[0]] & sel[1] )
+         if key not in known:
+            if not resync:
+               break
+
+            seen[off] = -1
+            off += 2
+            continue
+
+         seen[off] = key
+         off += ln
+
+   offs = sorted( seen )
+
+   return ( offs, [ seen[o] for o in offs ] )
+
+# @def   zos_scan_block
+# @brief The halfwords per block used by scanNumpy; a power of 2.
+zos_scan_block = 64
+
+# @fn    scanNumpy
+# @brief The NumPy version of scanBoundaries.
+#
+#        The opcode, length and validity of every position below end are
+#        computed as arrays, giving for each halfword the halfword of the
+#        next instruction. The halfwords are then cut into blocks and,
+#        by pointer doubling, every halfword gets the first halfword past
+#        its block that its chain of instructions reaches. The chains from
+#        the starts are followed a block at a time with that, and the
+#        instructions inside the blocks they pass through are marked with
+#        a second round of pointer doubling. Odd and even starts are separate
+#        halfword grids and are done one after the other.
+def scanNumpy( buf, starts, end, resync=False ):
+   np   = numpy
+   size = len( buf )
+   data = np.frombuffer( buf, dtype=np.uint8 )
+   pad  = np.zeros( end + 6, dtype=np.uint8 )
+   pad[:min( size, end + 6 )] = data[:end + 6]
+
+   soff  = np.array( [ s[0] for s in zos_dispatch ], dtype=np.int32 )
+   smask = np.array( [ s[1] for s in zos_dispatch ], dtype=np.int32 )
+   shift = np.array( [ s[2] for s in zos_dispatch ], dtype=np.int32 )
+   ilc   = np.frombuffer( zos_ilc_length, dtype=np.uint8 ).astype( np.int32 )
+   known = np.zeros( 1 << 16, dtype=bool )
+   known[list( zos_known_opcodes )] = True
+
+   # The rest of the opcode is in the second byte or, for the RXY, RSY,
+   # RIE, ... families, the sixth (see buildDispatch).
+   b0  = pad[:end].astype( np.int32 )
+   idx = np.arange( end, dtype=np.int32 )
+   rest = np.where( soff[b0] == 5, pad[5:end + 5], pad[1:end + 1] )
+   key = ( b0 << shift[b0] ) | ( rest & smask[b0] )
+   nxt = idx + ilc[b0]
+   ok  = known[key] & ( nxt <= size )
+
+   rounds = zos_scan_block.bit_length( ) - 1
+   found  = [ ]
+
+   for parity in sorted( set( s & 1 for s in starts if 0 <= s < end ) ):
+      pos = idx[parity::2]
+      m   = len( pos )
+
+      # The next halfword for each halfword, m when the chain ends there.
+      hop = np.full( m + 1, m, dtype=np.int32 )
+      hop[:m] = np.where( ok[pos] & ( nxt[pos] < end ), ( nxt[pos] - parity ) // 2, m )
+
+      hw = np.arange( m + 1, dtype=np.int32 )
+      if resync:
+         # An unknown opcode goes on to the next halfword.
+         bad = np.flatnonzero( ~ok[pos] & ( nxt[pos] <= size ) )
+         hop[bad] = hw[bad] + 1
+
+      limit = ( hw | ( zos_scan_block - 1 ) ) + 1
+      limit[m] = m + 1
+
+      # exit: the first halfword past the block that the chain reaches.
+      exit = hop.copy( )
+      for r in range( rounds ):
+         exit = np.where( exit < limit, exit[exit], exit )
+
+      # Follow the chains from the starts a block at a time.
+      entry = set( )
+      for s in starts:
+         if 0 <= s < end and s & 1 == parity:
+            h = ( s - parity ) // 2
+            while h < m and h not in entry:
+               entry.add( h )
+               h = int( exit[h] )
+
+      # Mark the instructions from each block entry to its block's end.
+      on = np.zeros( m + 1, dtype=bool )
+      on[list( entry )] = True
+
+      step = np.where( hop < limit, hop, m ).astype( np.int32 )
+      for r in range( rounds ):
+         on[step[np.flatnonzero( on )]] = True
+         step = step[step]
+
+      seen = np.flatnonzero( on[:m] ).astype( np.int32 ) * 2 + parity
+      if resync:
+         found.append( seen[ok[seen] | ( nxt[seen] <= size )] )
+      else:
+         found.append( seen[ok[seen]] )
+
+   if not found:
+      return ( np.zeros( 0, dtype=np.int32 ), np.zeros( 0, dtype=np.int32 ) )
+
+   offs = np.sort( np.concatenate( found ) )
+
+   return ( offs, np.where( ok[offs], key[offs], -1 ) )
+
+# @fn    scanBoundaries
+# @brief Find the instruction starts reached from each of the start offsets.
+#
+#        From every start the instructions are followed until one starts at
+#        or after end, an opcode has no table entry or an instruction runs
+#        off the end of buf, which is where iter_decode would stop. Chains
+#        from different starts that meet are only followed once.
+#
+# @param[in] buf    - The memory buffer (bytes, bytearray, memoryview, mmap).
+# @param[in] starts - An offset or a list of offsets to start at.
+# @param[in] end    - The offset to stop at. Defaults to the end of buf.
+# @param[in] vector - Use NumPy when it is installed (default True).
+# @param[in] resync - Instead of stopping at an unknown opcode, record it
+#                     with an opcode of -1 and carry on at the next halfword.
+# @returns ( offsets, opcodes ): the sorted instruction offsets and the
+#          Mnemonic key (see getOpcode) of each. They are NumPy arrays when
+#          NumPy was used and lists otherwise.
+def scanBoundaries( buf, starts=0, end=None, vector=True, resync=False ):
+   if end == None:
+      end = len( buf )
+   end = min( end, len( buf ) )
+
+   if isinstance( starts, int ):
+      starts = [ starts ]
+
+   if vector and end > 0 and loadNumpy( ) != None:
+      return scanNumpy( buf, starts, end, resync )
+
+   return scanPython( buf, starts, end, resync )
+
+# @fn    countOpcodes
+# @brief Count how often each opcode occurs in the opcodes returned by
+#        scanBoundaries.
+#
+# @param[in] opcodes - The opcodes list or array.
+# @param[in] counts  - A dict to add the counts to, or None for a new one.
+# @returns The dict of Mnemonic key : count. Unknown opcodes are counted
+#          under -1.
+def countOpcodes( opcodes, counts=None ):
+   if counts == None:
+      counts = { }
+
+   if numpy != None and isinstance( opcodes, numpy.ndarray ):
+      keys, n = numpy.unique( opcodes, return_counts=True )
+      pairs   = zip( keys.tolist( ), n.tolist( ) )
+   else:
+      pairs = collections.Counter( opcodes ).items( )
+
+   for k, n in pairs:
+      counts[k] = counts.get( k, 0 ) + n
+
+   return counts
@@ -0,0 +1,165 @@
+# @file	  search.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Search memory for a sequence of instructions.
+#
+#         A pattern is one or more instructions separated by ';', each a
+#         Mnemonic optionally followed by an operand pattern:
+#
+#           SVC *
+#           BALR 14,15
+#           LA 1,*(13) ; BASR 14,15
+#
+#         The operand pattern is matched against the operands as zdisass
+#         prints them, with shell style wildcards (*, ?) and with the R in
+#         front of register numbers optional. An empty index may be left
+#         out, so *(13) matches 16(,R13) as well as *(,13) does. A Mnemonic
+#         of * matches any instruction.
+#
+#         Only halfwords whose first byte can start the first instruction of
+#         the pattern are decoded; they are found with a regular expression
+#         over the raw bytes, which runs in C.
+#
+#         Like disasm.py this does not need gdb.
+#
+import sys
+import os
+import re
+import fnmatch
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+_apis = os.path.dirname( os.path.abspath( __file__ ) )
+if sys.path[0] != _apis:
+   sys.path.insert( 0, _apis )
+
+from disasm import *
+
+# @fn    normalizeOperands
+# @brief Drop the R from register numbers, the spaces and an empty index
+#        from operand text: "16(,R13)" becomes "16(13)". An index is never
+#        printed without a base, so this cannot be taken for one.
+def normalizeOperands( text ):
+   return re.sub( r"\bR(\d+)\b", r"\1", text.replace( " ", "" ).replace( "(,", "(" ).upper( ) )
+
+# @fn    firstByte
+# @brief The first byte of the instructions with Mnemonic key mn, which
+#        depends on the table the key is in and not on its value: the 4 byte
+#        0x01xx keys are smaller than 0xfff.
+def firstByte( mn ):
+   if mn in zos_4byte_mnemonics:
+      return mn >> 8
+   if mn in zos_3byte_mnemonics:
+      return mn >> 4
+
+   return mn
+
+# @class zpattern
+# @brief A compiled instruction sequence pattern.
+#
+#        steps is a list of ( keys, operands, text ): the Mnemonic keys the
+#        instruction may have (None for any), the normalized operand pattern
+#        (None for any) and the pattern text of the step.
+#
+# @param[in] self - The self pointer to the instantiated structure/class.
+# @param[in] text - The pattern.
+# @returns An instance of the structure.
+class zpattern:
+   def __init__( self, text ):
+      self.text  = text
+      self.steps = [ ]
+
+      for part in text.split( ";" ):
+         fields = part.split( None, 1 )
+         if len( fields ) == 0:
+            raise ValueError( "empty instruction in pattern '{}'".format( text ) )
+
+         name = fields[0].upper( )
+         ops  = normalizeOperands( fields[1] ) if len( fields ) == 2 else None
+         if ops == "*":
+            ops = None
+
+         keys = None
+         if name != "*":
+            keys = frozenset( mn for mn, ii in zos_mnemonics.items( )
+                              if ii.name.upper( ) == name )
+            if not keys:
+               raise ValueError( "unknown Mnemonic '{}'".format( fields[0] ) )
+
+         self.steps.append( ( keys, ops, part.strip( ) ) )
+
+      # The first bytes the first instruction can have, as a regular
+      # expression for the prefilter.
+      keys = self.steps[0][0]
+      if keys == None:
+         self.first = None
+      else:
+         firsts = set( )
+         for mn in keys:
+            firsts.add( firstByte( mn ) )
+
+         self.first = re.compile( b"[" + b"".join( re.escape( bytes( ( b, ) ) )
+                                                  for b in sorted( firsts ) ) + b"]" )
+
+   # @fn    width
+   # @brief The most bytes a match can cover.
+   def width( self ):
+      return 6 * len( self.steps )
+
+   # @fn    matchAt
+   # @brief Match the pattern against the instructions at buf[off].
+   #
+   # @param[in] address - The address of buf[0].
+   # @param[in] dec     - The function to decode with.
+   # @returns The list of rvalues matched, or None.
+   def matchAt( self, buf, off, address, dec=decode ):
+      insts = [ ]
+
+      for keys, ops, text in self.steps:
+         try:
+            if keys != None and getOpcode( buf, off ) not in keys:
+               return None
+
+            rv = dec( buf, off, address + off )
+         except IndexError:
+            return None
+
+         if rv == None:
+            return None
+
+         if ops != None and not fnmatch.fnmatchcase( normalizeOperands( rv._asm ), ops ):
+            return None
+
+         insts.append( rv )
+         off += rv._sz
+
+      return insts
+
+# @fn    searchBuffer
+# @brief Find the matches of pattern that start on a halfword in
+#        buf[start:end].
+#
+# @param[in] buf     - The memory buffer to search.
+# @param[in] pattern - A zpattern.
+# @param[in] start   - The offset to start at.
+# @param[in] end     - Matches starting at or after this offset are not
+#                      reported. Defaults to the end of buf.
+# @param[in] address - The address of buf[0].
+# @param[in] dec     - The function to decode with, such as a store's lookup.
+# @returns A generator of ( offset, [ rvalue, ... ] ) in address order.
+def searchBuffer( buf, pattern, start=0, end=None, address=0, dec=decode ):
+   if end == None:
+      end = len( buf )
+
+   if pattern.first == None:
+      cands = range( start + ( ( address + start ) & 1 ), end, 2 )
+   else:
+      data  = buf if isinstance( buf, bytes ) else bytes( buf )
+      cands = ( m.start( ) for m in pattern.first.finditer( data, start, end ) )
+
+   for off in cands:
+      if ( address + off ) & 1:
+         continue
+
+      insts = pattern.matchAt( buf, off, address, dec )
+      if insts != None:
+         yield ( off, insts )
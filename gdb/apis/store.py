@@ -0,0 +1,385 @@
+# @file	  store.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  A persistent index of decoded code pages, shared by gdb sessions.
+#
+#         The same load modules are disassembled again in session after
+#         session. Each code page is identified by a hash of its bytes, so
+#         the index does not depend on where the module was loaded, and for
+#         each page the decoded instructions (offset, opcode, machine code,
+#         assembler text and branch) are kept in an SQLite database under
+#         $XDG_CACHE_HOME. Decoding through the store gives back rvalues with
+#         their text and branch already filled in.
+#
+#         A page is indexed from the offset where decoding first entered it
+#         up to the end of the page, an unknown opcode or an offset that is
+#         already indexed; an instruction that runs into the next page is
+#         not kept. The table version is part of the hash, so changing the
+#         instruction tables, the formats, decoder.py or cfg.py makes the old
+#         entries unreachable.
+#
+#         Like disasm.py this does not need gdb: apis/stream.py gives the
+#         store a function that reads a page of inferior memory.
+#
+import sys
+import os
+import array
+import hashlib
+import collections
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+_apis = os.path.dirname( os.path.abspath( __file__ ) )
+if sys.path[0] != _apis:
+   sys.path.insert( 0, _apis )
+
+from disasm import *
+import cfg
+import decoder
+from decoder import rvalue, zos_formats
+from cfg import branchOf
+from scanner import zos_ilc_length
+
+try:
+   import sqlite3
+except ImportError:
+   sqlite3 = None
+
+# @def   zos_store_page
+# @brief The number of bytes hashed and indexed together.
+zos_store_page = 4096
+
+# @def   zos_store_kinds
+# @brief The branch kinds of cfg.branchOf in the order they are stored.
+zos_store_kinds = ( None, "jump", "cond", "call", "stop" )
+
+# @def   zos_store_batch
+# @brief The number of new pages written before they are committed.
+zos_store_batch = 64
+
+# @fn    storePath
+# @brief The default location of the database.
+def storePath( ):
+   base = os.environ.get( "XDG_CACHE_HOME" ) or os.path.join( os.path.expanduser( "~" ), ".cache" )
+   return os.path.join( base, "lzlabs", "zdisass.sqlite" )
+
+# @fn    tableVersion
+# @brief A hash of the instruction tables, the formats, the code that
+#        formats the operands and the code that classifies branches, so that
+#        entries decoded, formatted or classified differently are never
+#        used.
+def tableVersion( ):
+   h = hashlib.blake2b( digest_size=16 )
+
+   for key in sorted( zos_mnemonics ):
+      ii = zos_mnemonics[key]
+      h.update( "{:x} {} {};".format( key, ii.name, ii.func.__name__ ).encode( ) )
+
+   for name in sorted( zos_formats ):
+      h.update( "{} {!r};".format( name, zos_formats[name] ).encode( ) )
+
+   for mod in ( decoder, cfg ):
+      with open( mod.__file__, "rb" ) as f:
+         h.update( f.read( ) )
+
+   return h.digest( )
+
+# @class zpage
+# @brief The decoded instructions of one page of memory.
+#
+#        index maps an offset in the page to ( record, i ), the record that
+#        holds the instruction there and its position in the record. A
+#        record is ( offsets, opcodes, kinds, rels, text ).
+#
+# @param[in] self   - The self pointer to the instantiated structure/class.
+# @param[in] data   - The bytes of the page.
+# @param[in] digest - The hash the page is stored under.
+# @returns An instance of the structure.
+class zpage:
+   def __init__( self, data, digest ):
+      self.data    = data
+      self.digest  = digest
+      self.index   = { }
+      self.entries = set( )
+
+   # @fn    add
+   # @brief Add the instructions of a record to the index.
+   def add( self, entry, rec ):
+      self.entries.add( entry )
+      for i, off in enumerate( rec[0] ):
+         self.index[off] = ( rec, i )
+
+   # @fn    rvalue
+   # @brief Rebuild the rvalue of the instruction at off, or None when the
+   #        page has none there.
+   def rvalue( self, off, address ):
+      ent = self.index.get( off )
+      if ent == None:
+         return None
+
+      ( offsets, opcodes, kinds, rels, text ), i = ent
+      ii   = zos_opcode_index[opcodes[i]]
+      sz   = zos_ilc_length[self.data[off]]
+      kind = zos_store_kinds[kinds[i]]
+
+      rv         = rvalue( sz, self.data[off:off + sz], zos_inst_funcs[ii] )
+      rv._name   = zos_inst_names[ii]
+      rv._addr   = address
+      rv._text   = text[i]
+      rv._branch = ( kind, rels[i] if kind in ( "jump", "cond", "call" ) else None )
+
+      return rv
+
+# @fn    indexPage
+# @brief Decode a page from entry on, stopping at the end of the page, an
+#        unknown opcode, an instruction that runs off the page or an offset
+#        that is in skip.
+#
+# @returns A record, see zpage.
+def indexPage( data, entry, skip ):
+   offsets = array.array( "H" )
+   opcodes = array.array( "H" )
+   kinds   = bytearray( )
+   rels    = array.array( "q" )
+   text    = [ ]
+
+   off = entry
+   while off < len( data ) and off not in skip:
+      try:
+         rv = decode( data, off )
+      except IndexError:
+         break
+
+      if rv == None:
+         break
+
+      kind, rel = branchOf( rv )
+
+      offsets.append( off )
+      opcodes.append( getOpcode( data, off ) )
+      kinds.append( zos_store_kinds.index( kind ) )
+      rels.append( rel or 0 )
+      text.append( rv.text( ) )
+
+      off += rv._sz
+
+   return ( offsets, opcodes, bytes( kinds ), rels, text )
+
+# @class zstore
+# @brief The in memory pages of this session in front of the database.
+#
+# @param[in] self  - The self pointer to the instantiated structure/class.
+# @param[in] read  - read( address, size ) returns the bytes of memory at a
+#                    page address when it has them at hand, or None. It
+#                    must not go to the inferior: a page that buf does not
+#                    cover is simply not indexed.
+# @param[in] path  - The database file, storePath( ) by default.
+# @param[in] size  - The maximum number of pages kept in memory.
+# @returns An instance of the structure.
+class zstore:
+   def __init__( self, read=None, path=None, size=1024 ):
+      self.read    = read
+      self.path    = path
+      self.size    = size
+      self.enabled = True
+      self.pages   = collections.OrderedDict( )
+      self.last    = ( None, None )
+      self.db      = None
+      self.error   = None
+      self.version = None
+      self.dirty   = 0
+      self.hits    = 0
+      self.misses  = 0
+      self.loaded  = 0
+      self.indexed = 0
+
+   # @fn    open
+   # @brief Open the database the first time it is needed. When it cannot be
+   #        opened the store works from memory only and error says why.
+   def open( self ):
+      if self.db != None or self.error != None:
+         return self.db
+
+      self.version = tableVersion( )
+
+      if sqlite3 == None:
+         self.error = "sqlite3 is not available"
+         return None
+
+      path = self.path or storePath( )
+      try:
+         os.makedirs( os.path.dirname( path ), exist_ok=True )
+         self.db = sqlite3.connect( path, timeout=10 )
+         self.db.execute( "PRAGMA synchronous=OFF" )
+         self.db.execute( "CREATE TABLE IF NOT EXISTS pages ( digest BLOB, entry INTEGER, "
+                          "offsets BLOB, opcodes BLOB, kinds BLOB, rels BLOB, text TEXT, "
+                          "PRIMARY KEY ( digest, entry ) ) WITHOUT ROWID" )
+         self.path = path
+      except ( OSError, sqlite3.Error ) as e:
+         self.db    = None
+         self.error = "{}: {}".format( path, e )
+
+      return self.db
+
+   # @fn    page
+   # @brief The zpage for the page at address pa, read from buf when the
+   #        whole page is in it or else with read, or None when neither has
+   #        it.
+   def page( self, buf, base, pa ):
+      # Instructions are mostly asked for in order, a page at a time.
+      if self.last[0] == pa:
+         return self.last[1]
+
+      pg   = self.pages.get( pa )
+      poff = pa - base
+
+      if pg != None:
+         self.pages.move_to_end( pa )
+         self.last = ( pa, pg )
+         return pg
+
+      if poff >= 0 and poff + zos_store_page <= len( buf ):
+         data = bytes( buf[poff:poff + zos_store_page] )
+      elif self.read != None:
+         try:
+            data = self.read( pa, zos_store_page )
+         except Exception:
+            data = None
+         if data == None:
+            return None
+         data = bytes( data )
+      else:
+         return None
+
+      db = self.open( )
+      pg = zpage( data, hashlib.blake2b( data, digest_size=20, key=self.version ).digest( ) )
+
+      if db != None:
+         for entry, offs, ops, kinds, rels, text in db.execute(
+                 "SELECT entry, offsets, opcodes, kinds, rels, text FROM pages WHERE digest = ?",
+                 ( pg.digest, ) ):
+            pg.add( entry, self.unpack( offs, ops, kinds, rels, text ) )
+            self.loaded += 1
+
+      self.pages[pa] = pg
+      self.last      = ( pa, pg )
+      if len( self.pages ) > self.size:
+         self.pages.popitem( last=False )
+
+      return pg
+
+   # @fn    unpack
+   # @brief A record from a database row.
+   def unpack( self, offs, ops, kinds, rels, text ):
+      offsets = array.array( "H" )
+      offsets.frombytes( offs )
+      opcodes = array.array( "H" )
+      opcodes.frombytes( ops )
+      relv    = array.array( "q" )
+      relv.frombytes( rels )
+
+      return ( offsets, opcodes, kinds, relv,
+               [ tuple( t.split( "\t" ) ) for t in text.split( "\n" ) ] )
+
+   # @fn    insert
+   # @brief Index pg from entry and write the new record to the database.
+   def insert( self, pg, entry ):
+      rec = indexPage( pg.data, entry, pg.index )
+      pg.add( entry, rec )
+      self.indexed += 1
+
+      if self.db != None:
+         offsets, opcodes, kinds, rels, text = rec
+         try:
+            self.db.execute( "INSERT OR REPLACE INTO pages VALUES ( ?, ?, ?, ?, ?, ?, ? )",
+                             ( pg.digest, entry, offsets.tobytes( ), opcodes.tobytes( ),
+                               kinds, rels.tobytes( ),
+                               "\n".join( m + "\t" + a for m, a in text ) ) )
+            self.dirty += 1
+            if self.dirty >= zos_store_batch:
+               self.flush( )
+         except sqlite3.Error as e:
+            self.error = str( e )
+            self.db    = None
+
+   # @fn    lookup
+   # @brief Same as disasm.decode but served from the pages already indexed.
+   #        Nothing new is indexed, so it is safe to call at offsets that
+   #        may not be instructions.
+   def lookup( self, buf, off, address=0 ):
+      return self.decode( buf, off, address, False )
+
+   # @fn    decode
+   # @brief Same as disasm.decode but served from the store, indexing the
+   #        page from address on when it has not been indexed there yet.
+   def decode( self, buf, off, address=0, index=True ):
+      if not self.enabled:
+         return decode( buf, off, address )
+
+      pa = address & ~( zos_store_page - 1 )
+      pg = self.page( buf, address - off, pa )
+      if pg == None:
+         return decode( buf, off, address )
+
+      rv = pg.rvalue( address - pa, address )
+      if rv == None and index and address - pa not in pg.entries:
+         self.insert( pg, address - pa )
+         rv = pg.rvalue( address - pa, address )
+
+      if rv == None:
+         self.misses += 1
+         return decode( buf, off, address )
+
+      # Memory changed since the page was read.
+      if buf[off:off + rv._sz] != rv._raw:
+         self.pages.pop( pa, None )
+         self.last = ( None, None )
+         self.misses += 1
+         return decode( buf, off, address )
+
+      self.hits += 1
+      return rv
+
+   # @fn    flush
+   # @brief Commit what has been written to the database.
+   def flush( self, *args ):
+      if self.db != None and self.dirty:
+         try:
+            self.db.commit( )
+         except sqlite3.Error as e:
+            self.error = str( e )
+         self.dirty = 0
+
+   # @fn    clear
+   # @brief Forget the pages read in this session; the database is kept.
+   def clear( self, *args ):
+      self.pages.clear( )
+      self.last = ( None, None )
+
+   # @fn    purge
+   # @brief Empty the database as well.
+   def purge( self ):
+      self.clear( )
+      if self.open( ) != None:
+         self.db.execute( "DELETE FROM pages" )
+         self.db.commit( )
+         self.dirty = 0
+
+   # @fn    reset
+   # @brief Zero the counters.
+   def reset( self ):
+      self.hits    = 0
+      self.misses  = 0
+      self.loaded  = 0
+      self.indexed = 0
+
+   # @fn    stats
+   # @brief Describe the store in one line.
+   def stats( self ):
+      if not self.enabled:
+         return "off"
+
+      where = self.path if self.db != None else "memory only ({})".format( self.error ) \
+                 if self.error != None else "not opened yet"
+
+      return "{} pages in memory, {} records loaded, {} indexed, {} hits, {} misses, {}".format(
+                len( self.pages ), self.loaded, self.indexed, self.hits, self.misses, where )
@@ -0,0 +1,339 @@
+# @file   stream.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Read zOS instruction streams out of the inferior and decode them.
+#
+# @section Copyright
+#
+#   Copyright Notice:
+#
+#   Copyright (C) 2019 LzLabs GmbH
+#   All Rights Reserved.
+#
+#   This product and associated documentation includes confidential,
+#   proprietary and trade secret information and code.  No part of
+#   this product or associated documentation may be modified,
+#   distributed, or copied in any form except as expressly permitted
+#   by the license agreement pertaining to this product.
+#
+# @section License
+#
+#   This file is Object Code Only and is NOT to be distributed in source form.
+#
+# @section Description
+#
+#   The gdb side of the disassembler. Memory is read in windows so that very
+#   large regions can be walked without holding all of it at once, and the
+#   decoding itself is done by apis/disasm.py.
+#
+# @section Source
+#
+#   Information in this file is original.
+#
+import gdb
+import sys
+import atexit
+
+if sys.path[0] != '/opt/lzlabs/debug/gdb':
+   sys.path.insert( 0, '/opt/lzlabs/debug/gdb' )
+
+from apis.disasm import *
+from apis.cache import zcache
+from apis.labels import zlabels
+from apis.scanner import scanBoundaries, zos_ilc_length
+from apis.search import zpattern, searchBuffer
+from apis.store import zstore
+
+# @def   zos_window
+# @brief The number of bytes iter_instructions reads from the inferior at once.
+zos_window = 64 * 1024
+
+# @class zwindows
+# @brief Windows of inferior memory read ahead of time, see apis/prefetch.py.
+#        They are only good while the inferior is stopped and memory has not
+#        been written, so they are dropped when it resumes or gdb changes
+#        memory.
+#
+# @param[in] self - The self pointer to the instantiated structure/class.
+# @returns An instance of the structure.
+class zwindows:
+   def __init__( self ):
+      self.windows = [ ]
+      self.hits    = 0
+
+   # @fn    add
+   # @brief Keep the bytes buf read from address addr.
+   def add( self, addr, buf ):
+      self.windows.append( ( addr, memoryview( buf ) ) )
+
+   # @fn    find
+   # @brief The bytes of [addr, addr+size) if one window holds all of them,
+   #        or None.
+   def find( self, addr, size ):
+      for start, buf in self.windows:
+         if start <= addr and addr + size <= start + len( buf ):
+            self.hits += 1
+            return buf[addr - start:addr - start + size]
+
+      return None
+
+   # @fn    clear
+   # @brief Drop every window.
+   def clear( self, *args ):
+      self.windows = [ ]
+
+# @def   zos_windows
+# @brief The memory read by the stop prefetch, in front of the inferior.
+zos_windows = zwindows( )
+
+for _ev in ( "cont", "memory_changed", "new_objfile", "exited" ):
+   if hasattr( gdb.events, _ev ):
+      getattr( gdb.events, _ev ).connect( zos_windows.clear )
+
+# @fn    readMemory
+# @brief Read inferior memory, from the prefetched windows when they hold
+#        all of it.
+def readMemory( addr, size ):
+   buf = zos_windows.find( addr, size )
+   if buf != None:
+      return buf
+
+   return gdb.selected_inferior( ).read_memory( addr, size )
+
+# @fn    readPage
+# @brief A page of inferior memory for the store, when the prefetched windows
+#        hold it. The inferior is not read for it: a small zdisass would pay
+#        a second read for the page around the bytes it asked for.
+def readPage( addr, size ):
+   return zos_windows.find( addr, size )
+
+# @def   zos_store
+# @brief The on disk index of decoded pages. It outlives the session; what
+#        it holds in memory is dropped with the cache below and what it has
+#        written is committed at each prompt.
+zos_store = zstore( readPage )
+
+# @def   zos_cache
+# @brief The decoded instruction cache shared by every command in the session.
+#        Misses are decoded through zos_store. It is emptied whenever gdb
+#        changes memory, loads an objfile or the inferior exits.
+zos_cache = zcache( source=zos_store.decode )
+
+# @def   zos_labels
+# @brief The entry point labels used to annotate branch targets. They are
+#        zOS addresses so they are kept for the whole gdb session, across
+#        runs of the inferior, until zlabel clear.
+zos_labels = zlabels( )
+
+for _ev in ( "memory_changed", "new_objfile", "exited" ):
+   if hasattr( gdb.events, _ev ):
+      getattr( gdb.events, _ev ).connect( zos_cache.clear )
+      getattr( gdb.events, _ev ).connect( zos_store.clear )
+
+if hasattr( gdb.events, "before_prompt" ):
+   gdb.events.before_prompt.connect( zos_store.flush )
+atexit.register( zos_store.flush )
+
+# @fn    readInstructionStream
+# @brief Read the instruction bytes for [addr, addr+size) plus enough slack for
+#        the longest (6 byte) instruction starting at the end of the range.
+#        If the slack runs off the end of readable memory we fall back to the
+#        range itself and let the decoders stop at the end of the buffer.
+#
+# @param[in] addr - The native address of the first instruction.
+# @param[in] size - The number of bytes to disassemble.
+# @returns A memoryview over the bytes read from the inferior.
+def readInstructionStream( addr, size ):
+   try:
+      return memoryview( readMemory( addr, size + 6 ) )
+   except gdb.MemoryError:
+      return memoryview( readMemory( addr, size ) )
+
+# @def   zos_back_slack
+# @brief The bytes read in front of the count * 6 needed by zdisass -back,
+#        giving the candidate starts room to converge.
+zos_back_slack = 128
+
+# @fn    readBackward
+# @brief Read the bytes around addr needed to list count instructions before
+#        it and size bytes from it, in one read. If the window in front of
+#        addr is not readable it is cut back to the start of addr's page.
+#
+# @param[in] addr  - The native address of the instruction to go back from.
+# @param[in] count - The number of instructions wanted before addr.
+# @param[in] size  - The number of bytes to disassemble from addr.
+# @returns ( buf, target, start ): the memoryview read, the offset of addr
+#          in it and the offset syncBackward chose to decode from.
+def readBackward( addr, count, size ):
+   window = ( count * 6 + zos_back_slack ) & ~1
+
+   try:
+      buf = memoryview( readMemory( addr - window, window + size + 6 ) )
+   except gdb.MemoryError:
+      window = min( window, addr & 0xfff ) & ~1
+      buf    = readInstructionStream( addr - window, window + size )
+
+   start, n = syncBackward( buf, window, count )
+
+   return ( buf, window, start )
+
+# @fn    iter_instructions
+# @brief Decode the instructions from start onwards, reading the inferior one
+#        window at a time as the caller consumes them.
+#
+#        Iteration ends at end, after count instructions or at the first
+#        unknown opcode, whichever comes first. Only one window is held at a
+#        time and nothing past the instruction the caller stops at is read.
+#
+# @param[in] start  - The native address of the first instruction.
+# @param[in] end    - The native address to stop at (exclusive), or None.
+# @param[in] count  - The maximum number of instructions, or None.
+# @param[in] window - The number of bytes to read at once.
+# @param[in] cache  - The zcache to decode through, None to bypass it.
+# @returns A generator of rvalues with _addr set to the native address.
+def iter_instructions( start, end=None, count=None, window=zos_window,
+                       cache=zos_cache ):
+   if end == None and count == None:
+      raise ValueError( "iter_instructions needs an end address or a count" )
+
+   iaddr = start
+   n     = 0
+
+   while end == None or iaddr < end:
+      size = window
+      if end != None:
+         size = min( size, end - iaddr )
+      if count != None:
+         # No instruction is longer than 6 bytes.
+         size = min( size, 6 * ( count - n ) )
+      buf  = readInstructionStream( iaddr, size )
+      last = iaddr
+
+      for rv in iter_decode( buf, 0, size, iaddr, cache ):
+         yield rv
+
+         n    += 1
+         last  = rv._addr + rv._sz
+         if count != None and n >= count:
+            return
+
+      # iter_decode stopped early because of an unknown opcode.
+      if last < iaddr + size:
+         return
+
+      iaddr = last
+
+# @def   zos_scan_chunk
+# @brief The number of bytes iter_scan reads from the inferior at once.
+zos_scan_chunk = 1024 * 1024
+
+# @fn    iter_scan
+# @brief Find the instructions in [start, start+size) a chunk at a time with
+#        scanner.scanBoundaries, without decoding them.
+#
+#        Unknown opcodes do not stop the scan: they are returned with an
+#        opcode of -1 and the scan goes on at the next halfword, so data in
+#        the region does not hide the code after it. An instruction that
+#        crosses the end of a chunk is found in that chunk and the next
+#        chunk starts after it.
+#
+# @param[in] start  - The native address to start at.
+# @param[in] size   - The number of bytes to scan.
+# @param[in] chunk  - The number of bytes to read at a time.
+# @returns A generator of ( address, buf, offsets, opcodes ) where the
+#          offsets are into buf, which was read from address.
+def iter_scan( start, size, chunk=zos_scan_chunk ):
+   end   = start + size
+   iaddr = start
+
+   while iaddr < end:
+      n   = min( chunk, end - iaddr )
+      buf = readInstructionStream( iaddr, n )
+
+      offs, keys = scanBoundaries( buf, 0, n, resync=True )
+      if len( offs ) == 0:
+         return
+
+      yield ( iaddr, buf, offs, keys )
+
+      last  = int( offs[-1] )
+      nxt   = last + ( zos_ilc_length[buf[last]] if keys[-1] >= 0 else 2 )
+
+      # The scan stopped short of the chunk: the rest could not be read.
+      if nxt < n:
+         return
+
+      iaddr += nxt
+
+# @fn    iter_search
+# @brief Find the matches of a search.zpattern in [start, start+size) a
+#        chunk at a time. Instructions already in zos_store are not decoded
+#        again.
+#
+#        Each chunk is read with enough of the next one to finish a match
+#        that starts at its end, so nothing is missed at a chunk boundary
+#        and nothing is reported twice.
+#
+# @param[in] start   - The native address to start at.
+# @param[in] size    - The number of bytes to search.
+# @param[in] pattern - A zpattern.
+# @param[in] chunk   - The number of bytes to read at a time.
+# @returns A generator of ( address, [ rvalue, ... ] ) in address order.
+def iter_search( start, size, pattern, chunk=zos_scan_chunk ):
+   end   = start + size
+   iaddr = start
+
+   while iaddr < end:
+      n = min( chunk, end - iaddr )
+
+      try:
+         buf = readInstructionStream( iaddr, n + pattern.width( ) )
+      except gdb.MemoryError:
+         buf = readInstructionStream( iaddr, n )
+
+      for off, insts in searchBuffer( buf, pattern, 0, n, iaddr, zos_store.lookup ):
+         yield ( iaddr + off, insts )
+
+      iaddr += n
+
+# @def   zos_batch_gap
+# @brief The largest gap between two addresses that decodeAddresses still
+#        covers with one read.
+zos_batch_gap = 4096
+
+# @fn    decodeAddresses
+# @brief Decode the instructions at a set of scattered addresses, such as a
+#        trace or profile, reading each cluster of nearby addresses once.
+#
+# @param[in] addrs - The native addresses, in any order and repeated.
+# @param[in] gap   - The largest gap covered by a single read.
+# @returns A dict of address : rvalue, or None where the memory could not be
+#          read or the opcode is unknown.
+def decodeAddresses( addrs, gap=zos_batch_gap ):
+   found = { }
+   addrs = sorted( set( addrs ) )
+   i     = 0
+
+   while i < len( addrs ):
+      j = i + 1
+      while j < len( addrs ) and addrs[j] - addrs[j - 1] <= gap:
+         j += 1
+
+      # When the cluster cannot be read in one go, read it an address at a
+      # time so that only the unreadable ones are lost.
+      try:
+         reads = [ ( addrs[i], readInstructionStream( addrs[i], addrs[j - 1] - addrs[i] ), addrs[i:j] ) ]
+      except gdb.MemoryError:
+         reads = [ ( addr, None, [ addr ] ) for addr in addrs[i:j] ]
+
+      for first, buf, cluster in reads:
+         for addr in cluster:
+            try:
+               if buf == None:
+                  buf = readInstructionStream( addr, 0 )
+               found[addr] = zos_cache.decode( buf, addr - first, addr )
+            except ( gdb.MemoryError, IndexError ):
+               found[addr] = None
+
+      i = j
+
+   return found
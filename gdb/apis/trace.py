@@ -0,0 +1,242 @@
+# @file   trace.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Record the zOS instruction addresses executed by the emulator.
+#
+# @section Copyright
+#
+#   Copyright Notice:
+#
+#   Copyright (C) 2019 LzLabs GmbH
+#   All Rights Reserved.
+#
+#   This product and associated documentation includes confidential,
+#   proprietary and trade secret information and code.  No part of
+#   this product or associated documentation may be modified,
+#   distributed, or copied in any form except as expressly permitted
+#   by the license agreement pertaining to this product.
+#
+# @section License
+#
+#   This file is Object Code Only and is NOT to be distributed in source form.
+#
+# @section Description
+#
+#   An internal breakpoint is put where the emulator dispatches each zOS
+#   instruction. Its stop method evaluates the PSW address, hands it to a
+#   recorder and returns False, so gdb resumes the inferior without
+#   announcing the stop. Nothing is formatted or printed per hit, and the
+#   ring buffer writes into a preallocated array('Q'); evaluating the
+#   address still makes a gdb.Value and an int each time. The addresses
+#   are decoded only when they are looked at.
+#
+# @section Source
+#
+#   Information in this file is original.
+#
+import gdb
+import sys
+import time
+import array
+
+if sys.path[0] != '/opt/lzlabs/debug/gdb':
+   sys.path.insert( 0, '/opt/lzlabs/debug/gdb' )
+
+from apis.coverage import zcoverage
+
+# @def   zos_trace_expr
+# @brief The expression for the address of the instruction being dispatched,
+#        evaluated in the frame of the dispatch point.
+zos_trace_expr = "regs->psw.ia.F"
+
+# @def   zos_trace_size
+# @brief The number of addresses the ring buffer holds by default.
+zos_trace_size = 1024 * 1024
+
+# @class zring
+# @brief A ring buffer of the last size addresses.
+#
+# @param[in] self - The self pointer to the instantiated structure/class.
+# @param[in] size - The number of addresses kept.
+# @returns An instance of the structure.
+class zring:
+   def __init__( self, size=zos_trace_size ):
+      self.size  = size
+      self.buf   = array.array( "Q", bytes( 8 * size ) )
+      self.pos   = 0
+      self.count = 0
+
+   # @fn    add
+   # @brief Record one address, overwriting the oldest once the ring is full.
+   def add( self, addr ):
+      self.buf[self.pos] = addr
+      self.pos   += 1
+      self.count += 1
+      if self.pos == self.size:
+         self.pos = 0
+
+   # @fn    last
+   # @brief The last n addresses, oldest first.
+   def last( self, n ):
+      n = min( n, self.count, self.size )
+      s = self.pos - n
+
+      if s >= 0:
+         return self.buf[s:self.pos].tolist( )
+
+      return self.buf[s:].tolist( ) + self.buf[:self.pos].tolist( )
+
+   # @fn    clear
+   # @brief Forget every address.
+   def clear( self ):
+      self.pos   = 0
+      self.count = 0
+
+   # @fn    __len__
+   # @brief The number of addresses held.
+   def __len__( self ):
+      return min( self.count, self.size )
+
+# @class ztracepoint
+# @brief The internal breakpoint at the dispatch point. record is called with
+#        each address; hits, errors and the seconds spent in stop are kept.
+#
+# @param[in] self   - The self pointer to the instantiated structure/class.
+# @param[in] spec   - The location of the dispatch point.
+# @param[in] record - The function given each address.
+# @param[in] expr   - The expression for the address, see zos_trace_expr.
+# @returns An instance of the structure.
+class ztracepoint( gdb.Breakpoint ):
+   def __init__( self, spec, record, expr=zos_trace_expr ):
+      super( ztracepoint, self ).__init__( spec, gdb.BP_BREAKPOINT, internal=True )
+      self.silent = True
+      self.record = record
+      self.expr   = expr
+      self.parse  = gdb.parse_and_eval
+      self.hits   = 0
+      self.errors = 0
+      self.time   = 0.0
+
+   def stop( self ):
+      t = time.perf_counter( )
+
+      try:
+         self.record( int( self.parse( self.expr ) ) )
+         self.hits += 1
+      except gdb.error:
+         self.errors += 1
+
+      self.time += time.perf_counter( ) - t
+      return False
+
+# @class zrecording
+# @brief A recording: the tracepoint, what it writes to and when it ran.
+#
+# @param[in] self   - The self pointer to the instantiated structure/class.
+# @param[in] size   - The number of addresses the ring buffer holds.
+# @param[in] record - The function given each address instead of a ring
+#                     buffer, for example zcoverage.record.
+# @returns An instance of the structure.
+class zrecording:
+   def __init__( self, size=zos_trace_size, record=None ):
+      self.ring    = zring( size ) if record == None else None
+      self.record  = record or self.ring.add
+      self.point   = None
+      self.spec    = None
+      self.expr    = zos_trace_expr
+      self.started = None
+      self.elapsed = 0.0
+      self.hits    = 0
+      self.errors  = 0
+      self.time    = 0.0
+
+   # @fn    start
+   # @brief Put the tracepoint at spec and start recording.
+   def start( self, spec ):
+      if self.point != None:
+         raise gdb.GdbError( "Already recording at {}.".format( self.spec ) )
+
+      try:
+         self.point = ztracepoint( spec, self.record, self.expr )
+      except gdb.error as e:
+         raise gdb.GdbError( "Cannot put the trace point at {}: {}".format( spec, e ) )
+
+      self.spec    = spec
+      self.started = time.perf_counter( )
+
+   # @fn    resize
+   # @brief Give the ring room for size addresses. What it holds is lost.
+   def resize( self, size ):
+      if self.point != None:
+         raise gdb.GdbError( "Stop recording before changing the size." )
+
+      if size != self.ring.size:
+         self.ring   = zring( size )
+         self.record = self.ring.add
+
+   # @fn    stop
+   # @brief Delete the tracepoint and add its counts to the totals.
+   def stop( self ):
+      if self.point == None:
+         return
+
+      self.hits    += self.point.hits
+      self.errors  += self.point.errors
+      self.time    += self.point.time
+      self.elapsed += time.perf_counter( ) - self.started
+
+      self.point.delete( )
+      self.point = None
+
+   # @fn    counts
+   # @brief ( hits, errors, seconds in stop, seconds recording ) so far.
+   def counts( self ):
+      if self.point == None:
+         return ( self.hits, self.errors, self.time, self.elapsed )
+
+      return ( self.hits + self.point.hits, self.errors + self.point.errors,
+               self.time + self.point.time,
+               self.elapsed + time.perf_counter( ) - self.started )
+
+   # @fn    stats
+   # @brief Describe the recording in one line.
+   def stats( self ):
+      hits, errors, secs, elapsed = self.counts( )
+
+      text = "{} at {}, {} hits, {} errors".format( "recording" if self.point != None else "stopped",
+                                                    self.spec, hits, errors )
+      if self.ring != None:
+         text += ", {} of {} addresses held".format( len( self.ring ), self.ring.size )
+
+      if hits:
+         text += ", {:.1f} us per hit in stop, {:.0f} hits/s".format(
+                    1e6 * secs / hits, hits / elapsed if elapsed else 0.0 )
+
+      return text
+
+   # @fn    reset
+   # @brief Forget the addresses and the counts.
+   def reset( self ):
+      if self.ring != None:
+         self.ring.clear( )
+      self.hits    = 0
+      self.errors  = 0
+      self.time    = 0.0
+      self.elapsed = 0.0
+      if self.point != None:
+         self.point.hits   = 0
+         self.point.errors = 0
+         self.point.time   = 0.0
+         self.started      = time.perf_counter( )
+
+# @def   zos_trace
+# @brief The instruction trace of the session.
+zos_trace = zrecording( )
+
+# @def   zos_coverage
+# @brief The executed instruction bitmaps of the session, filled through a
+#        tracepoint of its own.
+zos_coverage = zcoverage( )
+
+# @def   zos_coverage_trace
+# @brief The recording that sets the bits of zos_coverage.
+zos_coverage_trace = zrecording( record=zos_coverage.record )
@@ -39,8 +39,11 @@ if sys.path[0] != '/opt/lzlabs/debug/gdb':
 _zthread      = 1
 _zbreakpoints = []
 
-from zdisass import *
-from zinfo import * 
-from zfuncs import *
-from zmemory import *
-from sdmpretty import *
+# The commands and pretty printers are loaded the first time they are used,
+# see apis/lazy.py. The current zOS thread starts as 1.
+import gdb
+
+from apis.lazy import registerLazy, loadCommands
+
+gdb.execute( "set $_zthread=1" )
+registerLazy( )
@@ -39,16 +39,37 @@ if sys.path[0] != '/opt/lzlabs/debug/gdb':
    sys.path.insert( 0, '/opt/lzlabs/debug/gdb' )
 
 from apis.common import *
-from apis.decoder import *
-from apis.instructions import *
+from apis.stream import *
 from apis.bswapreloc import *
+from apis.cfg import *
+from apis.labels import *
+from apis.records import *
+
+# @class gdbout
+# @brief A file like object that writes through gdb.write, and so through
+#        gdb's pager.
+class gdbout:
+   def write( self, text ):
+      gdb.write( text )
 
 class zdisass( gdb.Command ):
    """Disassemble a zOS instruction stream similar to the normal disass command.
 
+   With -back N the N instructions before the address are listed as well.
+   Where they start is worked out from the bytes in front of the address, so
+   the address itself must be the start of an instruction.
+
+   /json writes one JSON object per instruction and /csv one CSV row, with
+   the native and zOS address, offset, raw bytes, Mnemonic, format and the
+   operand fields with the values the text shows: real lengths and relative
+   offsets in bytes. -o file writes the output to a file instead of the
+   screen.
+
    Examples:
    (gdb) zdisass regs->mainstor+regs->psw.ia.F
    (gdb) zdisass 0x7ffb40a2b41c,+150
+   (gdb) zdisass -back 20 regs->mainstor+regs->psw.ia.F
+   (gdb) zdisass /json -o /tmp/text.jsonl regs->mainstor+0x20000,0x100000
    """
 
    def __init__( self ):
@@ -57,10 +78,29 @@ class zdisass( gdb.Command ):
    def invoke( self, arg, from_tty ):
       isSDMEnabled( )
 
-      size = 64
+      usage = "zdisass [/json|/csv] [-o file] [-back N] <symbol|address[,size]]>"
+      size  = 64
+      back  = 0
+      kind  = "text"
+      path  = None
 
+      opts = arg.split( )
+      while opts and opts[0][0] in "/-":
+         opt = opts.pop( 0 )
+
+         if opt == "/json" or opt == "/csv":
+            kind = opt[1:]
+         elif ( opt == "-o" or opt == "-back" ) and opts:
+            if opt == "-o":
+               path = opts.pop( 0 )
+            else:
+               back = int( opts.pop( 0 ) )
+         else:
+            raise gdb.GdbError( usage )
+
+      arg = " ".join( opts )
       if len( arg ) == 0:
-         raise gdb.GdbError( "zdisass <symbol|address[,size]]>" )
+         raise gdb.GdbError( usage )
 
       args = arg.split( "," )
       iarg = args[0].strip( )
@@ -68,83 +108,226 @@ class zdisass( gdb.Command ):
       if len( args ) == 2:
          size = int( args[1].strip( ) )
       elif len( args ) != 1:
-         raise gdb.GdbError( "zdisass <symbol|address[,size]]>" )
+         raise gdb.GdbError( usage )
 
       addr  = gdb.execute( "p/x {}".format( iarg ), to_string=True ) \
                  .split( "=" )[1] \
                  .strip( )
       saddr = int( addr, 16 )
       eaddr = saddr + size
-      iaddr = saddr
-
-      print("Dump of zOS assembler code from {:#x} to {:#x}".format( saddr, eaddr ))
 
       ms = MainstorValue();
       zaddr = saddr - ms;
 
+      # Branch targets past the end of mainstor are shown as out of range
+      # when the SDM says where that is.
       try:
-         while iaddr < eaddr:
-            # Most of the instruction Mnemonics are 2 bytes. However, there are
-            # others that are 3 and 4 bytes as well. Based on what again is
-            # documented in Appendix B of the document mentioned above, the
-            # following instructions beginning whith these 2 bytes are 3 and 4
-            # byte Mnemonics. All others are 2 bytes.
-            #
-            # 3 bytes: 0xa5, 0xa7, 0xc0, 0xc2, 0xc4, 0xc6, 0xc8
-            # 4 bytes: 0xb2, 0xb3, 0xb9, 0xe3, 0xe5, 0xeb, 0xec, 0xed
-            #
-            inst = gdb.execute( "x/6xb {}".format( iaddr ), to_string=True ) \
-                      .split( )
-
-            # This is the base instruction Mnemonic
-            im = int( inst[1], 16 )
-
-            if ( im == 0xa5 ) or \
-               ( im == 0xa7 ) or \
-               ( im == 0xc0 ) or \
-               ( im == 0xc2 ) or \
-               ( im == 0xc4 ) or \
-               ( im == 0xc6 ) or \
-               ( im == 0xc8 ):
-               im = ( ( im << 4 ) | ( int( inst[2], 16 ) & 0x0f ) )
-            elif ( im == 0x01 ) or \
-                 ( im == 0xb2 ) or \
-                 ( im == 0xb3 ) or \
-                 ( im == 0xb9 ) or \
-                 ( im == 0xe5 ):
-               im = ( ( im << 8 ) | int( inst[2], 16 ) )
-            elif ( im == 0xe3 ) or \
-                 ( im == 0xeb ) or \
-                 ( im == 0xec ) or \
-                 ( im == 0xed ):
-               im = ( ( im << 8 ) | int( inst[5], 16 ) )
-
-            ii = getInst( im )
-            #print "ii: {}, im: {}".format(ii, im)
-
-            func = ii["func"]
-            if ( func == None ):
-               break
-            else:
-               rv = func( iaddr )
+         limit = int( gdb.parse_and_eval( "sysblk->mainsize" ) )
+      except gdb.error:
+         limit = None
 
-            off = iaddr - saddr;
+      # A file is written through a large buffer rather than line by line.
+      if path != None:
+         out = openWriter( kind, path=path )
+      else:
+         out = openWriter( kind, gdbout( ) )
 
-            res = "{:#x} {:08X} <{:=+04X}>: {:14} {:6} {}".format( iaddr,
-                                                                   zaddr + off,
-                                                                   off,
-                                                                   rv._mac,
-                                                                   ii["name"],
-                                                                   rv._asm );
+      try:
+         if back > 0:
+            # Everything comes out of one read around the address.
+            buf, target, start = readBackward( saddr, back, size )
+            first = saddr - target + start
+            insts = iter_decode( buf, start, target + size, first, zos_cache )
+         else:
+            # The range is read a window at a time as it is printed.
+            first = saddr
+            insts = iter_instructions( saddr, eaddr )
+
+         out.header( first, eaddr )
+
+         # Output to the screen goes through gdb.write so that gdb's pager
+         # applies, and answering 'q' at a page prompt stops the read as
+         # well as the listing.
+         for rv in insts:
+            off = rv._addr - saddr;
+            tgt = ""
 
-            print(res)
+            # Relative branches get their target and its label appended.
+            if kind == "text":
+               tgt = formatTarget( rv, zaddr + off, zos_labels, limit )
+               if tgt:
+                  tgt = "  # " + tgt
 
-            iaddr += rv._sz;
+            out.write( rv, zaddr + off, off, tgt )
+      except KeyboardInterrupt:
+         pass
+      except IndexError:
+         # The last instruction runs past the end of readable memory.
+         print("*** Memory Error detected ***")
       except gdb.error:
          print("*** error ***")
       except gdb.MemoryError:
          print("*** Memory Error detected ***")
+      finally:
+         out.close( )
 
       return
 
-zdisass( )
+
+class zcfg( gdb.Command ):
+   """Disassemble a zOS routine by following its control flow.
+
+   Decoding starts at the address and follows the relative branches within
+   the range (default 4096 bytes), so data after an unconditional branch is
+   not decoded. The instructions are printed as basic blocks with their
+   successors, or with /dot as a graphviz digraph.
+
+   Examples:
+   (gdb) zcfg regs->mainstor+regs->psw.ia.F,0x800
+   (gdb) pipe zcfg /dot 0x7ffb40a2b41c,4096 | dot -Tsvg -o cfg.svg
+   """
+
+   def __init__( self ):
+      super( zcfg, self ).__init__( "zcfg", gdb.COMMAND_USER )
+
+   def invoke( self, arg, from_tty ):
+      isSDMEnabled( )
+
+      size = 4096
+      dot  = False
+
+      arg = arg.strip( )
+      if arg.startswith( "/dot" ):
+         dot = True
+         arg = arg[4:].strip( )
+
+      if len( arg ) == 0:
+         raise gdb.GdbError( "zcfg [/dot] <symbol|address[,size]]>" )
+
+      args = arg.split( "," )
+      iarg = args[0].strip( )
+
+      if len( args ) == 2:
+         size = int( args[1].strip( ), 0 )
+      elif len( args ) != 1:
+         raise gdb.GdbError( "zcfg [/dot] <symbol|address[,size]]>" )
+
+      addr  = gdb.execute( "p/x {}".format( iarg ), to_string=True ) \
+                 .split( "=" )[1] \
+                 .strip( )
+      saddr = int( addr, 16 )
+      zaddr = saddr - MainstorValue( )
+
+      try:
+         buf    = readInstructionStream( saddr, size )
+         blocks = buildCFG( buf, [ 0 ], saddr, size, zos_store.decode )
+
+         for line in ( formatDot if dot else formatCFG )( blocks, zaddr ):
+            gdb.write( line + "\n" )
+      except KeyboardInterrupt:
+         pass
+      except gdb.error:
+         print("*** error ***")
+      except gdb.MemoryError:
+         print("*** Memory Error detected ***")
+
+      return
+
+
+class zlabel( gdb.Command ):
+   """Manage the labels used to annotate zdisass branch targets.
+
+   Labels name zOS addresses and cover the addresses up to their size, or up
+   to the next label. They are kept for the rest of the gdb session.
+
+   Usage:
+   (gdb) zlabel add <name> <symbol|address[,size]>
+   (gdb) zlabel scan <symbol|address,size>
+   (gdb) zlabel load <file>
+   (gdb) zlabel list
+   (gdb) zlabel clear
+
+   scan looks for the standard entry eyecatcher (B n(,R15) over a length and
+   name) and adds a label for each routine it finds. The lines of a load
+   file are: <name> <zOS address> [size], with the numbers in hex.
+   """
+
+   def __init__( self ):
+      super( zlabel, self ).__init__( "zlabel", gdb.COMMAND_USER )
+
+   def native( self, expr ):
+      return int( gdb.execute( "p/x {}".format( expr ), to_string=True ) \
+                     .split( "=" )[1] \
+                     .strip( ), 16 )
+
+   def invoke( self, arg, from_tty ):
+      args = arg.split( None, 1 )
+
+      if len( args ) == 0:
+         raise gdb.GdbError( "zlabel add|scan|load|list|clear" )
+
+      cmd = args[0]
+      rest = args[1].strip( ) if len( args ) > 1 else ""
+
+      if cmd == "list":
+         for start, name, size in zos_labels.items( ):
+            print("{:08X} {:8} {}".format( start,
+                                          "" if size == None else "{:#x}".format( size ),
+                                          name ))
+      elif cmd == "clear":
+         zos_labels.clear( )
+      elif cmd == "load":
+         n = 0
+         with open( os.path.expanduser( rest ) ) as f:
+            for line in f:
+               fields = line.split( )
+               if len( fields ) < 2 or fields[0].startswith( "#" ):
+                  continue
+
+               size = int( fields[2], 16 ) if len( fields ) > 2 else None
+               zos_labels.add( int( fields[1], 16 ), fields[0], size )
+               n += 1
+
+         print("{} labels loaded".format( n ))
+      elif cmd == "add":
+         fields = rest.split( None, 1 )
+         if len( fields ) != 2:
+            raise gdb.GdbError( "zlabel add <name> <symbol|address[,size]>" )
+
+         where = fields[1].split( "," )
+         size  = int( where[1].strip( ), 0 ) if len( where ) == 2 else None
+
+         isSDMEnabled( )
+         zos_labels.add( self.native( where[0] ) - MainstorValue( ), fields[0], size )
+      elif cmd == "scan":
+         where = rest.split( "," )
+         if len( where ) != 2:
+            raise gdb.GdbError( "zlabel scan <symbol|address,size>" )
+
+         isSDMEnabled( )
+         saddr = self.native( where[0] )
+         size  = int( where[1].strip( ), 0 )
+
+         try:
+            buf = gdb.selected_inferior( ).read_memory( saddr, size )
+         except gdb.MemoryError:
+            raise gdb.GdbError( "Cannot read memory at {:#x}".format( saddr ) )
+
+         found = scanEyecatchers( buf, saddr - MainstorValue( ) )
+         for start, name in found:
+            zos_labels.add( start, name )
+
+         print("{} labels found".format( len( found ) ))
+      else:
+         raise gdb.GdbError( "zlabel add|scan|load|list|clear" )
+
+# @def   zos_commands
+# @brief The commands of this module by name. They are registered by
+#        apis/lazy.py, or below when the module is sourced.
+zos_commands = { "zdisass" : zdisass,
+                 "zcfg"    : zcfg,
+                 "zlabel"  : zlabel }
+
+if __name__ == "__main__":
+   for cmd in zos_commands.values( ):
+      cmd( )
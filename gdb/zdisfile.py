@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# @file	  zdisfile.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  Disassemble zOS instructions from a file without gdb.
+#
+# @section Copyright
+#
+#   Copyright Notice:
+#
+#   Copyright (C) 2019 LzLabs GmbH
+#   All Rights Reserved.
+#
+#   This product and associated documentation includes confidential,
+#   proprietary and trade secret information and code.  No part of
+#   this product or associated documentation may be modified,
+#   distributed, or copied in any form except as expressly permitted
+#   by the license agreement pertaining to this product.
+#
+# @section License
+#
+#   This file is Object Code Only and is NOT to be distributed in source form.
+#
+# @section Description
+#
+#   Disassemble the text of a load module or a dumped mainstor image. The
+#   file is memory mapped so only the pages that are disassembled are read,
+#   and the output has the same columns as the zdisass command:
+#
+#   $ python3 zdisfile.py CEEMAIN.text
+#   $ python3 zdisfile.py mainstor.img --offset 0x1a2b40 --length 0x200 \
+#                                      --base 0 --mainstor 0x7ffbc1a45000
+#
+#   --base is the zOS address of the first byte of the file, so for a
+#   mainstor image it is 0 and for a load module its load address.
+#   --mainstor is added to the zOS address to give the native address column.
+#   --cfg text|dot follows the control flow from --offset instead of decoding
+#   every byte, and prints the basic blocks and their successors.
+#   --jobs N splits a large file between N processes; the output is the same.
+#
+# @section Source
+#
+#   Information in this file is original.
+#
+import sys
+import os
+import argparse
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+sys.path.insert( 0, os.path.dirname( os.path.abspath( __file__ ) ) )
+
+from apis.disasm import *
+from apis.parallel import mapFile, iter_parallel
+from apis.cfg import buildCFG, formatCFG, formatDot
+
+# @fn    disassembleFile
+# @brief Write the disassembly of buf[start:end] to out.
+#
+# @param[in] buf      - The mapped file.
+# @param[in] start    - The file offset of the first instruction.
+# @param[in] end      - The file offset to stop at.
+# @param[in] base     - The zOS address of file offset 0.
+# @param[in] mainstor - The native address of zOS address 0.
+# @param[in] count    - The maximum number of instructions, or None.
+# @param[in] out      - The file object to write to.
+# @returns The number of instructions written.
+def disassembleFile( buf, start, end, base, mainstor, count, out ):
+   zaddr = base + start
+   n     = 0
+
+   out.write( "Dump of zOS assembler code from {:#x} to {:#x}\n".format( mainstor + zaddr,
+                                                                      mainstor + zaddr + end - start ) )
+
+   try:
+      for rv in iter_decode( buf, start, end, mainstor + zaddr ):
+         off = rv._addr - mainstor - zaddr
+
+         out.write( formatInst( rv, zaddr + off, off ) + "\n" )
+
+         n += 1
+         if count != None and n >= count:
+            break
+   except IndexError:
+      out.write( "*** instruction runs past the end of the file ***\n" )
+
+   return n
+
+# @fn    disassembleFileParallel
+# @brief Write the disassembly of [start, end) of the file at path to out,
+#        decoding it in jobs worker processes. The output is the same as
+#        disassembleFile without a count.
+#
+# @param[in] path     - The file to disassemble.
+# @param[in] jobs     - The number of worker processes.
+# @param[in] chunk    - The bytes per worker task, or None for the default.
+# @returns The number of instructions written.
+def disassembleFileParallel( path, start, end, base, mainstor, jobs, chunk, out ):
+   zaddr = base + start
+   n     = 0
+
+   out.write( "Dump of zOS assembler code from {:#x} to {:#x}\n".format( mainstor + zaddr,
+                                                                      mainstor + zaddr + end - start ) )
+
+   for status, lines in iter_parallel( path, start, end, mainstor + zaddr, zaddr, jobs, chunk ):
+      if status == "truncated":
+         out.write( "*** instruction runs past the end of the file ***\n" )
+
+      for line in lines:
+         out.write( line + "\n" )
+      n += len( lines )
+
+   return n
+
+def main( argv=None ):
+   parser = argparse.ArgumentParser( description="Disassemble zOS instructions from a raw file." )
+   parser.add_argument( "file", help="load module text or mainstor image" )
+   parser.add_argument( "--offset", type=lambda v: int( v, 0 ), default=0,
+                        help="file offset to start at (default 0)" )
+   parser.add_argument( "--length", type=lambda v: int( v, 0 ), default=None,
+                        help="number of bytes to disassemble (default to the end of the file)" )
+   parser.add_argument( "--base", type=lambda v: int( v, 0 ), default=0,
+                        help="zOS address of file offset 0 (default 0)" )
+   parser.add_argument( "--mainstor", type=lambda v: int( v, 0 ), default=0,
+                        help="native address of zOS address 0 (default 0)" )
+   parser.add_argument( "-c", "--count", type=int, default=None,
+                        help="stop after this many instructions" )
+   parser.add_argument( "-j", "--jobs", type=int, default=1,
+                        help="decode in this many processes, 0 for one per core (default 1)" )
+   parser.add_argument( "--chunk", type=lambda v: int( v, 0 ), default=None,
+                        help="bytes handed to each process at a time with --jobs" )
+   parser.add_argument( "--cfg", choices=( "text", "dot" ), default=None,
+                        help="follow the control flow from --offset and print the basic blocks" )
+   args = parser.parse_args( argv )
+
+   buf = mapFile( args.file )
+   end = len( buf )
+   if args.length != None:
+      end = min( end, args.offset + args.length )
+
+   try:
+      if args.cfg != None:
+         blocks = buildCFG( memoryview( buf ), [ args.offset ], args.mainstor + args.base, end )
+         fmt    = formatDot if args.cfg == "dot" else formatCFG
+
+         for line in fmt( blocks, args.base ):
+            sys.stdout.write( line + "\n" )
+
+         return 0
+
+      # A count is usually small, so it is not worth starting processes for.
+      if args.jobs != 1 and args.count == None:
+         disassembleFileParallel( args.file, args.offset, end, args.base, args.mainstor,
+                                  args.jobs or None, args.chunk, sys.stdout )
+      else:
+         disassembleFile( memoryview( buf ), args.offset, end, args.base,
+                          args.mainstor, args.count, sys.stdout )
+   except BrokenPipeError:
+      # The output was piped into something like head that has gone away.
+      sys.stderr.close( )
+
+   return 0
+
+if __name__ == "__main__":
+   sys.exit( main( ) )
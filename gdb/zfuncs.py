@@ -55,10 +55,8 @@ class zthread( gdb.Command ):
    [Current zOS thread is 1 (Thread 0x7ffbc4000000)]
    """
    
-   def __init__( self, arg ):
+   def __init__( self ):
       super( zthread, self ).__init__( "zthread", gdb.COMMAND_USER )
-      
-      gdb.execute( "set $_zthread={}".format( arg ) )
    
    def invoke( self, arg, from_tty ):
       sb = isSDMEnabled()
@@ -78,5 +76,13 @@ class zthread( gdb.Command ):
          gdb.execute( "set $_zthread={}".format( args[0] ) )
       else:
          raise gdb.GdbError( "Invalid argument '{}' specified.".format( args[0] ) )
-      
-zthread( 1 )
+
+# @def   zos_commands
+# @brief The commands of this module by name. They are registered by
+#        apis/lazy.py, or below when the module is sourced.
+zos_commands = { "zthread" : zthread }
+
+if __name__ == "__main__":
+   gdb.execute( "set $_zthread=1" )
+   for cmd in zos_commands.values( ):
+      cmd( )
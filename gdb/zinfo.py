@@ -32,6 +32,8 @@ import os
 import gdb
 
 from apis.common import *
+from apis.stream import zos_cache, zos_store
+from apis.prefetch import zos_prefetch
 
 # Add the current path to the system path so that the subsequent import will
 # find my external libraries.
@@ -90,8 +92,6 @@ class infosdm( gdb.Command ):
       # @question Are the SYSBLK.REGS for each thread. The comment in the lhe.h
       #           file says "Registers for each CPU". What does that mean?
 
-infosdm( )
-
 # @classs infozthreads
 # @brief  Display of the current SMD threads.
 class infozthreads( gdb.Command ):
@@ -138,8 +138,6 @@ class infozthreads( gdb.Command ):
       
       print(sdmMsg)
 
-infozthreads( )
-
 # @classs infozregisters
 # @brief  ???
 class infozregisters( gdb.Command ):
@@ -265,8 +263,6 @@ class infozregisters( gdb.Command ):
       
       print(sdmMsg)
 
-infozregisters( )
-
 # @classs infozmodules
 # @brief  ???
 class infozmodules( gdb.Command ):
@@ -290,8 +286,6 @@ class infozmodules( gdb.Command ):
       
       print(sdmMsg)
 
-infozmodules( )
-
 # @classs infozbreakpoints
 # @brief  ???
 class infozbreakpoints( gdb.Command ):
@@ -316,4 +310,73 @@ class infozbreakpoints( gdb.Command ):
       #print(sdmMsg)
       print("???NYI???")
 
-infozbreakpoints( )
+# @classs infozcache
+# @brief  Statistics for the decoded instruction cache used by zdisass.
+class infozcache( gdb.Command ):
+   """Display the decoded zOS instruction cache statistics.
+
+   Below the cache is the on disk store of decoded pages that is kept under
+   $XDG_CACHE_HOME/lzlabs and reused by later sessions. It can be turned
+   off for the session or emptied.
+
+   With prefetch on, every stop reads the memory around the PSW of each
+   active CPU (by default 512 bytes in front and 1024 from it) and decodes
+   it into the cache while gdb waits for the next command.
+  
+   Usage:
+
+   (gdb) info zcache
+   (gdb) info zcache reset
+   (gdb) info zcache store on|off|purge
+   (gdb) info zcache prefetch on|off [before [after]]
+   """
+   
+   def __init__( self ):
+      super( infozcache, self ).__init__( "info zcache", gdb.COMMAND_STATUS )
+   
+   def invoke( self, arg, from_tty ):
+      args  = gdb.string_to_argv( arg )
+      usage = "info zcache [reset|store on|off|purge|prefetch on|off [before [after]]]"
+      
+      if len( args ) == 1 and args[0] == "reset":
+         zos_cache.reset( )
+         zos_store.reset( )
+         zos_prefetch.reset( )
+      elif 2 <= len( args ) <= 4 and args[0] == "prefetch":
+         if args[1] not in ( "on", "off" ) or ( args[1] == "off" and len( args ) > 2 ):
+            raise gdb.GdbError( usage )
+         if len( args ) > 2:
+            zos_prefetch.before = int( args[2], 0 ) & ~1
+         if len( args ) > 3:
+            zos_prefetch.after  = int( args[3], 0 )
+         zos_prefetch.enable( args[1] == "on" )
+      elif len( args ) == 2 and args[0] == "store":
+         if args[1] == "on":
+            zos_store.enabled = True
+         elif args[1] == "off":
+            zos_store.enabled = False
+         elif args[1] == "purge":
+            zos_store.purge( )
+         else:
+            raise gdb.GdbError( usage )
+         zos_cache.clear( )
+      elif len( args ) != 0:
+         raise gdb.GdbError( usage )
+      
+      print("Decoded instruction cache: {}".format( zos_cache.stats( ) ))
+      print("Decoded page store: {}".format( zos_store.stats( ) ))
+      print("Stop prefetch: {}".format( zos_prefetch.stats( ) ))
+
+# @def   zos_commands
+# @brief The commands of this module by name. They are registered by
+#        apis/lazy.py, or below when the module is sourced.
+zos_commands = { "info sdm"          : infosdm,
+                 "info zthreads"     : infozthreads,
+                 "info zregisters"   : infozregisters,
+                 "info zmodules"     : infozmodules,
+                 "info zbreakpoints" : infozbreakpoints,
+                 "info zcache"       : infozcache }
+
+if __name__ == "__main__":
+   for cmd in zos_commands.values( ):
+      cmd( )
@@ -120,5 +120,12 @@ class zmemory( gdb.Command ):
          print("*** Memory Error detected ***\n{}".format( e ))
       
       return
-   
-zmemory( )
+
+# @def   zos_commands
+# @brief The commands of this module by name. They are registered by
+#        apis/lazy.py, or below when the module is sourced.
+zos_commands = { "zmemory" : zmemory }
+
+if __name__ == "__main__":
+   for cmd in zos_commands.values( ):
+      cmd( )
@@ -0,0 +1,98 @@
+# @file	  zprofile.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  SDM environment for the GDB debugger.
+#
+# @section Copyright
+#
+#   Copyright Notice:
+#
+#   Copyright (C) 2019 LzLabs GmbH
+#   All Rights Reserved.
+#
+#   This product and associated documentation includes confidential,
+#   proprietary and trade secret information and code.  No part of
+#   this product or associated documentation may be modified,
+#   distributed, or copied in any form except as expressly permitted
+#   by the license agreement pertaining to this product.
+#
+# @section License
+#
+#   This file is Object Code Only and is NOT to be distributed in source form.
+#
+# @section Description
+#
+#   The zprofile command turns the gdb call instrumentation in
+#   apis/instrument.py on and off and reports what it counted.
+#
+# @section Source
+#
+#   Information in this file is original.
+#
+import sys
+import os
+import gdb
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+if sys.path[0] != '/opt/lzlabs/debug/gdb':
+   sys.path.insert( 0, '/opt/lzlabs/debug/gdb' )
+
+from apis.instrument import *
+from apis.lazy import importCommands
+
+# @classs zprofile
+# @brief  Control the per command gdb call counters.
+class zprofile( gdb.Command ):
+   """Count and time the gdb calls made by the SDM commands.
+
+   While profiling is on every gdb.execute, gdb.parse_and_eval,
+   gdb.lookup_type and inferior memory read is counted and timed against
+   the command that made it and the line it was made from. show lists, per
+   command, the calls, total time, time spent in Python outside of those gdb
+   calls and the count / seconds of each kind of call, followed by the N
+   (default 10) most expensive call sites.
+
+   Usage:
+
+   (gdb) zprofile on
+   (gdb) info zregisters
+   (gdb) zprofile show [N]
+   (gdb) zprofile reset
+   (gdb) zprofile off
+   """
+
+   def __init__( self ):
+      super( zprofile, self ).__init__( "zprofile", gdb.COMMAND_USER )
+
+   def invoke( self, arg, from_tty ):
+      args = gdb.string_to_argv( arg )
+
+      if len( args ) == 0:
+         args = [ "show" ]
+
+      if args[0] == "on":
+         # A command is timed through its class, so define the classes of
+         # the commands sdm.py has not loaded yet.
+         importCommands( )
+         zos_profiler.on( )
+      elif args[0] == "off":
+         zos_profiler.off( )
+      elif args[0] == "reset":
+         zos_profiler.reset( )
+      elif args[0] == "show":
+         top = int( args[1] ) if len( args ) > 1 else 10
+
+         print("Profiling is {}".format( "on" if zos_profiler.enabled else "off" ))
+         for line in zos_profiler.report( top ):
+            print(line)
+      else:
+         raise gdb.GdbError( "zprofile show [N]|reset|on|off" )
+
+# @def   zos_commands
+# @brief The commands of this module by name. They are registered by
+#        apis/lazy.py, or below when the module is sourced.
+zos_commands = { "zprofile" : zprofile }
+
+if __name__ == "__main__":
+   for cmd in zos_commands.values( ):
+      cmd( )
@@ -0,0 +1,235 @@
+# @file	  zscan.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  SDM environment for the GDB debugger.
+#
+# @section Copyright
+#
+#   Copyright Notice:
+#
+#   Copyright (C) 2019 LzLabs GmbH
+#   All Rights Reserved.
+#
+#   This product and associated documentation includes confidential,
+#   proprietary and trade secret information and code.  No part of
+#   this product or associated documentation may be modified,
+#   distributed, or copied in any form except as expressly permitted
+#   by the license agreement pertaining to this product.
+#
+# @section License
+#
+#   This file is Object Code Only and is NOT to be distributed in source form.
+#
+# @section Description
+#
+#   Commands that look at whole regions of zOS code at once. They use the
+#   boundary scanner in apis/scanner.py rather than decoding and formatting
+#   every instruction.
+#
+# @section Source
+#
+#   Information in this file is original.
+#
+import sys
+import os
+import csv
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+if sys.path[0] != '/opt/lzlabs/debug/gdb':
+   sys.path.insert( 0, '/opt/lzlabs/debug/gdb' )
+
+from apis.common import *
+from apis.stream import *
+from apis.scanner import countOpcodes
+from apis.search import zpattern
+from apis.instructions import getInst
+from apis.bswapreloc import *
+
+# @fn    parseRegion
+# @brief Parse "<symbol|address>,<length>" into a native address and length.
+def parseRegion( arg, usage ):
+   args = arg.split( "," )
+   if len( args ) != 2:
+      raise gdb.GdbError( usage )
+
+   addr = gdb.execute( "p/x {}".format( args[0].strip( ) ), to_string=True ) \
+             .split( "=" )[1] \
+             .strip( )
+
+   return ( int( addr, 16 ), int( args[1].strip( ), 0 ) )
+
+# @fn    opcodeMix
+# @brief Sum the opcode counts by Mnemonic and by format.
+#
+# @param[in] counts - Mnemonic key : count, as returned by countOpcodes.
+# @returns ( bymnemonic, byformat ) lists of ( name, format, count ) and
+#          ( format, count ) sorted by count, highest first.
+def opcodeMix( counts ):
+   byname = { }
+   byfmt  = { }
+
+   for key, n in counts.items( ):
+      if key < 0:
+         continue
+
+      inst = getInst( key )
+      fmt  = inst.func.__name__
+      ent  = ( inst.name, fmt )
+
+      byname[ent] = byname.get( ent, 0 ) + n
+      byfmt[fmt]  = byfmt.get( fmt, 0 ) + n
+
+   return ( sorted( ( ( k[0], k[1], n ) for k, n in byname.items( ) ),
+                    key=lambda e: ( -e[2], e[0] ) ),
+            sorted( byfmt.items( ), key=lambda e: ( -e[1], e[0] ) ) )
+
+# @classs zopstats
+# @brief  Static instruction mix of a region.
+class zopstats( gdb.Command ):
+   """Count the instructions in a region by Mnemonic and by format.
+
+   The region is scanned for instruction boundaries without formatting any
+   instruction. Halfwords that are not a known opcode (literal pools, data)
+   are counted as unknown and skipped. With -o the counts are also written
+   to a CSV file with the columns kind, name, format, count and percent.
+
+   Usage:
+
+   (gdb) zopstats <symbol|address>,<length> [-o file.csv]
+   """
+
+   def __init__( self ):
+      super( zopstats, self ).__init__( "zopstats", gdb.COMMAND_USER )
+
+   def invoke( self, arg, from_tty ):
+      isSDMEnabled( )
+
+      usage = "zopstats <symbol|address>,<length> [-o file.csv]"
+      path  = None
+
+      args = arg.split( )
+      if len( args ) == 3 and args[1] == "-o":
+         path = args[2]
+      elif len( args ) != 1:
+         raise gdb.GdbError( usage )
+
+      saddr, size = parseRegion( args[0], usage )
+      counts      = { }
+
+      try:
+         for iaddr, buf, offs, keys in iter_scan( saddr, size ):
+            countOpcodes( keys, counts )
+      except gdb.MemoryError:
+         print("*** Memory Error detected ***")
+
+      unknown = counts.pop( -1, 0 )
+      total   = sum( counts.values( ) )
+      byname, byfmt = opcodeMix( counts )
+
+      print("Opcode mix of {:#x} to {:#x} (zOS {:08X}): {} instructions, "
+            "{} unknown halfwords".format( saddr, saddr + size, saddr - MainstorValue( ),
+                                          total, unknown ))
+
+      def pct( n ):
+         return 100.0 * n / total if total else 0.0
+
+      print("")
+      print("{:>10} {:>7}  {:8} {}".format( "count", "%", "mnemonic", "format" ))
+      for name, fmt, n in byname:
+         print("{:10} {:6.2f}%  {:8} {}".format( n, pct( n ), name, fmt ))
+
+      print("")
+      print("{:>10} {:>7}  {}".format( "count", "%", "format" ))
+      for fmt, n in byfmt:
+         print("{:10} {:6.2f}%  {}".format( n, pct( n ), fmt ))
+
+      if path != None:
+         with open( os.path.expanduser( path ), "w", newline="" ) as f:
+            out = csv.writer( f, lineterminator="\n" )
+            out.writerow( ( "kind", "name", "format", "count", "percent" ) )
+
+            for name, fmt, n in byname:
+               out.writerow( ( "mnemonic", name, fmt, n, "{:.4f}".format( pct( n ) ) ) )
+            for fmt, n in byfmt:
+               out.writerow( ( "format", fmt, fmt, n, "{:.4f}".format( pct( n ) ) ) )
+            out.writerow( ( "unknown", "", "", unknown, "" ) )
+
+         print("Written to {}".format( path ))
+
+# @classs zgrep
+# @brief  Search a region for a sequence of instructions.
+class zgrep( gdb.Command ):
+   """Search a region for a sequence of instructions.
+
+   The pattern is one or more instructions separated by ';', each a Mnemonic
+   and optionally its operands as zdisass prints them. '*' and '?' are
+   wildcards within the operands, '*' alone as the Mnemonic matches any
+   instruction and the R in front of a register number may be left out.
+   An operand with no index register may be written without the comma, so
+   *(13) matches 16(,R13). Every halfword of the region is tried, so
+   matches inside data are reported too. Matches are printed as they are
+   found, with their native and zOS addresses; -m stops after N matches.
+
+   Usage:
+
+   (gdb) zgrep [-m N] <symbol|address>,<length> <pattern>
+
+   Example:
+
+   (gdb) zgrep regs->mainstor+0x20000,0x10000 SVC *
+   (gdb) zgrep regs->mainstor+0x20000,0x10000 LA 1,*(13) ; BALR 14,15
+   """
+
+   def __init__( self ):
+      super( zgrep, self ).__init__( "zgrep", gdb.COMMAND_USER )
+
+   def invoke( self, arg, from_tty ):
+      isSDMEnabled( )
+
+      usage = "zgrep [-m N] <symbol|address>,<length> <pattern>"
+      limit = None
+
+      args = arg.split( None, 1 )
+      if len( args ) == 2 and args[0] == "-m":
+         args = args[1].split( None, 1 )
+         if len( args ) != 2:
+            raise gdb.GdbError( usage )
+         limit = int( args[0], 0 )
+         args  = args[1].split( None, 1 )
+
+      if len( args ) != 2:
+         raise gdb.GdbError( usage )
+
+      try:
+         pattern = zpattern( args[1] )
+      except ValueError as e:
+         raise gdb.GdbError( str( e ) )
+
+      saddr, size = parseRegion( args[0], usage )
+      mainstor    = MainstorValue( )
+      found       = 0
+
+      try:
+         for iaddr, insts in iter_search( saddr, size, pattern ):
+            for rv in insts:
+               print(formatInst( rv, rv._addr - mainstor, rv._addr - saddr ))
+            if len( pattern.steps ) > 1:
+               print("")
+
+            found += 1
+            if found == limit:
+               break
+      except gdb.MemoryError:
+         print("*** Memory Error detected ***")
+
+      print("{} match{} for '{}'".format( found, "" if found == 1 else "es", pattern.text ))
+
+# @def   zos_commands
+# @brief The commands of this module by name. They are registered by
+#        apis/lazy.py, or below when the module is sourced.
+zos_commands = { "zopstats" : zopstats,
+                 "zgrep"    : zgrep }
+
+if __name__ == "__main__":
+   for cmd in zos_commands.values( ):
+      cmd( )
@@ -0,0 +1,398 @@
+# @file	  ztrace.py
+# @author Garfield A. Lewis <garfield.lewis@lzlabs.com>
+# @brief  SDM environment for the GDB debugger.
+#
+# @section Copyright
+#
+#   Copyright Notice:
+#
+#   Copyright (C) 2019 LzLabs GmbH
+#   All Rights Reserved.
+#
+#   This product and associated documentation includes confidential,
+#   proprietary and trade secret information and code.  No part of
+#   this product or associated documentation may be modified,
+#   distributed, or copied in any form except as expressly permitted
+#   by the license agreement pertaining to this product.
+#
+# @section License
+#
+#   This file is Object Code Only and is NOT to be distributed in source form.
+#
+# @section Description
+#
+#   Commands that record what the emulator executes while the inferior runs:
+#   every instruction through the internal breakpoint of apis/trace.py, into
+#   a ring buffer or the coverage bitmaps of apis/coverage.py, or a sample
+#   of them by interrupting it with apis/sampler.py.
+#
+# @section Source
+#
+#   Information in this file is original.
+#
+import sys
+import os
+
+# Add the current path to the system path so that the subsequent import will
+# find my external libraries.
+if sys.path[0] != '/opt/lzlabs/debug/gdb':
+   sys.path.insert( 0, '/opt/lzlabs/debug/gdb' )
+
+from apis.common import *
+from apis.stream import *
+from apis.trace import zos_trace, zos_coverage, zos_coverage_trace
+from apis.sampler import zos_sampler
+from apis.bswapreloc import *
+
+# @classs ztrace
+# @brief  Record the history of PSW addresses.
+class ztrace( gdb.Command ):
+   """Record the zOS instruction addresses executed by the emulator.
+
+   start puts an internal breakpoint at the location where the emulator
+   dispatches each instruction and keeps the last size (default 1048576)
+   values of the expression (default regs->psw.ia.F) evaluated there, in a
+   ring buffer. The location and expression are remembered for the next
+   start. The inferior is resumed after each hit without any output, but
+   every hit still stops the emulator thread, so it runs much slower while
+   recording.
+
+   show lists the last N (default 20) addresses, oldest first, disassembled,
+   followed by the number of hits, the time spent recording each hit and
+   the hits per second, which tell how long it can be left on.
+
+   Usage:
+
+   (gdb) ztrace start [-n size] [-e expression] [location]
+   (gdb) ztrace stop
+   (gdb) ztrace show [N]
+   (gdb) ztrace reset
+   """
+
+   def __init__( self ):
+      super( ztrace, self ).__init__( "ztrace", gdb.COMMAND_USER )
+
+   def invoke( self, arg, from_tty ):
+      usage = "ztrace start [-n size] [-e expression] [location]|stop|show [N]|reset"
+
+      args = arg.split( None, 1 )
+      if len( args ) == 0:
+         args = [ "show" ]
+
+      cmd  = args[0]
+      rest = args[1].strip( ) if len( args ) > 1 else ""
+
+      if cmd == "start":
+         isSDMEnabled( )
+
+         opts = rest.split( None, 2 )
+         while len( opts ) >= 2 and opts[0] in ( "-n", "-e" ):
+            if opts[0] == "-n":
+               zos_trace.resize( int( opts[1], 0 ) )
+            else:
+               zos_trace.expr = opts[1]
+            opts = opts[2].split( None, 2 ) if len( opts ) > 2 else [ ]
+
+         spec = " ".join( opts ) or zos_trace.spec
+         if spec == None or spec.startswith( "-" ):
+            raise gdb.GdbError( usage )
+
+         zos_trace.start( spec )
+         print("Recording {} at {}".format( zos_trace.expr, spec ))
+      elif cmd == "stop":
+         zos_trace.stop( )
+         print(zos_trace.stats( ))
+      elif cmd == "reset":
+         zos_trace.reset( )
+      elif cmd == "show":
+         count = int( rest, 0 ) if rest else 20
+         addrs = zos_trace.ring.last( count )
+
+         if addrs:
+            isSDMEnabled( )
+
+            # Every distinct address is read and decoded once.
+            mainstor = MainstorValue( )
+            insts    = decodeAddresses( [ mainstor + zaddr for zaddr in addrs ] )
+
+            for i, zaddr in enumerate( addrs ):
+               rv = insts[mainstor + zaddr]
+               if rv == None:
+                  print("{:>8} {:#x} {:08X}: ?".format( i - len( addrs ), mainstor + zaddr, zaddr ))
+               else:
+                  print("{:>8} {:#x} {:08X}: {:14} {:6} {}".format( i - len( addrs ), rv._addr, zaddr,
+                                                                   rv._mac, rv._name, rv._asm ))
+
+         print(zos_trace.stats( ))
+      else:
+         raise gdb.GdbError( usage )
+
+# @classs zprof
+# @brief  Statistical profile of the zOS code being run.
+class zprof( gdb.Command ):
+   """Sample where emulated zOS code spends its time.
+
+   The program is resumed and interrupted hz (default 100) times a second
+   for the given number of seconds. At each interrupt the PSW address,
+   program name and mainstor of every CPU are read from sysblk->regs[] in
+   one read and counted. Sampling stops early if the program stops at a
+   breakpoint, gets a signal or exits. The samples of several runs add up
+   until reset.
+
+   The samples per program are listed, then the N (default 20) most
+   sampled addresses with their disassembly and zlabel. -o writes every
+   sampled address as a collapsed stack (program;routine;instruction count)
+   for flamegraph.pl. This is not zprofile, which times the gdb calls of
+   the plugin's own commands.
+
+   Usage:
+
+   (gdb) zprof [-n N] [-o file] <seconds> [hz]
+   (gdb) zprof show [-n N] [-o file]
+   (gdb) zprof reset
+   """
+
+   def __init__( self ):
+      super( zprof, self ).__init__( "zprof", gdb.COMMAND_USER )
+
+   def invoke( self, arg, from_tty ):
+      usage = "zprof [-n N] [-o file] <seconds> [hz]|show [-n N] [-o file]|reset"
+      top   = 20
+      path  = None
+
+      args = gdb.string_to_argv( arg )
+      if args == [ "reset" ]:
+         zos_sampler.reset( )
+         return
+
+      show = len( args ) > 0 and args[0] == "show"
+      if show:
+         args.pop( 0 )
+
+      while len( args ) >= 2 and args[0] in ( "-n", "-o" ):
+         if args[0] == "-n":
+            top = int( args[1], 0 )
+         else:
+            path = os.path.expanduser( args[1] )
+         args = args[2:]
+
+      if show and args:
+         raise gdb.GdbError( usage )
+
+      if not show:
+         if len( args ) not in ( 1, 2 ):
+            raise gdb.GdbError( usage )
+
+         seconds = float( args[0] )
+         hz      = float( args[1] ) if len( args ) > 1 else 100.0
+         if seconds <= 0 or hz <= 0:
+            raise gdb.GdbError( usage )
+
+         isSDMEnabled( )
+         zos_sampler.run( seconds, hz )
+
+      self.report( top, path )
+
+   # @fn    report
+   # @brief Print the samples per program and the top addresses, and write
+   #        the collapsed stacks to path.
+   def report( self, top, path ):
+      total = zos_sampler.hits
+
+      def pct( n ):
+         return 100.0 * n / total if total else 0.0
+
+      print(zos_sampler.stats( ) + ( ", {}".format( zos_sampler.reason ) if zos_sampler.reason else "" ))
+      if total == 0:
+         return
+
+      print("")
+      print("{:>8} {:>7}  {}".format( "count", "%", "program" ))
+      for prog, n in zos_sampler.programs( ):
+         print("{:8} {:6.2f}%  {}".format( n, pct( n ), prog ))
+
+      # Every sampled address is decoded when the stacks are written.
+      best  = zos_sampler.top( top )
+      which = zos_sampler.top( len( zos_sampler.counts ) ) if path != None else best
+      insts = decodeAddresses( [ ms + ia for n, prog, ia, ms in which ] )
+
+      print("")
+      print("{:>8} {:>7}  {:8} {}".format( "count", "%", "program", "instruction" ))
+      for n, prog, ia, ms in best:
+         rv    = insts[ms + ia]
+         label = zos_labels.lookup( ia )
+         text  = "{:#x} {:08X}: ".format( ms + ia, ia )
+         text += "?" if rv == None else "{:14} {:6} {}".format( rv._mac, rv._name, rv._asm )
+         if label != None:
+            text += "  # {}+{:#x}".format( *label )
+         print("{:8} {:6.2f}%  {:8} {}".format( n, pct( n ), prog, text ))
+
+      if path != None:
+         mainstor = dict( ( ( prog, ia ), ms ) for n, prog, ia, ms in which )
+
+         def frames( prog, ia ):
+            rv    = insts[mainstor[( prog, ia )] + ia]
+            label = zos_labels.lookup( ia )
+
+            return ( [ label[0] ] if label != None else [ ] ) + \
+                   [ "{:08X} {}".format( ia, rv._name if rv != None else "?" ) ]
+
+         with open( path, "w" ) as f:
+            for line in zos_sampler.collapsed( frames ):
+               f.write( line + "\n" )
+
+         print("Collapsed stacks written to {}".format( path ))
+
+# @classs zcov
+# @brief  Executed instruction coverage of zOS programs.
+class zcov( gdb.Command ):
+   """Record which instructions of zOS programs are executed.
+
+   add names a program and its range, which gets a bitmap with one bit per
+   halfword. start puts an internal breakpoint at the emulator's dispatch
+   point, as ztrace start does and at the same location unless one is
+   given, and sets the bit of every instruction executed in a program.
+   Addresses outside every program are only counted.
+
+   report splits each program, or the one named, into runs of executed and
+   not executed code and lists them with up to N (default 8, 0 for all)
+   disassembled lines each. save writes the bitmaps to a file and load
+   merges a saved file into the current bitmaps, so that the coverage of
+   several runs adds up. clear empties the bitmaps.
+
+   Usage:
+
+   (gdb) zcov add <name> <symbol|address>,<length>
+   (gdb) zcov remove <name>
+   (gdb) zcov start [-e expression] [location]
+   (gdb) zcov stop
+   (gdb) zcov report [-n N] [name]
+   (gdb) zcov save <file>
+   (gdb) zcov load <file>
+   (gdb) zcov clear
+   """
+
+   def __init__( self ):
+      super( zcov, self ).__init__( "zcov", gdb.COMMAND_USER )
+
+   def invoke( self, arg, from_tty ):
+      usage = "zcov add|remove|start|stop|report|save|load|clear"
+
+      args = arg.split( None, 1 )
+      if len( args ) == 0:
+         raise gdb.GdbError( usage )
+
+      cmd  = args[0]
+      rest = args[1].strip( ) if len( args ) > 1 else ""
+
+      if cmd == "add":
+         fields = rest.split( None, 1 )
+         where  = fields[1].split( "," ) if len( fields ) == 2 else [ ]
+         if len( where ) != 2:
+            raise gdb.GdbError( "zcov add <name> <symbol|address>,<length>" )
+
+         isSDMEnabled( )
+         saddr = int( gdb.execute( "p/x {}".format( where[0].strip( ) ), to_string=True ) \
+                         .split( "=" )[1] \
+                         .strip( ), 16 )
+         size  = int( where[1].strip( ), 0 )
+         zaddr = saddr - MainstorValue( )
+         if zaddr & 1:
+            raise gdb.GdbError( "{:08X} is not halfword aligned".format( zaddr ) )
+
+         zos_coverage.add( fields[0], zaddr, size )
+      elif cmd == "remove":
+         zos_coverage.remove( rest )
+      elif cmd == "start":
+         isSDMEnabled( )
+
+         opts = rest.split( None, 2 )
+         if len( opts ) >= 2 and opts[0] == "-e":
+            zos_coverage_trace.expr = opts[1]
+            opts = opts[2:]
+
+         spec = " ".join( opts ) or zos_coverage_trace.spec or zos_trace.spec
+         if spec == None or spec.startswith( "-" ):
+            raise gdb.GdbError( "zcov start [-e expression] [location]" )
+         if not zos_coverage.programs:
+            raise gdb.GdbError( "No programs to cover, see zcov add." )
+
+         zos_coverage_trace.start( spec )
+         print("Covering {} programs at {}".format( len( zos_coverage.programs ), spec ))
+      elif cmd == "stop":
+         zos_coverage_trace.stop( )
+         print("{}, {} outside the programs".format( zos_coverage_trace.stats( ), zos_coverage.outside ))
+      elif cmd == "clear":
+         zos_coverage.clear( )
+         zos_coverage_trace.reset( )
+      elif cmd == "save":
+         zos_coverage.save( os.path.expanduser( rest ) )
+         print("{} programs saved to {}".format( len( zos_coverage.programs ), rest ))
+      elif cmd == "load":
+         try:
+            merged, added, skipped = zos_coverage.load( os.path.expanduser( rest ) )
+         except ( OSError, ValueError ) as e:
+            raise gdb.GdbError( str( e ) )
+
+         print("{} programs merged, {} added".format( len( merged ), len( added ) ))
+         for name in skipped:
+            print("{} skipped: its range differs from the one covered".format( name ))
+      elif cmd == "report":
+         lines = 8
+         opts  = rest.split( )
+         if len( opts ) >= 2 and opts[0] == "-n":
+            lines = int( opts[1], 0 )
+            opts  = opts[2:]
+
+         isSDMEnabled( )
+         for prog in zos_coverage.ordered:
+            if not opts or prog.name in opts:
+               self.report( prog, lines, MainstorValue( ) )
+      else:
+         raise gdb.GdbError( usage )
+
+   # @fn    report
+   # @brief Print the covered and uncovered runs of a program.
+   def report( self, prog, lines, mainstor ):
+      size   = prog.end - prog.start
+      native = mainstor + prog.start
+
+      try:
+         buf = readInstructionStream( native, size )
+      except gdb.MemoryError:
+         print("{} {:08X}-{:08X}: *** Memory Error detected ***".format( prog.name, prog.start, prog.end ))
+         return
+
+      runs        = prog.runs( buf )
+      insts, used = prog.stats( buf )
+
+      print("{} {:08X}-{:08X}: {} instructions executed, {} of {} bytes ({:.1f}%)".format(
+               prog.name, prog.start, prog.end, insts, used, size, 100.0 * used / size if size else 0.0 ))
+
+      for covered, off, end, n in runs:
+         if covered:
+            print("  covered   {:08X}-{:08X} ({} instructions)".format( prog.start + off, prog.start + end, n ))
+         else:
+            print("  uncovered {:08X}-{:08X} ({} bytes)".format( prog.start + off, prog.start + end, end - off ))
+
+         shown = 0
+         try:
+            for rv in iter_decode( buf, off, end, native + off, zos_cache ):
+               if lines and shown == lines:
+                  print("    ...")
+                  break
+               print("    " + formatInst( rv, rv._addr - mainstor, rv._addr - native ))
+               shown += 1
+         except IndexError:
+            pass
+
+# @def   zos_commands
+# @brief The commands of this module by name. They are registered by
+#        apis/lazy.py, or below when the module is sourced.
+zos_commands = { "ztrace" : ztrace,
+                 "zprof"  : zprof,
+                 "zcov"   : zcov }
+
+if __name__ == "__main__":
+   for cmd in zos_commands.values( ):
+      cmd( )
@@ -0,0 +1,142 @@
+# @file   bench_decoder.py
+# @brief  Decode throughput and allocations for every instruction format.
+#
+# Every entry of zos_2byte_mnemonics, zos_3byte_mnemonics and
+# zos_4byte_mnemonics is encoded and the encodings are grouped by instruction
+# format. Each format's stream is then decoded two ways:
+#
+#   decoder - iter_decode straight over the bytes (apis/disasm.py)
+#   zdisass - the zdisass command, loaded against test/stubgdb/gdb.py which
+#             serves the same bytes as inferior memory, with the decoded
+#             page store off so that every run decodes and nothing is
+#             written to $XDG_CACHE_HOME
+#
+# For each format it reports instructions per second and the bytes and
+# memory blocks still allocated per decoded instruction (tracemalloc, with
+# the decoded records kept alive). No gdb or SDM is required:
+#
+#   python3 test/bench_decoder.py [instructions per format] [format ...]
+#
+import sys
+import os
+import io
+import time
+import random
+import tracemalloc
+import contextlib
+
+_test = os.path.dirname( os.path.abspath( __file__ ) )
+
+sys.path.insert( 0, os.path.join( _test, "..", "gdb" ) )
+sys.path.insert( 0, os.path.join( _test, "..", "gdb", "apis" ) )
+sys.path.insert( 0, os.path.join( _test, "stubgdb" ) )
+
+import gdb
+
+from instructions import *
+from disasm import *
+from bench_dispatch import encode
+
+# Where the stub puts zOS address 0.
+MAINSTOR = 0x7ffbc1a45000
+
+# @fn    buildStreams
+# @brief Encode every table entry once with random operands, grouped by format.
+#
+# @returns { format name : [ instruction bytes, ... ] }
+def buildStreams( ):
+   rnd     = random.Random( 370 )
+   streams = { }
+
+   for table in ( zos_2byte_mnemonics, zos_3byte_mnemonics, zos_4byte_mnemonics ):
+      for mn, ii in table.items( ):
+         b  = bytearray( encode( mn ) )
+         sz = ii.func.size
+
+         # Randomise the operand bytes that are not part of the opcode.
+         for i in range( 1, sz ):
+            save = b[i]
+            b[i] = rnd.randrange( 256 )
+            if lookupInst( b, 0 ) != ii.index:
+               b[i] = save
+
+         streams.setdefault( ii.func.__name__, [ ] ).append( bytes( b[:sz] ) )
+
+   return streams
+
+# @fn    repeatStream
+# @brief Repeat the encodings of one format to give at least n instructions.
+def repeatStream( insts, n ):
+   reps = ( n + len( insts ) - 1 ) // len( insts )
+
+   return b"".join( insts ) * reps, reps * len( insts )
+
+def timeDecoder( buf ):
+   t = time.perf_counter( )
+   for rv in iter_decode( buf ):
+      pass
+   return time.perf_counter( ) - t
+
+def timeZdisass( buf ):
+   from apis.lazy import loadCommands
+   from apis.stream import zos_cache, zos_store
+
+   loadCommands( ( "zdisass", ) )
+   zos_store.enabled = False
+
+   gdb.load( buf, MAINSTOR )
+   zos_cache.clear( )
+
+   with contextlib.redirect_stdout( io.StringIO( ) ):
+      t = time.perf_counter( )
+      gdb.execute( "zdisass {:#x},{}".format( MAINSTOR, len( buf ) ) )
+      return time.perf_counter( ) - t
+
+# @fn    allocations
+# @brief The bytes and blocks allocated per instruction by decoding buf,
+#        keeping the decoded records.
+def allocations( buf, n ):
+   tracemalloc.start( )
+   before = tracemalloc.take_snapshot( )
+   keep   = list( iter_decode( buf ) )
+   after  = tracemalloc.take_snapshot( )
+   tracemalloc.stop( )
+
+   diff = after.compare_to( before, "filename" )
+
+   return ( sum( d.size_diff for d in diff ) / n,
+            sum( d.count_diff for d in diff ) / n )
+
+def main( ):
+   n     = int( sys.argv[1] ) if len( sys.argv ) > 1 else 20000
+   names = sys.argv[2:]
+
+   streams = buildStreams( )
+   if names:
+      streams = { k : v for k, v in streams.items( ) if k in names }
+
+   print( "{:10} {:>7} {:>12} {:>12} {:>10} {:>11}".format( "format", "entries", "decoder i/s",
+                                                           "zdisass i/s", "bytes/inst",
+                                                           "blocks/inst" ) )
+
+   total = [ 0, 0.0, 0.0 ]
+   for name in sorted( streams ):
+      buf, count = repeatStream( streams[name], n )
+
+      dec = min( timeDecoder( buf ) for i in range( 3 ) )
+      zds = min( timeZdisass( buf ) for i in range( 3 ) )
+      nb, nk = allocations( buf, count )
+
+      total[0] += count
+      total[1] += dec
+      total[2] += zds
+
+      print( "{:10} {:7} {:12.0f} {:12.0f} {:10.1f} {:11.2f}".format( name, len( streams[name] ),
+                                                                    count / dec, count / zds,
+                                                                    nb, nk ) )
+
+   print( "{:10} {:7} {:12.0f} {:12.0f}".format( "all", sum( len( v ) for v in streams.values( ) ),
+                                                total[0] / total[1], total[0] / total[2] ) )
+
+if __name__ == "__main__":
+   main( )
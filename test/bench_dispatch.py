@@ -0,0 +1,99 @@
+# @file   bench_dispatch.py
+# @brief  Microbenchmark of the per instruction opcode dispatch cost.
+#
+# Compares the original if-chain plus getInst dictionary probing against the
+# zos_dispatch first byte table over every entry of the instruction tables.
+# No gdb is required:
+#
+#   python3 test/bench_dispatch.py [rounds]
+#
+import sys
+import os
+import timeit
+
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath( __file__ ) ),
+                                  "..", "gdb", "apis" ) )
+
+from instructions import *
+
+# The dispatch zdisass used before the zos_dispatch table, kept here as the
+# baseline to measure against.
+# The tables as the plain dictionaries the if-chain used to probe.
+old2byte = dict( zos_2byte_mnemonics )
+old3byte = dict( zos_3byte_mnemonics )
+old4byte = dict( zos_4byte_mnemonics )
+
+def oldLookup( buf, off ):
+   im = buf[off]
+
+   if ( im == 0xa5 ) or ( im == 0xa7 ) or ( im == 0xc0 ) or ( im == 0xc2 ) or \
+      ( im == 0xc4 ) or ( im == 0xc6 ) or ( im == 0xc8 ):
+      im = ( ( im << 4 ) | ( buf[off + 1] & 0x0f ) )
+   elif ( im == 0x01 ) or ( im == 0xb2 ) or ( im == 0xb3 ) or \
+        ( im == 0xb9 ) or ( im == 0xe5 ):
+      im = ( ( im << 8 ) | buf[off + 1] )
+   elif ( im == 0xe3 ) or ( im == 0xeb ) or ( im == 0xec ) or ( im == 0xed ):
+      im = ( ( im << 8 ) | buf[off + 5] )
+
+   inst = zos_unknown
+
+   if im in old2byte:
+      inst = old2byte.get( im )
+   elif im in old3byte:
+      inst = old3byte.get( im )
+   elif im in old4byte:
+      inst = old4byte.get( im )
+
+   return inst
+
+# @fn    encode
+# @brief Build a 6 byte instruction image for the given Mnemonic key.
+def encode( mn ):
+   b = bytearray( 6 )
+
+   if mn < 0x100:
+      b[0] = mn
+   elif ( mn >> 4 ) in ( 0xa5, 0xa7, 0xc0, 0xc2, 0xc4, 0xc6, 0xc8 ):
+      b[0] = mn >> 4
+      b[1] = mn & 0x0f
+   elif ( mn >> 8 ) in ( 0xe3, 0xeb, 0xec, 0xed ):
+      b[0] = mn >> 8
+      b[5] = mn & 0xff
+   else:
+      b[0] = mn >> 8
+      b[1] = mn & 0xff
+
+   return bytes( b )
+
+def main( ):
+   rounds = int( sys.argv[1] ) if len( sys.argv ) > 1 else 200
+
+   keys = list( zos_2byte_mnemonics ) + \
+          list( zos_3byte_mnemonics ) + \
+          list( zos_4byte_mnemonics )
+   buf  = memoryview( b"".join( encode( mn ) for mn in keys ) )
+   offs = range( 0, len( buf ), 6 )
+
+   for off in offs:
+      if oldLookup( buf, off ).index != lookupInst( buf, off ):
+         raise SystemExit( "mismatch at offset {}".format( off ) )
+
+   def runOld( ):
+      for off in offs:
+         oldLookup( buf, off )
+
+   def runNew( ):
+      for off in offs:
+         lookupInst( buf, off )
+
+   n   = rounds * len( keys )
+   old = min( timeit.repeat( runOld, number=rounds, repeat=5 ) ) / n
+   new = min( timeit.repeat( runNew, number=rounds, repeat=5 ) ) / n
+
+   print( "entries   : {}".format( len( keys ) ) )
+   print( "if-chain  : {:8.1f} ns/inst".format( old * 1e9 ) )
+   print( "dispatch  : {:8.1f} ns/inst".format( new * 1e9 ) )
+   print( "speedup   : {:8.2f}x".format( old / new ) )
+
+if __name__ == "__main__":
+   main( )
@@ -0,0 +1,76 @@
+# @file   bench_scanner.py
+# @brief  Instruction boundary scanning: NumPy, plain loop and full decode.
+#
+# Builds a stream of random valid instructions and finds its instruction
+# starts three ways: scanBoundaries with NumPy, scanBoundaries without it and
+# iter_decode. The three results are checked to be the same. No gdb is
+# required:
+#
+#   python3 test/bench_scanner.py [bytes]
+#
+import sys
+import os
+import time
+import random
+
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath( __file__ ) ),
+                                  "..", "gdb", "apis" ) )
+
+from disasm import *
+from scanner import *
+from bench_dispatch import encode
+
+# @fn    buildStream
+# @brief Random instructions from the tables with random operands, n bytes.
+def buildStream( n ):
+   rnd  = random.Random( 15 )
+   keys = list( zos_mnemonics )
+   out  = bytearray( )
+
+   while len( out ) < n:
+      mn = rnd.choice( keys )
+      b  = bytearray( encode( mn ) )
+
+      for i in range( 1, 6 ):
+         save = b[i]
+         b[i] = rnd.randrange( 256 )
+         if getOpcode( b, 0 ) != mn:
+            b[i] = save
+
+      out += b[:zos_ilc_length[b[0]]]
+
+   return bytes( out )
+
+def timed( f ):
+   t  = time.perf_counter( )
+   rv = f( )
+   return ( time.perf_counter( ) - t, rv )
+
+def main( ):
+   n   = int( sys.argv[1], 0 ) if len( sys.argv ) > 1 else 1 << 20
+   buf = memoryview( buildStream( n ) )
+
+   tdec, dec = timed( lambda: [ rv._addr for rv in iter_decode( buf ) ] )
+   tpy,  py  = timed( lambda: scanBoundaries( buf, 0, vector=False ) )
+
+   if py[0] != dec:
+      raise SystemExit( "scanPython does not match iter_decode" )
+
+   print( "bytes     : {}".format( len( buf ) ) )
+   print( "insts     : {}".format( len( dec ) ) )
+   print( "decode    : {:8.3f} s {:12.0f} inst/s".format( tdec, len( dec ) / tdec ) )
+   print( "loop      : {:8.3f} s {:12.0f} inst/s".format( tpy, len( dec ) / tpy ) )
+
+   if loadNumpy( ) == None:
+      print( "numpy     : not installed" )
+      return
+
+   tnp, vec = timed( lambda: scanBoundaries( buf, 0 ) )
+
+   if list( vec[0] ) != py[0] or list( vec[1] ) != py[1]:
+      raise SystemExit( "scanNumpy does not match scanPython" )
+
+   print( "numpy     : {:8.3f} s {:12.0f} inst/s".format( tnp, len( dec ) / tnp ) )
+
+if __name__ == "__main__":
+   main( )
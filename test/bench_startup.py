@@ -0,0 +1,88 @@
+# @file   bench_startup.py
+# @brief  The cost of sourcing sdm.py: wall time and modules imported.
+#
+# Each run is a fresh python3 process that loads test/stubgdb/gdb.py and then
+# does what "source sdm.py" does in gdb, two ways:
+#
+#   lazy  - sdm.py as it is, which only registers stand ins for the commands
+#   eager - sdm.py followed by loading every command module and sdmpretty.py,
+#           which is what sourcing it used to do
+#
+# For the lazy run it also reports the time of the first zdisass, which is
+# where the deferred imports are paid for. The decoded page store is kept in
+# a temporary directory instead of $XDG_CACHE_HOME. No gdb or SDM is
+# required:
+#
+#   python3 test/bench_startup.py [runs]
+#
+import sys
+import os
+import tempfile
+import subprocess
+
+_test = os.path.dirname( os.path.abspath( __file__ ) )
+
+# @def   child
+# @brief The script run in each process. It prints the seconds taken to
+#        source sdm.py, the number of modules it imported and the seconds
+#        of the first zdisass.
+child = """
+import sys, time, runpy
+sys.path.insert( 0, {gdb!r} )
+sys.path.insert( 0, {stub!r} )
+
+import gdb
+gdb.load( bytes( 4096 ), 0x10000000 )
+
+n = len( sys.modules )
+t = time.perf_counter( )
+runpy.run_path( {sdm!r} )
+if {eager}:
+   import sdmpretty
+   from apis.lazy import loadCommands
+   loadCommands( )
+t = time.perf_counter( ) - t
+n = len( sys.modules ) - n
+
+f = time.perf_counter( )
+gdb.execute( "zdisass 0x10000000,64" )
+f = time.perf_counter( ) - f
+
+print( t, n, f )
+"""
+
+# @fn    run
+# @brief Source sdm.py in a new process, with cache as $XDG_CACHE_HOME, and
+#        return ( seconds, modules, first zdisass seconds ).
+def run( eager, cache ):
+   src = child.format( gdb=os.path.join( _test, "..", "gdb" ),
+                       stub=os.path.join( _test, "stubgdb" ),
+                       sdm=os.path.join( _test, "..", "gdb", "sdm.py" ),
+                       eager=eager )
+   env = dict( os.environ, XDG_CACHE_HOME=cache )
+   out = subprocess.run( [ sys.executable, "-c", src ], check=True, env=env,
+                         stdout=subprocess.PIPE, universal_newlines=True ).stdout
+
+   t, n, f = out.split( )[-3:]
+   return ( float( t ), int( n ), float( f ) )
+
+def main( ):
+   runs = int( sys.argv[1] ) if len( sys.argv ) > 1 else 5
+
+   with tempfile.TemporaryDirectory( ) as cache:
+      # The first run of each writes the bytecode caches; they are not timed.
+      for eager in ( False, True ):
+         run( eager, cache )
+
+      print( "{:6} {:>12} {:>8} {:>18}".format( "mode", "source ms", "modules", "first zdisass ms" ) )
+
+      for eager in ( False, True ):
+         res = [ run( eager, cache ) for i in range( runs ) ]
+
+         print( "{:6} {:12.2f} {:8} {:18.2f}".format( "eager" if eager else "lazy",
+                                                      1000 * min( r[0] for r in res ),
+                                                      res[0][1],
+                                                      1000 * min( r[2] for r in res ) ) )
+
+if __name__ == "__main__":
+   main( )
@@ -0,0 +1,65 @@
+# @file   bench_tables.py
+# @brief  Memory held by the instruction tables and the time to import them.
+#
+# Each run is a fresh python3 process that imports apis/instructions.py under
+# tracemalloc. It reports the import wall time, the bytes still allocated
+# afterwards by instructions.py itself and by the whole import (which
+# includes the decoders of apis/decoder.py). Another copy of the apis
+# directory, for example an older checkout, can be given to compare
+# against. No gdb is required:
+#
+#   python3 test/bench_tables.py [runs] [apis directory ...]
+#
+import sys
+import os
+import subprocess
+
+_test = os.path.dirname( os.path.abspath( __file__ ) )
+
+# @def   child
+# @brief The script run in each process. It prints the import seconds, the
+#        bytes allocated by instructions.py and the bytes allocated in all.
+child = """
+import sys, time, tracemalloc
+sys.path.insert( 0, {apis!r} )
+
+tracemalloc.start( )
+t = time.perf_counter( )
+import instructions
+t = time.perf_counter( ) - t
+
+snap  = tracemalloc.take_snapshot( )
+own   = sum( s.size for s in snap.statistics( "filename" )
+             if s.traceback[0].filename.endswith( "instructions.py" ) )
+total = sum( s.size for s in snap.statistics( "filename" ) )
+
+print( t, own, total )
+"""
+
+# @fn    run
+# @brief Import the instruction table from apis in a new process and return
+#        ( seconds, table bytes, total bytes ).
+def run( apis ):
+   out = subprocess.run( [ sys.executable, "-c", child.format( apis=apis ) ], check=True,
+                         stdout=subprocess.PIPE, universal_newlines=True ).stdout
+
+   t, own, total = out.split( )[-3:]
+   return ( float( t ), int( own ), int( total ) )
+
+def main( ):
+   runs  = int( sys.argv[1] ) if len( sys.argv ) > 1 else 5
+   trees = sys.argv[2:] or [ os.path.join( _test, "..", "gdb", "apis" ) ]
+
+   print( "{:40} {:>10} {:>14} {:>14}".format( "apis", "import ms", "table bytes", "import bytes" ) )
+
+   for apis in trees:
+      # The first run writes the bytecode caches and is not timed.
+      run( apis )
+      res = [ run( apis ) for i in range( runs ) ]
+
+      print( "{:40} {:10.2f} {:14} {:14}".format( os.path.relpath( apis )[-40:],
+                                                  1000 * min( r[0] for r in res ),
+                                                  res[0][1], res[0][2] ) )
+
+if __name__ == "__main__":
+   main( )
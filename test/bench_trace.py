@@ -0,0 +1,67 @@
+# @file   bench_trace.py
+# @brief  The Python cost of each hit of the ztrace and zcov breakpoint.
+#
+# Loads apis/trace.py against the stub gdb module in test/stubgdb and times,
+# per hit:
+#
+#   ring  - zring.add alone, the store into the array('Q')
+#   stop  - ztracepoint.stop with an expression that costs nothing to
+#           evaluate, which is everything the plugin adds to a hit
+#   stub  - ztracepoint.stop evaluating regs->psw.ia.F in the stub
+#   cover - zcoverage.record alone, setting the bit of an address in one of
+#           64 programs, as zcov start does instead of the ring
+#
+# What gdb itself spends on a hit (the trap, reading registers, evaluating
+# the expression against the inferior) is not included. Compare the hits/s
+# that ztrace show reports in gdb with the rate of the same workload
+# without ztrace for that. No gdb or SDM is required:
+#
+#   python3 test/bench_trace.py [hits]
+#
+import sys
+import os
+import time
+
+_test = os.path.dirname( os.path.abspath( __file__ ) )
+sys.path.insert( 0, os.path.join( _test, "..", "gdb" ) )
+sys.path.insert( 0, os.path.join( _test, "stubgdb" ) )
+
+import gdb
+from apis.trace import zring, ztracepoint
+from apis.coverage import zcoverage
+
+# @fn    perHit
+# @brief Call f n times and return the microseconds per call.
+def perHit( f, n ):
+   t = time.perf_counter( )
+   for i in range( n ):
+      f( )
+   return 1e6 * ( time.perf_counter( ) - t ) / n
+
+def main( ):
+   n = int( sys.argv[1] ) if len( sys.argv ) > 1 else 1000000
+
+   gdb.load( bytes( 4096 ), 0x10000000 )
+   gdb.cpus( [ ( 0x1000, "BENCH" ) ] )
+
+   ring = zring( 64 * 1024 )
+   print("{:6} {:>10}".format( "path", "us/hit" ))
+   print("{:6} {:10.3f}".format( "ring", perHit( lambda: ring.add( 0x1000 ), n ) ))
+
+   point       = ztracepoint( "dispatch", ring.add )
+   point.parse = lambda expr: 0x1000
+   print("{:6} {:10.3f}".format( "stop", perHit( point.stop, n ) ))
+
+   point.parse = gdb.parse_and_eval
+   print("{:6} {:10.3f}".format( "stub", perHit( point.stop, n // 10 ) ))
+
+   cov = zcoverage( )
+   for i in range( 64 ):
+      cov.add( "P{}".format( i ), 0x100000 * i, 0x10000 )
+   print("{:6} {:10.3f}".format( "cover", perHit( lambda: cov.record( 0x500200 ), n ) ))
+
+   if ring.last( 1 ) != [ 0x1000 ] or cov.programs["P5"].bits[0x20] != 1:
+      raise RuntimeError( "an address was not recorded" )
+
+if __name__ == "__main__":
+   main( )
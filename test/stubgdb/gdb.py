@@ -0,0 +1,325 @@
+# @file   gdb.py
+# @brief  A stand in for gdb's python module, just enough of it to load the
+#         plugin commands outside of gdb and run them against memory held in a
+#         bytes buffer. Used by the benchmarks, it is not a gdb emulator.
+#
+#   import gdb
+#   gdb.load( image, mainstor )       # zOS address 0 is at native mainstor
+#   gdb.execute( "zdisass {:#x},4096".format( mainstor ) )
+#
+import re
+import sys
+import types as _types
+
+COMMAND_NONE   = 0
+COMMAND_DATA   = 1
+COMMAND_STACK  = 2
+COMMAND_STATUS = 3
+COMMAND_USER   = 4
+
+PARAM_BOOLEAN  = 0
+
+BP_BREAKPOINT  = 1
+
+class error( RuntimeError ):
+   pass
+
+class MemoryError( error ):
+   pass
+
+class GdbError( Exception ):
+   pass
+
+# The memory image, where it is mapped and the counters the benchmarks read.
+memory   = b""
+mainstor = 0
+stats    = { "reads" : 0, "bytes" : 0, "written" : 0 }
+
+# The registered commands by name, the names of those being invoked, the
+# convenience variables set, the pretty printers, the functions passed to
+# post_event and the breakpoints.
+commands        = { }
+invoking        = [ ]
+breakpoints     = [ ]
+convenience     = { "_zthread" : "1" }
+pretty_printers = [ ]
+posted          = [ ]
+
+# Called by "continue" to stand for the program running until the next
+# stop; it returns the stop event, by default an interrupt.
+running = None
+
+# sysblk->regs[], one entry per CPU set with cpus( ), kept at native address
+# regsbase with the members at the offsets and sizes in regslayout.
+regs       = [ ]
+regsbase   = 0x1000
+regsimage  = b""
+regslayout = { ""                  : ( 0,  64 ),
+               "psw.ia.F"          : ( 8,  8 ),
+               "mainstor"          : ( 16, 8 ),
+               "taskinfo.progname" : ( 24, 8 ) }
+
+# @fn    load
+# @brief Serve buf as the inferior memory starting at native address base.
+def load( buf, base ):
+   global memory, mainstor
+
+   memory   = buf
+   mainstor = base
+   reset( )
+
+# @fn    cpus
+# @brief Set sysblk->regs[] to one CPU for each ( psw.ia, progname ), all
+#        with the mainstor given to load( ).
+def cpus( entries ):
+   global regs, regsimage
+
+   regs = list( entries )
+   img  = bytearray( 64 * len( regs ) )
+   for i, ( ia, prog ) in enumerate( regs ):
+      img[i * 64 + 8:i * 64 + 16]  = ia.to_bytes( 8, sys.byteorder )
+      img[i * 64 + 16:i * 64 + 24] = mainstor.to_bytes( 8, sys.byteorder )
+      img[i * 64 + 24:i * 64 + 32] = prog.encode( ).ljust( 8, b"\0" )[:8]
+   regsimage = bytes( img )
+
+# @fn    run_events
+# @brief Run what has been given to post_event, as gdb's event loop would.
+def run_events( ):
+   while posted:
+      posted.pop( 0 )( )
+
+# @fn    reset
+# @brief Zero the read and write counters.
+def reset( ):
+   for k in stats:
+      stats[k] = 0
+
+class Command( object ):
+   def __init__( self, name, command_class=COMMAND_NONE, completer_class=None, prefix=False ):
+      # gdb frees the command a new one replaces, which would crash it if
+      # that command is still running.
+      if name in invoking:
+         raise RuntimeError( "{} registered while it is being invoked".format( name ) )
+      commands[name] = self
+
+   def dont_repeat( self ):
+      pass
+
+class Parameter( object ):
+   def __init__( self, name, command_class=COMMAND_NONE, parameter_class=PARAM_BOOLEAN ):
+      self.value = None
+
+class StopEvent( object ):
+   pass
+
+class SignalEvent( StopEvent ):
+   def __init__( self, stop_signal ):
+      self.stop_signal = stop_signal
+
+class BreakpointEvent( StopEvent ):
+   def __init__( self, breakpoint ):
+      self.breakpoint  = breakpoint
+      self.breakpoints = [ breakpoint ]
+
+class Breakpoint( object ):
+   def __init__( self, spec, type=BP_BREAKPOINT, wp_class=0, internal=False, temporary=False ):
+      self.location = spec
+      self.enabled  = True
+      self.silent   = False
+      breakpoints.append( self )
+
+   def delete( self ):
+      breakpoints.remove( self )
+
+class Value( int ):
+   def cast( self, type ):
+      return self
+
+   def dereference( self ):
+      return self
+
+class _Type( object ):
+   def __init__( self, name ):
+      self.name = name
+
+   def pointer( self ):
+      return self
+
+   def __eq__( self, other ):
+      return other is self
+
+   def __hash__( self ):
+      return id( self )
+
+def lookup_type( name ):
+   return _Type( name )
+
+def parse_and_eval( expr ):
+   if expr == "sysblk" or re.match( r"sysblk->regs\[\d+\]\.mainstor$", expr ):
+      return Value( mainstor )
+
+   # The image is all of mainstor.
+   if expr == "sysblk->mainsize":
+      return Value( len( memory ) )
+
+   if expr == "sysblk->max_cpu_threads":
+      return Value( len( regs ) )
+
+   m = re.match( r"sysblk->regs\[(\d+)\]\.psw\.ia\.F$", expr )
+   if m != None:
+      return Value( regs[int( m.group( 1 ) )][0] )
+
+   # regs is the CPU of the current zOS thread.
+   if expr == "regs->psw.ia.F":
+      return Value( regs[int( convenience["_zthread"] ) - 1][0] )
+
+   m = re.match( r"&sysblk->regs\[(\d+)\]\.?(.*)$", expr )
+   if m != None:
+      return Value( regsbase + 64 * int( m.group( 1 ) ) + regslayout[m.group( 2 )][0] )
+
+   m = re.match( r"sizeof\( *sysblk->regs\[\d+\]\.?(.*?) *\)$", expr )
+   if m != None:
+      return Value( regslayout[m.group( 1 )][1] )
+
+   return Value( int( expr, 0 ) )
+
+class _Registry( object ):
+   def __init__( self ):
+      self.handlers = [ ]
+
+   def connect( self, f ):
+      self.handlers.append( f )
+
+   def disconnect( self, f ):
+      self.handlers.remove( f )
+
+   def fire( self, event=None ):
+      for f in list( self.handlers ):
+         f( event )
+
+class events( object ):
+   memory_changed = _Registry( )
+   new_objfile    = _Registry( )
+   exited         = _Registry( )
+   stop           = _Registry( )
+   cont           = _Registry( )
+
+class _Inferior( object ):
+   pid = 1
+
+   def read_memory( self, addr, length ):
+      if regsbase <= addr and addr + length <= regsbase + len( regsimage ):
+         stats["reads"] += 1
+         return memoryview( regsimage )[addr - regsbase:addr - regsbase + length]
+
+      off = addr - mainstor
+      if off < 0 or off + length > len( memory ):
+         raise MemoryError( "Cannot access memory at address {:#x}".format( addr ) )
+
+      stats["reads"] += 1
+      stats["bytes"] += length
+
+      return memoryview( memory )[off:off + length]
+
+_inferior = _Inferior( )
+
+def selected_inferior( ):
+   return _inferior
+
+def string_to_argv( arg ):
+   return arg.split( )
+
+def write( text, stream=0 ):
+   stats["written"] += len( text )
+
+def flush( stream=0 ):
+   pass
+
+# @fn    execute
+# @brief Run a registered command, or answer the few print commands that the
+#        plugin uses to evaluate expressions.
+def execute( command, from_tty=False, to_string=False ):
+   words = command.split( )
+
+   # Prefix commands such as "info zcache" are registered with the prefix.
+   for n in ( 2, 1 ):
+      name = " ".join( words[:n] )
+      if len( words ) >= n and name in commands:
+         invoking.append( name )
+         try:
+            commands[name].invoke( " ".join( words[n:] ), from_tty )
+         finally:
+            invoking.pop( )
+         return "" if to_string else None
+
+   name = words[0] if words else ""
+
+   if name == "continue":
+      event = running( ) if running != None else None
+      events.stop.fire( event or SignalEvent( "SIGINT" ) )
+      return "" if to_string else None
+
+   if name == "interrupt":
+      return "" if to_string else None
+
+   m = re.match( r"set\s+\$(\w+)\s*=\s*(.*)$", command.strip( ) )
+   if m != None:
+      convenience[m.group( 1 )] = m.group( 2 )
+      return "" if to_string else None
+
+   m = re.match( r"p(?:/x)?\s+(.*)$", command.strip( ) )
+   if m == None:
+      raise error( "Undefined command: \"{}\".".format( name ) )
+
+   expr = m.group( 1 )
+   if expr.startswith( "$" ):
+      rv = "$1 = {}".format( convenience.get( expr[1:], "void" ) )
+   elif command.startswith( "p/x" ):
+      rv = "$1 = {:#x}".format( parse_and_eval( expr ) )
+   else:
+      rv = "$1 = {}".format( parse_and_eval( expr ) )
+
+   if to_string:
+      return rv + "\n"
+
+   write( rv + "\n" )
+
+def post_event( f ):
+   posted.append( f )
+
+def current_objfile( ):
+   return None
+
+# gdb.printing and gdb.types, as far as sdmpretty.py and the pretty printers
+# use them.
+class _PrettyPrinter( object ):
+   def __init__( self, name, subprinters=None ):
+      self.name        = name
+      self.subprinters = subprinters
+      self.enabled     = True
+
+class _RegexpCollectionPrettyPrinter( _PrettyPrinter ):
+   def __init__( self, name ):
+      super( _RegexpCollectionPrettyPrinter, self ).__init__( name, [ ] )
+
+   def add_printer( self, name, regexp, gen_printer ):
+      self.subprinters.append( ( name, re.compile( regexp ), gen_printer ) )
+
+   def __call__( self, val ):
+      for name, regexp, gen_printer in self.subprinters:
+         if regexp.search( val.type.name ):
+            return gen_printer( val )
+
+def _register_pretty_printer( obj, printer, replace=False ):
+   pretty_printers.insert( 0, printer )
+
+printing = _types.ModuleType( "gdb.printing" )
+printing.PrettyPrinter                 = _PrettyPrinter
+printing.RegexpCollectionPrettyPrinter = _RegexpCollectionPrettyPrinter
+printing.register_pretty_printer       = _register_pretty_printer
+
+types = _types.ModuleType( "gdb.types" )
+types.get_basic_type = lambda type: type
+
+sys.modules["gdb.printing"] = printing
+sys.modules["gdb.types"]    = types